@@ -0,0 +1,234 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from batch_engine import _LaneHook, _lane_count, _play_lanes, _quotas, _shuffled_decks
+from game import _blocks
+from rules import STANDARD, Ruleset
+
+# Number cards of at least this value count as high cards.
+HIGH_CARD = 10
+FEATURES = ("offset", "high_left", "times_left", "chance_left")
+DEFAULT_BLOCK = 1 << 22
+
+
+@dataclass
+class HandFeatures:
+    """Per-hand outcomes and the state of the deck when each hand started.
+
+    - `offset`: position in the shuffled deck of the hand's first card.
+    - `high_left`: high number cards (value >= `high`) not yet dealt.
+    - `times_left` / `chance_left`: "*2" / Second Chance cards not yet dealt.
+
+    All fields are NumPy arrays, one element per hand.
+    """
+
+    scores: np.ndarray
+    cards_at_scoring: np.ndarray
+    offset: np.ndarray
+    high_left: np.ndarray
+    times_left: np.ndarray
+    chance_left: np.ndarray
+
+    def __len__(self) -> int:
+        return self.scores.size
+
+    def group_by(
+        self, *names: str, rules: Ruleset = STANDARD, high: int = HIGH_CARD
+    ) -> "GroupStats":
+        """Score statistics for every combination of the named features."""
+        stats = GroupStats.empty(names, rules, high)
+        stats.add(self)
+        return stats
+
+
+def feature_sizes(rules: Ruleset = STANDARD, high: int = HIGH_CARD) -> Dict[str, int]:
+    """Number of distinct values each feature can take under `rules`."""
+    compiled = rules.compile()
+    deck = np.array(compiled.deck)
+    return {
+        "offset": deck.size,
+        "high_left": int(np.count_nonzero((deck < compiled.numbers) & (deck >= high))) + 1,
+        "times_left": rules.times_two + 1,
+        "chance_left": rules.second_chance + 1,
+    }
+
+
+@dataclass
+class GroupStats:
+    """Count, sum and sum of squares of scores per group, by `np.bincount`.
+
+    Groups are every combination of the `names` features, laid out densely
+    in `shape` order, so statistics from separate blocks add up with `merge`.
+    """
+
+    names: Tuple[str, ...]
+    shape: Tuple[int, ...]
+    counts: np.ndarray
+    sums: np.ndarray
+    sumsq: np.ndarray
+
+    @classmethod
+    def empty(
+        cls, names: Sequence[str], rules: Ruleset = STANDARD, high: int = HIGH_CARD
+    ) -> "GroupStats":
+        unknown = [n for n in names if n not in FEATURES]
+        if unknown or not names:
+            raise ValueError(f"group by one or more of {FEATURES}, got {list(names)}")
+        sizes = feature_sizes(rules, high)
+        shape = tuple(sizes[n] for n in names)
+        size = int(np.prod(shape))
+        return cls(
+            tuple(names),
+            shape,
+            np.zeros(size, dtype=np.int64),
+            np.zeros(size, dtype=np.float64),
+            np.zeros(size, dtype=np.float64),
+        )
+
+    def add(self, features: HandFeatures) -> None:
+        """Fold a block of hands into the group totals."""
+        key = np.ravel_multi_index(
+            [getattr(features, n).astype(np.intp) for n in self.names], self.shape
+        )
+        size = self.counts.size
+        scores = features.scores.astype(np.float64)
+        self.counts += np.bincount(key, minlength=size)
+        self.sums += np.bincount(key, weights=scores, minlength=size)
+        self.sumsq += np.bincount(key, weights=scores * scores, minlength=size)
+
+    def merge(self, other: "GroupStats") -> None:
+        if other.names != self.names or other.shape != self.shape:
+            raise ValueError("can only merge statistics of the same grouping")
+        self.counts += other.counts
+        self.sums += other.sums
+        self.sumsq += other.sumsq
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean score per group (NaN for empty groups), shaped like `shape`."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.sums / self.counts).reshape(self.shape)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance per group (NaN below two hands), shaped like `shape`."""
+        n = self.counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (self.sumsq - self.sums * self.sums / n) / (n - 1)
+        return np.where(n > 1, np.maximum(var, 0.0), np.nan).reshape(self.shape)
+
+    def rows(self) -> List[Tuple[Tuple[int, ...], int, float, float]]:
+        """`(key, hands, mean, std)` for every non-empty group, in key order."""
+        mean, std = self.mean.ravel(), np.sqrt(self.variance.ravel())
+        out = []
+        for i in np.flatnonzero(self.counts):
+            key = tuple(int(k) for k in np.unravel_index(i, self.shape))
+            out.append((key, int(self.counts[i]), float(mean[i]), float(std[i])))
+        return out
+
+
+class _DeckState(_LaneHook):
+    """Counts each lane's high, "*2" and Second Chance cards left to deal,
+    and snapshots them (with the deck offset) as every hand starts."""
+
+    def __init__(self, rules: Ruleset, high: int, lanes: int, hands: int) -> None:
+        compiled = rules.compile()
+        codes = np.arange(len(compiled.kinds))
+        self.is_high = ((codes < compiled.numbers) & (codes >= high)).astype(np.int32)
+        self.times_code, self.chance_code = compiled.times_two, compiled.second_chance
+        full_high = feature_sizes(rules, high)["high_left"] - 1
+        # Rows follow `HandFeatures`: offset (only in `start`), high_left,
+        # times_left, chance_left.
+        self.full = np.array(
+            [[0], [full_high], [rules.times_two], [rules.second_chance]], dtype=np.int32
+        )
+        self.left = np.repeat(self.full, lanes, axis=1)
+        self.start = self.left.copy()
+        self.starts = np.empty((4, hands), dtype=np.uint16)
+
+    def drew(self, card: np.ndarray) -> None:
+        self.left[1] -= self.is_high[card]
+        self.left[2] -= card == self.times_code
+        self.left[3] -= card == self.chance_code
+
+    def finished(self, done: np.ndarray, out: slice) -> None:
+        self.starts[:, out] = self.start[:, done]
+
+    def reshuffled(self, empty: np.ndarray) -> None:
+        self.left[:, empty] = self.full
+
+    def started(self, done: np.ndarray, pos: np.ndarray) -> None:
+        self.start[:, done] = self.left[:, done]
+        self.start[0, done] = pos[done]
+
+    def keep(self, live: np.ndarray) -> None:
+        self.left, self.start = self.left[:, live], self.start[:, live]
+
+
+def simulate_features(
+    hands: int,
+    seed=None,
+    lanes: Optional[int] = None,
+    rules: Ruleset = STANDARD,
+    high: int = HIGH_CARD,
+) -> HandFeatures:
+    """`batch_engine.simulate` that also records each hand's starting deck state.
+
+    Runs the same lane loop, with a hook that tracks how many high cards,
+    "*2" and Second Chance cards every lane has yet to deal and snapshots
+    them when a hand starts.
+    """
+    rng = np.random.default_rng(seed)
+    lanes = _lane_count(hands, lanes)
+    decks = _shuffled_decks(rng, rules, lanes)
+    state = _DeckState(rules, high, lanes, hands)
+    scores, cards_at_scoring, _, _ = _play_lanes(
+        decks, _quotas(hands, lanes), rng, rules, hook=state, compact=True
+    )
+    return HandFeatures(scores, cards_at_scoring, *state.starts)
+
+
+def grouped_stats(
+    hands: int,
+    by: Sequence[str] = ("offset",),
+    seed=None,
+    rules: Ruleset = STANDARD,
+    high: int = HIGH_CARD,
+    block: int = DEFAULT_BLOCK,
+) -> GroupStats:
+    """Simulate `hands` hands in blocks and return score statistics grouped `by`.
+
+    Only one block of per-hand arrays is alive at a time, so tens of millions
+    of hands need a few tens of megabytes. Each block plays on fresh decks
+    seeded from `SeedSequence(seed)`, as the NumPy engine's streaming mode does.
+    """
+    stats = GroupStats.empty(by, rules, high)
+    sizes = _blocks(hands, block)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    for size, stream in zip(sizes, streams):
+        stats.add(simulate_features(size, stream, rules=rules, high=high))
+    return stats
+
+
+def format_groups(stats: GroupStats) -> str:
+    """Render grouped statistics as a fixed-width text table."""
+    header = "  ".join(f"{n:>11}" for n in stats.names)
+    lines = [f"{header}  {'hands':>10}  {'mean':>8}  {'std':>8}"]
+    for key, n, mean, std in stats.rows():
+        cols = "  ".join(f"{k:>11}" for k in key)
+        lines.append(f"{cols}  {n:>10}  {mean:>8.3f}  {std:>8.3f}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "FEATURES",
+    "GroupStats",
+    "HIGH_CARD",
+    "HandFeatures",
+    "feature_sizes",
+    "format_groups",
+    "grouped_stats",
+    "simulate_features",
+]
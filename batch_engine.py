@@ -0,0 +1,213 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+
+from game import ExperimentResults, _collect
+from rules import ABSENT, STANDARD, Ruleset
+
+MAX_LANES = 8192
+HANDS_PER_LANE = 256
+
+
+@lru_cache(maxsize=None)
+def _tables(rules: Ruleset) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-code `(bit, value, add)` arrays, so a whole step is a handful of gathers."""
+    compiled = rules.compile()
+    codes = np.arange(len(compiled.kinds))
+    number = codes < compiled.numbers
+    bit = np.where(number, 1 << np.minimum(codes, 30), 0).astype(np.int32)
+    value = np.where(number, codes, 0).astype(np.int32)
+    add = np.array(compiled.adds, dtype=np.int32)
+    return bit, value, add
+
+
+_BIT, _VALUE, _ADD = _tables(STANDARD)
+
+
+class _LaneHook:
+    """Extra per-lane state carried through `_play_lanes`; every method is a no-op.
+
+    Lane indices are those of the loop's current lanes, which are renumbered
+    from 0 whenever lanes that met their quota are dropped (`keep`).
+    """
+
+    def drew(self, card: np.ndarray) -> None:
+        """Every current lane drew `card[i]`."""
+
+    def finished(self, done: np.ndarray, out: slice) -> None:
+        """Lanes `done` ended hands, stored at `out` in the per-hand arrays."""
+
+    def reshuffled(self, empty: np.ndarray) -> None:
+        """Lanes `empty` ran out and reshuffled their full deck."""
+
+    def started(self, done: np.ndarray, pos: np.ndarray) -> None:
+        """Lanes `done` start their next hand at deck position `pos[done]`."""
+
+    def keep(self, live: np.ndarray) -> None:
+        """Only lanes `live` go on."""
+
+
+def _lane_count(hands: int, lanes: Optional[int]) -> int:
+    if lanes is None:
+        lanes = min(MAX_LANES, max(1, hands // HANDS_PER_LANE))
+    return max(1, min(lanes, hands))
+
+
+def _shuffled_decks(rng: np.random.Generator, rules: Ruleset, lanes: int) -> np.ndarray:
+    base = np.array(rules.compile().deck, dtype=np.int8)
+    return rng.permuted(np.tile(base, (lanes, 1)), axis=1)
+
+
+def _quotas(hands: int, lanes: int) -> np.ndarray:
+    quota = np.full(lanes, hands // lanes, dtype=np.int64)
+    quota[: hands % lanes] += 1
+    return quota
+
+
+def _play_lanes(
+    decks: np.ndarray,
+    quota: np.ndarray,
+    rng: Optional[np.random.Generator],
+    rules: Ruleset = STANDARD,
+    hook: Optional[_LaneHook] = None,
+    compact: bool = False,
+):
+    """Play `quota[i]` hands from row `i` of `decks`, all lanes one card at a time.
+
+    Each lane carries its deck across hands and reshuffles it with `rng`
+    when it runs out (`rng` may be None if no lane can). `hook` sees every
+    step, for callers that track more per-lane state. Returns `simulate`'s
+    tuple; with `compact` the per-hand arrays are int16 and uint8.
+    """
+    compiled = rules.compile()
+    bit_of, value_of, add_of = _tables(rules)
+    bonus_cards, seven_bonus = rules.bonus_cards, rules.bonus
+    hook = hook or _LaneHook()
+    lanes, len_deck = decks.shape
+    hands = int(quota.sum())
+
+    rows = np.arange(lanes)
+    pos = np.zeros(lanes, dtype=np.intp)
+    mask = np.zeros(lanes, dtype=np.int32)
+    count = np.zeros(lanes, dtype=np.int32)
+    total = np.zeros(lanes, dtype=np.int32)
+    bonus = np.zeros(lanes, dtype=np.int32)
+    doubled = np.zeros(lanes, dtype=bool)
+    chance = np.zeros(lanes, dtype=bool)
+
+    scores = np.empty(hands, dtype=np.int16 if compact else np.int64)
+    cards_at_scoring = np.empty(hands, dtype=np.uint8 if compact else np.int64)
+    filled = 0
+    count_reached7 = 0
+    count_already_true = 0
+
+    while filled < hands:
+        card = decks[rows, pos]
+        pos += 1
+        hook.drew(card)
+
+        bit = bit_of[card]
+        held = (mask & bit) != 0
+        bust = held & ~chance
+        chance &= ~held
+        chance |= card == compiled.second_chance
+        doubled |= card == compiled.times_two
+        bonus += add_of[card]
+        new = (bit != 0) & ~held
+        mask |= bit * new
+        count += new
+        total += value_of[card] * new
+        seven = count == bonus_cards
+        ended = bust | seven
+        if compiled.freeze != ABSENT:
+            ended |= card == compiled.freeze
+
+        done = np.flatnonzero(ended & (quota > 0))
+        if done.size:
+            n = done.size
+            reached = seven[done]
+            scores[filled : filled + n] = (
+                total[done] * (1 + doubled[done])
+                + bonus[done]
+                + seven_bonus * reached
+            )
+            cards_at_scoring[filled : filled + n] = count[done]
+            hook.finished(done, slice(filled, filled + n))
+            filled += n
+            count_reached7 += int(np.count_nonzero(reached))
+            count_already_true += int(np.count_nonzero(bust[done]))
+            quota[done] -= 1
+            mask[done] = 0
+            count[done] = 0
+            total[done] = 0
+            bonus[done] = 0
+            doubled[done] = False
+            chance[done] = False
+
+        empty = np.flatnonzero(pos == len_deck)
+        if empty.size:
+            decks[empty] = rng.permuted(decks[empty], axis=1)
+            pos[empty] = 0
+            hook.reshuffled(empty)
+        if done.size:
+            hook.started(done, pos)
+
+        live = np.flatnonzero(quota > 0)
+        if 0 < live.size <= rows.size // 2:
+            # Drop lanes that met their quota so the tail stays cheap.
+            decks, quota, pos = decks[live], quota[live], pos[live]
+            mask, count, total = mask[live], count[live], total[live]
+            bonus, doubled, chance = bonus[live], doubled[live], chance[live]
+            rows = np.arange(live.size)
+            hook.keep(live)
+
+    return scores, cards_at_scoring, count_reached7, count_already_true
+
+
+def simulate(
+    hands: int,
+    seed=None,
+    lanes: Optional[int] = None,
+    rules: Ruleset = STANDARD,
+):
+    """Simulate `hands` hands on many independent decks at once.
+
+    Each lane is its own shuffled deck carried across hands exactly like the
+    scalar engine (reshuffling when it runs out) and plays a fixed quota of
+    hands, so the combined output has the same distribution as concatenating
+    independent `run_experiment` runs. Hands are recorded in the order they
+    finish across lanes.
+
+    `seed` is anything `np.random.default_rng` accepts (an int or a
+    `SeedSequence`). Returns `(scores, cards_at_scoring, count_reached7,
+    count_already_true)` with the per-hand values as int16 and uint8 arrays;
+    hands ended by a Freeze are in neither count.
+    """
+    rng = np.random.default_rng(seed)
+    lanes = _lane_count(hands, lanes)
+    decks = _shuffled_decks(rng, rules, lanes)
+    return _play_lanes(decks, _quotas(hands, lanes), rng, rules, compact=True)
+
+
+def to_results(
+    scores: np.ndarray,
+    cards_at_scoring: np.ndarray,
+    count_reached7: int,
+    count_already_true: int,
+) -> ExperimentResults:
+    """Copy per-hand arrays into a compact `ExperimentResults`."""
+    return _collect([(scores, cards_at_scoring, count_reached7, count_already_true)])
+
+
+def run_batch(
+    hands: int,
+    seed: Optional[int] = None,
+    lanes: Optional[int] = None,
+    rules: Ruleset = STANDARD,
+) -> ExperimentResults:
+    """Run `simulate` and return its output as `ExperimentResults`."""
+    return to_results(*simulate(hands, seed, lanes, rules))
+
+
+__all__ = ["run_batch", "simulate", "to_results"]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from game import run_experiment
+from player import Player
+from rules import STANDARD
+
+DEFAULT_HISTORY = "bench_history.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+# A benchmark regresses when it is this much worse than the baseline.
+DEFAULT_THRESHOLD = 0.10
+EXPERIMENT_SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000, 100_000)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> float:
+    """Best wall-clock time of `repeat` calls, which filters out scheduler noise."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_run_experiment(sizes: Sequence[int], repeat: int) -> List[BenchResult]:
+    results = []
+    for engine in ("scalar", "numpy"):
+        for hands in sizes:
+            elapsed = _best_time(
+                lambda: run_experiment(hands, seed=1, engine=engine),
+                repeat if hands < 1_000_000 else 1,
+            )
+            results.append(
+                BenchResult(f"run_experiment[{engine},{hands}]", hands / elapsed, "hands/s", True)
+            )
+    return results
+
+
+def bench_player(cards: int, repeat: int) -> List[BenchResult]:
+    """Per-call cost of `Player.add_card` and `Player.Score`, in nanoseconds."""
+    rng = random.Random(1)
+    compiled = STANDARD.compile()
+    deck = [compiled.label(code) for code in compiled.deck]
+    labels = [rng.choice(deck) for _ in range(cards)]
+    player = Player()
+
+    def add_cards() -> None:
+        add_card = player.add_card
+        reset = player.reset_hand
+        for label in labels:
+            try:
+                add_card(label)
+            except IndexError:
+                reset()
+
+    def score() -> None:
+        s = player.Score
+        for _ in range(cards):
+            s()
+
+    player.reset_hand()
+    for label in (3, 7, 11, "+4"):
+        player.add_card(label)
+    score_ns = _best_time(score, repeat) / cards * 1e9
+    add_ns = _best_time(add_cards, repeat) / cards * 1e9
+    return [
+        BenchResult("Player.add_card", add_ns, "ns", False),
+        BenchResult("Player.Score", score_ns, "ns", False),
+    ]
+
+
+class _NullCanvas:
+    """Accepts and discards every canvas call, so drawing cost excludes Tk."""
+
+    def delete(self, *args) -> None:
+        pass
+
+    def __getattr__(self, name: str):
+        if name.startswith("create_"):
+            return lambda *args, **kwargs: 0
+        raise AttributeError(name)
+
+
+class _Flag:
+    def __init__(self, value: bool) -> None:
+        self.value = value
+
+    def get(self) -> bool:
+        return self.value
+
+
+def bench_plot(hands: int, repeat: int) -> List[BenchResult]:
+    """Time summarizing results and drawing each stats tab onto a null canvas."""
+    from main import StatsWindow
+    from summary import ExperimentSummary
+
+    results = run_experiment(hands, seed=1)
+    out = [
+        BenchResult(
+            "plot.summary",
+            _best_time(lambda: ExperimentSummary.from_results(results), repeat) * 1e3,
+            "ms",
+            False,
+        )
+    ]
+    # A window without Tk: the draw methods only need the data and a canvas.
+    window = StatsWindow.__new__(StatsWindow)
+    window._set_data(ExperimentSummary.from_results(results))
+    window.exact_var = _Flag(False)
+    canvas = _NullCanvas()
+    for title, method in StatsWindow.TABS:
+        draw = getattr(window, method)
+        elapsed = _best_time(lambda: draw(canvas), repeat)
+        out.append(BenchResult(f"plot.tab[{title}]", elapsed * 1e3, "ms", False))
+    return out
+
+
+def run_benchmarks(quick: bool = False, repeat: int = 3) -> List[BenchResult]:
+    """Run the whole suite. `quick` skips the million-hand sizes."""
+    sizes = QUICK_SIZES if quick else EXPERIMENT_SIZES
+    results = bench_run_experiment(sizes, repeat)
+    results += bench_player(200_000, repeat)
+    results += bench_plot(sizes[-1], repeat)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def make_record(results: Sequence[BenchResult]) -> dict:
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(r) for r in results],
+    }
+
+
+def append_history(record: dict, path: str = DEFAULT_HISTORY) -> None:
+    """Append `record` to the JSON history list at `path`, replacing it atomically."""
+    history = []
+    if os.path.exists(path):
+        with open(path) as f:
+            history = json.load(f)
+    history.append(record)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+
+
+def compare(
+    results: Sequence[BenchResult], baseline: dict, threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """Return a line for every benchmark more than `threshold` worse than `baseline`.
+
+    `baseline` is a record from `make_record`; benchmarks missing from it are
+    skipped.
+    """
+    base: Dict[str, float] = {r["name"]: r["value"] for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = base.get(r.name)
+        if not old:
+            continue
+        change = (r.value - old) / old
+        worse = -change if r.higher_is_better else change
+        if worse > threshold:
+            regressions.append(
+                f"{r.name}: {old:,.1f} -> {r.value:,.1f} {r.unit} ({worse:.0%} worse)"
+            )
+    return regressions
+
+
+def format_results(results: Sequence[BenchResult]) -> str:
+    width = max(len(r.name) for r in results)
+    return "\n".join(f"{r.name:<{width}}  {r.value:>16,.3f} {r.unit}" for r in results)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the suite, record it in the history and check it against the baseline.
+
+    Exits with status 1 when any benchmark regressed past the threshold.
+    """
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    parser.add_argument("--quick", action="store_true", help="skip 1M-hand sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store this run as the baseline"
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.repeat)
+    print(format_results(results))
+    record = make_record(results)
+    append_history(record, args.history)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(record, f, indent=1)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        print("\n".join(regressions))
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+__all__ = [
+    "BenchResult",
+    "compare",
+    "main",
+    "make_record",
+    "run_benchmarks",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
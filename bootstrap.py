@@ -0,0 +1,100 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Tuple, Union
+import numpy as np
+
+from summary import ExperimentSummary
+
+if TYPE_CHECKING:
+    from game import ExperimentResults
+
+DEFAULT_RESAMPLES = 1000
+# Resamples drawn per NumPy call; bounds the (resamples, distinct scores) matrix.
+_BLOCK = 256
+
+Interval = Tuple[float, float]
+
+
+@dataclass
+class BootstrapCI:
+    """Percentile bootstrap confidence intervals, each as `(low, high)`.
+
+    `reached7_ratio` is the number of hands that reached 7 cards per hand
+    that ended on a duplicate.
+    """
+
+    confidence: float
+    resamples: int
+    mean: Interval
+    median: Interval
+    q1: Interval
+    q3: Interval
+    reached7_ratio: Interval
+
+
+def _histogram_quantiles(values: np.ndarray, cum: np.ndarray, n: int, q: float) -> np.ndarray:
+    """Quantile `q` of each resampled histogram (rows of cumulative counts `cum`).
+
+    Interpolates like `np.percentile` on the underlying scores.
+    """
+    pos = q * (n - 1)
+    lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+    lo_val = values[(cum > lo).argmax(axis=1)]
+    hi_val = values[(cum > hi).argmax(axis=1)]
+    return lo_val + (hi_val - lo_val) * (pos - lo)
+
+
+def bootstrap_ci(
+    data: Union[ExperimentSummary, "ExperimentResults"],
+    resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = 0.95,
+    seed=None,
+) -> BootstrapCI:
+    """Bootstrap the mean, median, quartiles and reached-7 ratio of a run.
+
+    Resampling `n` hands with replacement only changes how many hands land
+    on each distinct score, so each resample is one multinomial draw over
+    the score histogram instead of `n` indices into the raw scores: the cost
+    depends on the number of distinct scores, not on `n`. The reasons are
+    resampled the same way from their counts. Results are summarized first.
+    """
+    if not isinstance(data, ExperimentSummary):
+        data = ExperimentSummary.from_results(data)
+    n = data.hands
+    if n < 2:
+        raise ValueError("bootstrapping needs at least 2 hands")
+    if resamples < 1:
+        raise ValueError(f"resamples must be at least 1, got {resamples}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    rng = np.random.default_rng(seed)
+    values = np.array(sorted(data.score_counts), dtype=np.int64)
+    probs = np.array([data.score_counts[v] for v in values], dtype=np.float64) / n
+    reasons = np.array(
+        [
+            data.count_reached7,
+            data.count_already_true,
+            n - data.count_reached7 - data.count_already_true,
+        ],
+        dtype=np.float64,
+    )
+
+    stats = np.empty((5, resamples))
+    for start in range(0, resamples, _BLOCK):
+        size = min(_BLOCK, resamples - start)
+        rows = slice(start, start + size)
+        counts = rng.multinomial(n, probs, size=size)
+        stats[0, rows] = counts @ values / n
+        cum = np.cumsum(counts, axis=1)
+        for row, q in ((1, 0.5), (2, 0.25), (3, 0.75)):
+            stats[row, rows] = _histogram_quantiles(values, cum, n, q)
+        r7, dup, _ = rng.multinomial(n, reasons / n, size=size).T
+        stats[4, rows] = np.where(dup > 0, r7 / np.maximum(dup, 1), np.inf)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(stats, [alpha, 1 - alpha], axis=1)
+    bounds = [(float(a), float(b)) for a, b in zip(low, high)]
+    return BootstrapCI(confidence, resamples, *bounds)
+
+
+__all__ = ["BootstrapCI", "DEFAULT_RESAMPLES", "bootstrap_ci"]
@@ -0,0 +1,202 @@
+from __future__ import annotations
+from typing import Optional, Union
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+from game import (
+    DEFAULT_CHUNK_SIZE,
+    ENGINE_VERSION,
+    ExperimentResults,
+    ExperimentSummary,
+    run_experiment,
+)
+from rules import STANDARD, Ruleset
+
+DEFAULT_CACHE_DIR = ".flip7_cache"
+DEFAULT_MAX_BYTES = 1 << 30
+# `run_experiment` always plays this policy; part of the key so policy runs can share the cache.
+_POLICY = "always hit"
+_SUFFIX = ".npz"
+
+
+class ResultCache:
+    """Size-bounded on-disk cache of experiment results, keyed by content.
+
+    Each entry is one `.npz` file named after the SHA-256 of its
+    configuration. It holds the `ExperimentSummary` as JSON and, optionally,
+    the per-hand `scores` and `cards_at_scoring` arrays. Entries are written
+    to a temporary file and renamed into place, so processes sharing the
+    directory only ever see complete entries. Reading an entry touches its
+    modification time; once the directory grows past `max_bytes` the least
+    recently used entries are deleted.
+    """
+
+    def __init__(
+        self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+        hands: int,
+        seed: int,
+        engine: str = "scalar",
+        chunk_size: Optional[int] = None,
+        arrays: bool = False,
+        rules: Ruleset = STANDARD,
+    ) -> str:
+        """Return the cache key for a seeded `run_experiment` configuration.
+
+        `arrays` is part of the key because the NumPy engine's streaming and
+        list-building paths play different (equally valid) hands.
+        """
+        config = {
+            "hands": hands,
+            "seed": seed,
+            "engine": engine,
+            "engine_version": ENGINE_VERSION,
+            "chunk_size": chunk_size,
+            "arrays": arrays,
+            "rules": rules.to_dict(),
+            "policy": _POLICY,
+        }
+        blob = json.dumps(config, sort_keys=True).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Union[ExperimentSummary, ExperimentResults]]:
+        """Return the cached entry, or None.
+
+        Entries with arrays come back as `ExperimentResults` holding NumPy
+        arrays; summary-only entries as `ExperimentSummary`.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                summary = ExperimentSummary.from_dict(json.loads(str(data["summary"])))
+                if "scores" not in data.files:
+                    result = summary
+                else:
+                    result = ExperimentResults(
+                        scores=data["scores"],
+                        count_reached7=summary.count_reached7,
+                        count_already_true=summary.count_already_true,
+                        cards_at_scoring=data["cards_at_scoring"],
+                    )
+            os.utime(path)
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            # Missing, evicted by another process meanwhile, or unreadable.
+            return None
+        return result
+
+    def put(
+        self,
+        key: str,
+        summary: ExperimentSummary,
+        scores=None,
+        cards_at_scoring=None,
+    ) -> None:
+        """Store an entry atomically, then evict down to `max_bytes`."""
+        members = {"summary": np.array(json.dumps(summary.to_dict()))}
+        if scores is not None:
+            members["scores"] = np.asarray(scores, dtype=np.int16)
+            members["cards_at_scoring"] = np.asarray(cards_at_scoring, dtype=np.uint8)
+        buffer = io.BytesIO()
+        np.savez(buffer, **members)
+        path = self._path(key)
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        size = sum(e[1] for e in entries)
+        for _, entry_size, name in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIX):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+def cached_experiment(
+    hands: int = 100_000,
+    seed: Optional[int] = None,
+    engine: str = "scalar",
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    arrays: bool = False,
+    cache: Optional[ResultCache] = None,
+    rules: Ruleset = STANDARD,
+) -> Union[ExperimentSummary, ExperimentResults]:
+    """`run_experiment` through a `ResultCache`.
+
+    Returns an `ExperimentSummary`, or with `arrays=True` an
+    `ExperimentResults` whose lists are NumPy arrays. Unseeded runs are not
+    reproducible and are never cached. Beyond choosing whether the run is
+    chunked (more than one worker without `chunk_size` means chunks of
+    `DEFAULT_CHUNK_SIZE`), `workers` does not affect the output, so only
+    the resulting chunk size is part of the key.
+    """
+    if seed is None:
+        return run_experiment(
+            hands, None, engine, workers, chunk_size, stream=not arrays, rules=rules
+        )
+    cache = cache or ResultCache()
+    if chunk_size is None and workers > 1:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    key = cache.key(hands, seed, engine, chunk_size, arrays, rules)
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+    if not arrays:
+        summary = run_experiment(
+            hands, seed, engine, workers, chunk_size, stream=True, rules=rules
+        )
+        cache.put(key, summary)
+        return summary
+    results = run_experiment(hands, seed, engine, workers, chunk_size, rules=rules)
+    cache.put(
+        key,
+        ExperimentSummary.from_results(results),
+        results.scores,
+        results.cards_at_scoring,
+    )
+    return cache.get(key) or results
+
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "DEFAULT_MAX_BYTES",
+    "ResultCache",
+    "cached_experiment",
+]
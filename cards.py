@@ -0,0 +1,47 @@
+from __future__ import annotations
+from typing import List, Union
+
+Card = Union[int, str]
+
+# Integer card codes shared by the simulation engines.
+#
+# - 0..12 are the number cards (the code is the card value).
+# - 13..17 are the additive modifiers "+2".."+10".
+# - 18 is the "*2" multiplier.
+# - 19 is "Second Chance".
+NUMBER_CARDS = 13
+MODIFIER_VALUES = (2, 4, 6, 8, 10)
+PLUS_BASE = NUMBER_CARDS
+TIMES_TWO = PLUS_BASE + len(MODIFIER_VALUES)
+SECOND_CHANCE = TIMES_TWO + 1
+CARD_KINDS = SECOND_CHANCE + 1
+
+SEVEN_CARD_BONUS = 15
+SECOND_CHANCE_COUNT = 3
+
+
+def build_deck() -> List[int]:
+    """Return the standard deck as integer codes, in the order `run_experiment` builds it.
+
+    One 0, `i` copies of each number `i` in 1..12, one of each additive
+    modifier, one "*2" and three "Second Chance" cards (88 cards in total).
+    """
+    deck = [0]
+    for i in range(1, NUMBER_CARDS):
+        deck += [i] * i
+    deck += list(range(PLUS_BASE, TIMES_TWO))
+    deck += [TIMES_TWO] + [SECOND_CHANCE] * SECOND_CHANCE_COUNT
+    return deck
+
+
+__all__ = [
+    "CARD_KINDS",
+    "MODIFIER_VALUES",
+    "NUMBER_CARDS",
+    "PLUS_BASE",
+    "SECOND_CHANCE",
+    "SECOND_CHANCE_COUNT",
+    "SEVEN_CARD_BONUS",
+    "TIMES_TWO",
+    "build_deck",
+]
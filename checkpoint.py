@@ -0,0 +1,200 @@
+from __future__ import annotations
+from typing import Optional
+import json
+import os
+import random
+
+import numpy as np
+
+from game import (
+    ENGINES,
+    ExperimentResults,
+    _blocks,
+    _ScalarStream,
+)
+from rules import STANDARD, Ruleset
+
+# Hands played between two checkpoints.
+CHECKPOINT_BLOCK = 262_144
+
+_STATE_FILE = "state.json"
+# name -> dtype of the per-hand arrays kept next to the state file.
+_ARRAYS = {
+    "scores": np.int16,
+    "cards_at_scoring": np.uint8,
+}
+
+
+def _array_path(path: str, name: str) -> str:
+    return os.path.join(path, f"{name}.npy")
+
+
+def _read_state(path: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(path, _STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_state(path: str, state: dict) -> None:
+    """Replace the state file atomically, so a crash leaves the previous one."""
+    target = os.path.join(path, _STATE_FILE)
+    tmp = f"{target}.tmp{os.getpid()}"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, target)
+
+
+def _rng_state(rng: random.Random) -> list:
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def _set_rng_state(rng: random.Random, state: list) -> None:
+    version, internal, gauss_next = state
+    rng.setstate((version, tuple(internal), gauss_next))
+
+
+def load_results(path: str) -> ExperimentResults:
+    """Open the results of a checkpointed run without reading them into memory.
+
+    The lists in the returned `ExperimentResults` are read-only memory-mapped
+    arrays covering the hands completed so far, so an unfinished run can be
+    inspected (or plotted) too.
+    """
+    state = _read_state(path)
+    if state is None:
+        raise FileNotFoundError(f"no checkpoint in {path}")
+    done = state["done"]
+    arrays = {
+        name: np.load(_array_path(path, name), mmap_mode="r")[:done]
+        for name in _ARRAYS
+    }
+    return ExperimentResults(
+        scores=arrays["scores"],
+        count_reached7=state["count_reached7"],
+        count_already_true=state["count_already_true"],
+        cards_at_scoring=arrays["cards_at_scoring"],
+    )
+
+
+def run_checkpointed(
+    path: str,
+    hands: int = 100_000,
+    seed: Optional[int] = None,
+    engine: str = "scalar",
+    block: int = CHECKPOINT_BLOCK,
+    rules: Ruleset = STANDARD,
+) -> ExperimentResults:
+    """Run an experiment that checkpoints to the directory `path` as it goes.
+
+    Hands are played in blocks of `block`. After each block its scores and
+    cards at scoring are written into memory-mapped
+    `.npy` files sized for the whole run, flushed, and only then is
+    `state.json` (hands done, counters, exact score total and the engine's
+    random state) atomically replaced. If `path` already holds a run with the
+    same parameters it is resumed from its last checkpoint, and the finished
+    output is identical to an uninterrupted run. The scalar engine plays
+    exactly the hands `run_experiment(hands, seed)` plays.
+
+    Returns `load_results(path)`.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    if block < 1:
+        raise ValueError(f"block must be at least 1, got {block}")
+    os.makedirs(path, exist_ok=True)
+    params = {
+        "hands": hands,
+        "seed": seed,
+        "engine": engine,
+        "block": block,
+        "rules": rules.to_dict(),
+    }
+
+    state = _read_state(path)
+    if state is not None:
+        # Checkpoints written before rulesets existed used the standard deck.
+        state.setdefault("rules", STANDARD.to_dict())
+        stored = {key: state[key] for key in params}
+        if seed is None:
+            stored["seed"] = None
+        if stored != params:
+            raise ValueError(
+                f"{path} holds a checkpoint for {stored}, not {params}"
+            )
+        mode = "r+"
+    else:
+        if seed is None:
+            # Resuming needs a concrete seed to reproduce the NumPy streams.
+            seed = int(np.random.SeedSequence().entropy)
+        state = dict(
+            params,
+            seed=seed,
+            done=0,
+            total=0,
+            count_reached7=0,
+            count_already_true=0,
+            rng=None,
+        )
+        mode = "w+"
+    seed = state["seed"]
+    arrays = {
+        name: np.lib.format.open_memmap(
+            _array_path(path, name), mode=mode, dtype=dtype, shape=(hands,)
+        )
+        for name, dtype in _ARRAYS.items()
+    }
+
+    sizes = _blocks(hands, block)
+    # Checkpoints fall on block boundaries; only the last block can be short.
+    first = len(sizes) if state["done"] == hands else state["done"] // block
+    if engine == "numpy":
+        from batch_engine import simulate
+
+        streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    else:
+        deck_stream = _ScalarStream(random.Random(seed), rules)
+        if state["rng"] is not None:
+            _set_rng_state(deck_stream.rng, state["rng"]["state"])
+            deck_stream.deck = state["rng"]["deck"]
+            deck_stream.index = state["rng"]["index"]
+
+    for i in range(first, len(sizes)):
+        if engine == "numpy":
+            scores, cards_at_scoring, reached7, already_true = simulate(
+                sizes[i], streams[i], rules=rules
+            )
+        else:
+            batch = deck_stream.play(sizes[i])
+            scores = np.asarray(batch[0], dtype=np.int64)
+            cards_at_scoring = np.asarray(batch[1])
+            reached7, already_true = batch[2], batch[3]
+
+        done = state["done"]
+        end = done + scores.size
+        arrays["scores"][done:end] = scores
+        arrays["cards_at_scoring"][done:end] = cards_at_scoring
+        for array in arrays.values():
+            array.flush()
+
+        state["done"] = end
+        state["total"] += int(scores.sum())
+        state["count_reached7"] += int(reached7)
+        state["count_already_true"] += int(already_true)
+        if engine == "scalar":
+            state["rng"] = {
+                "state": _rng_state(deck_stream.rng),
+                "deck": deck_stream.deck,
+                "index": deck_stream.index,
+            }
+        _write_state(path, state)
+
+    del arrays
+    return load_results(path)
+
+
+__all__ = ["CHECKPOINT_BLOCK", "load_results", "run_checkpointed"]
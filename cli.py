@@ -0,0 +1,164 @@
+from __future__ import annotations
+from itertools import product
+from typing import List, Optional, Sequence
+import argparse
+import csv
+import json
+import sys
+import time
+
+from game import ENGINES, ExperimentSummary, run_experiment
+
+FIELDS = (
+    "hands",
+    "seed",
+    "engine",
+    "workers",
+    "mean",
+    "std",
+    "min",
+    "q1",
+    "median",
+    "q3",
+    "max",
+    "reached7",
+    "duplicate",
+    "seconds",
+    "hands_per_sec",
+    "ci_half_width",
+)
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Simulate Flip-7 hands and print summary statistics.",
+    )
+    parser.add_argument(
+        "--hands", type=int, nargs="+", default=[100_000], help="hands per run"
+    )
+    parser.add_argument(
+        "--seed", type=int, nargs="+", default=[None], help="random seed(s)"
+    )
+    parser.add_argument(
+        "--engine", choices=ENGINES, nargs="+", default=["scalar"], help="engine(s)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="process pool size")
+    parser.add_argument(
+        "--chunk-size", type=int, default=None, help="hands per worker chunk"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="stop once the 95%% CI of the mean is this narrow; --hands is then the cap",
+    )
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="write to this file instead of stdout")
+    parser.add_argument(
+        "--cache", action="store_true", help="reuse results from the on-disk cache"
+    )
+    parser.add_argument(
+        "--plot", action="store_true", help="open the statistics window for each run"
+    )
+    args = parser.parse_args(argv)
+    if args.tolerance is not None and (
+        args.workers != 1 or args.chunk_size is not None or args.cache
+    ):
+        parser.error("--tolerance cannot be combined with --workers, --chunk-size or --cache")
+    return args
+
+
+def _row(
+    summary: ExperimentSummary, seed: Optional[int], engine: str, workers: int, seconds: float
+) -> dict:
+    row = dict.fromkeys(FIELDS)
+    row.update(
+        hands=summary.hands,
+        seed=seed,
+        engine=engine,
+        workers=workers,
+        reached7=summary.count_reached7,
+        duplicate=summary.count_already_true,
+        seconds=round(seconds, 4),
+    )
+    if summary.hands:
+        row.update(
+            mean=summary.mean,
+            std=summary.std,
+            min=summary.min_score,
+            q1=summary.quantile(0.25),
+            median=summary.quantile(0.5),
+            q3=summary.quantile(0.75),
+            max=summary.max_score,
+            hands_per_sec=round(summary.hands / seconds) if seconds > 0 else None,
+        )
+    return row
+
+
+def run_grid(args: argparse.Namespace) -> List[dict]:
+    """Run every (hands, seed, engine) combination and return one row per run."""
+    rows = []
+    for hands, seed, engine in product(args.hands, args.seed, args.engine):
+        start = time.perf_counter()
+        half_width = None
+        if args.tolerance is not None:
+            run = run_experiment(hands, seed, engine, tolerance=args.tolerance)
+            summary, half_width = run.summary, run.half_width
+        elif args.cache:
+            from cache import cached_experiment
+
+            summary = cached_experiment(
+                hands, seed, engine, args.workers, args.chunk_size
+            )
+        else:
+            summary = run_experiment(
+                hands, seed, engine, args.workers, args.chunk_size, stream=True
+            )
+        row = _row(summary, seed, engine, args.workers, time.perf_counter() - start)
+        row["ci_half_width"] = half_width
+        rows.append(row)
+        if args.plot and summary.hands:
+            from main import _plot_stats_window_tk
+
+            _plot_stats_window_tk(summary)
+    return rows
+
+
+def write_rows(rows: Sequence[dict], fmt: str, out) -> None:
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: `python -m cli --hands 1000000 --seed 42`.
+
+    Every combination of the `--hands`, `--seed` and `--engine` values is
+    run, and one row of summary statistics per run is printed (or written to
+    `--output`) as JSON or CSV. With `--tolerance`, each run stops early
+    once the mean is known to that precision and the row reports the hands
+    used and the half-width reached; it runs in one process without the
+    cache, so `--workers`, `--chunk-size` and `--cache` are rejected. Only the standard library and the simulation
+    core are imported at startup; NumPy, the cache and tkinter are imported
+    only by the options that need them.
+    """
+    args = _parse_args(argv)
+    rows = run_grid(args)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_rows(rows, args.format, f)
+    else:
+        write_rows(rows, args.format, sys.stdout)
+    return 0
+
+
+__all__ = ["FIELDS", "main", "run_grid", "write_rows"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import math
+import numpy as np
+
+from batch_engine import _LaneHook, _play_lanes, _tables
+from rules import CHANCE, PLUS, STANDARD, TIMES, Ruleset
+
+METHODS = ("plain", "antithetic", "control", "stratified")
+DEFAULT_BATCH = 1 << 16
+# Deck positions whose cards serve as control variates.
+CONTROL_POSITIONS = 8
+
+
+@dataclass
+class MeanEstimate:
+    """A Monte Carlo estimate of the expected score of a fresh-deck hand.
+
+    `reduction_factor` is the per-hand variance of plain sampling divided by
+    the estimator's, both measured on this run: the plain estimator would
+    need that many times more hands for the same `std_error`.
+    """
+
+    method: str
+    hands: int
+    mean: float
+    std_error: float
+    reduction_factor: float
+
+
+class _RowOrder(_LaneHook):
+    """Records which deck row each finished hand came from."""
+
+    def __init__(self, rows: int) -> None:
+        self.ids = np.arange(rows)
+        self.row_of = np.empty(rows, dtype=np.intp)
+
+    def finished(self, done: np.ndarray, out: slice) -> None:
+        self.row_of[out] = self.ids[done]
+
+    def keep(self, live: np.ndarray) -> None:
+        self.ids = self.ids[live]
+
+
+def play_fresh(
+    decks: np.ndarray,
+    rules: Ruleset = STANDARD,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Score of the always-hit hand played from the top of each row of `decks`.
+
+    Every row is a full shuffled deck of card codes, so each hand starts from
+    a fresh deck, as in `exact.solve_exact`. The rows are played as lanes of
+    `batch_engine`'s loop with a quota of one hand each; as in
+    `run_experiment`, a busted hand scores the cards it held. Only a tiny
+    custom deck can be played through by one hand; it is then reshuffled
+    with `rng` (a fresh generator if None), as the scalar engine would.
+    """
+    n = decks.shape[0]
+    order = _RowOrder(n)
+    rng = rng or np.random.default_rng()
+    quota = np.ones(n, dtype=np.int64)
+    played, _, _, _ = _play_lanes(decks.copy(), quota, rng, rules, hook=order)
+    scores = np.empty(n, dtype=np.int32)
+    scores[order.row_of] = played
+    return scores
+
+
+def _shuffled(rng: np.random.Generator, base: np.ndarray, n: int) -> np.ndarray:
+    return rng.permuted(np.tile(base, (n, 1)), axis=1)
+
+
+def _control_table(rules: Ruleset) -> np.ndarray:
+    """Per-code control features: number value, modifier value, "*2", Second Chance.
+
+    Features that are constant over the deck (a card the rules leave out)
+    are dropped, so the regression stays well posed.
+    """
+    compiled = rules.compile()
+    kinds = np.array(compiled.kinds)
+    _, value_of, _ = _tables(rules)
+    table = np.stack(
+        [
+            value_of,
+            np.array(compiled.adds) * (kinds == PLUS),
+            kinds == TIMES,
+            kinds == CHANCE,
+        ],
+        axis=1,
+    ).astype(np.float64)
+    on_deck = table[np.array(compiled.deck)]
+    return table[:, on_deck.var(axis=0) > 0]
+
+
+def _plain(rng, base, hands, batch, rules) -> Tuple[int, float, float, float]:
+    n = s1 = s2 = 0.0
+    for start in range(0, hands, batch):
+        y = play_fresh(_shuffled(rng, base, min(batch, hands - start)), rules, rng)
+        n += y.size
+        s1 += float(y.sum())
+        s2 += float(np.dot(y, y.astype(np.float64)))
+    mean = s1 / n
+    var = (s2 - n * mean * mean) / (n - 1)
+    return int(n), mean, var / n, var
+
+
+def _antithetic(rng, base, hands, batch, rules) -> Tuple[int, float, float, float]:
+    """Play each shuffle from the top and, reversed, from the bottom.
+
+    A reversed uniform shuffle is again uniform, and the two hands draw
+    from opposite ends of one deck, so a run of high cards at the top leaves
+    fewer of them at the bottom and their scores are negatively correlated.
+    """
+    pairs = hands // 2
+    n = s1 = s2 = p1 = p2 = 0.0
+    for start in range(0, pairs, batch):
+        decks = _shuffled(rng, base, min(batch, pairs - start))
+        y = play_fresh(decks, rules, rng).astype(np.float64)
+        y_rev = play_fresh(decks[:, ::-1], rules, rng).astype(np.float64)
+        pair = (y + y_rev) / 2
+        n += pair.size
+        s1 += y.sum() + y_rev.sum()
+        s2 += np.dot(y, y) + np.dot(y_rev, y_rev)
+        p1 += pair.sum()
+        p2 += np.dot(pair, pair)
+    mean = p1 / n
+    pair_var = (p2 - n * mean * mean) / (n - 1)
+    hand_var = (s2 - 2 * n * mean * mean) / (2 * n - 1)
+    return 2 * int(n), mean, pair_var / n, hand_var
+
+
+def _control(rng, base, hands, batch, rules) -> Tuple[int, float, float, float]:
+    """Regression estimator on the cards at the first `CONTROL_POSITIONS` positions.
+
+    In a uniform shuffle every position holds an average card of the deck,
+    so each feature's expectation is known exactly; the score is regressed
+    on them and the fitted deviation of their sample means subtracted.
+    """
+    table = _control_table(rules)
+    mu = np.tile(table[base].mean(axis=0), CONTROL_POSITIONS)
+    p = mu.size
+    n = 0
+    sx = np.zeros(p + 1)
+    sxx = np.zeros((p + 1, p + 1))
+    for start in range(0, hands, batch):
+        decks = _shuffled(rng, base, min(batch, hands - start))
+        y = play_fresh(decks, rules, rng)
+        x = np.empty((y.size, p + 1))
+        x[:, :p] = table[decks[:, :CONTROL_POSITIONS]].reshape(y.size, p) - mu
+        x[:, p] = y
+        n += y.size
+        sx += x.sum(axis=0)
+        sxx += x.T @ x
+    means = sx / n
+    cov = (sxx - n * np.outer(means, means)) / (n - 1)
+    cxx, cxy, var = cov[:p, :p], cov[:p, p], cov[p, p]
+    beta = np.linalg.lstsq(cxx, cxy, rcond=None)[0]
+    # Controls are centered on their expectations, so `means[:p]` is the error.
+    mean = means[p] - float(beta @ means[:p])
+    resid = max(var - float(cxy @ beta), 0.0) * (n - 1) / max(n - p - 1, 1)
+    return n, mean, resid / n, var
+
+
+def _stratified(rng, base, hands, batch, rules) -> Tuple[int, float, float, float]:
+    """Stratify on the first card of the deck, with proportional allocation.
+
+    Each card kind gets its share of the hands (largest remainders), its
+    hands are dealt from decks with that card on top and the rest shuffled,
+    and the stratum means are weighted by the kinds' probabilities.
+    """
+    codes, copies = np.unique(base, return_counts=True)
+    weights = copies / base.size
+    if hands < 2 * codes.size:
+        raise ValueError(f"stratified sampling needs at least {2 * codes.size} hands")
+    quota = np.floor(hands * weights).astype(np.int64)
+    quota[np.argsort(hands * weights - quota)[::-1][: hands - quota.sum()]] += 1
+    # Strata short of two hands borrow them, so every variance is estimable.
+    quota = np.maximum(quota, 2)
+    rest = [np.delete(base, np.flatnonzero(base == c)[0]) for c in codes]
+
+    mean = err = s1 = s2 = 0.0
+    n = 0
+    for code, w, n_c, tail in zip(codes, weights, quota, rest):
+        t1 = t2 = 0.0
+        for start in range(0, int(n_c), batch):
+            m = min(batch, int(n_c) - start)
+            decks = np.empty((m, base.size), dtype=base.dtype)
+            decks[:, 0] = code
+            decks[:, 1:] = _shuffled(rng, tail, m)
+            y = play_fresh(decks, rules, rng).astype(np.float64)
+            t1 += y.sum()
+            t2 += np.dot(y, y)
+        m_c = t1 / n_c
+        v_c = (t2 - n_c * m_c * m_c) / (n_c - 1)
+        mean += w * m_c
+        err += w * w * v_c / n_c
+        s1 += t1
+        s2 += t2
+        n += int(n_c)
+    # Plain per-hand variance: within-stratum plus between-stratum spread.
+    pooled = s2 / n - (s1 / n) ** 2
+    return n, mean, err, pooled * n / (n - 1)
+
+
+_ESTIMATORS = {
+    "plain": _plain,
+    "antithetic": _antithetic,
+    "control": _control,
+    "stratified": _stratified,
+}
+
+
+def estimate_mean(
+    hands: int = 100_000,
+    seed=None,
+    method: str = "control",
+    rules: Ruleset = STANDARD,
+    batch: int = DEFAULT_BATCH,
+) -> MeanEstimate:
+    """Estimate the expected score of an always-hit hand from a fresh deck.
+
+    - "plain": independent shuffles, the baseline.
+    - "antithetic": each shuffle is played from both ends (see `_antithetic`).
+    - "control": linear control variates on the cards dealt to the first
+      positions, whose expectations follow from the deck composition.
+    - "stratified": proportional stratification on the top card of the deck.
+
+    Unlike `run_experiment`, every hand starts from a freshly shuffled deck,
+    which is what makes the shuffles controllable; the expectation is the
+    one `exact.solve_exact` computes, slightly below the carried-deck mean.
+    Hands are played in vectorized batches of `batch` decks.
+    """
+    if method not in _ESTIMATORS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    if hands < 4:
+        raise ValueError(f"hands must be at least 4, got {hands}")
+    rng = np.random.default_rng(seed)
+    base = np.array(rules.compile().deck, dtype=np.int8)
+    n, mean, est_var, hand_var = _ESTIMATORS[method](rng, base, hands, batch, rules)
+    factor = hand_var / n / est_var if est_var > 0 else math.inf
+    return MeanEstimate(method, int(n), float(mean), math.sqrt(est_var), float(factor))
+
+
+def compare_estimators(
+    hands: int = 100_000,
+    seed=None,
+    methods: Optional[Sequence[str]] = None,
+    rules: Ruleset = STANDARD,
+) -> List[MeanEstimate]:
+    """Run each estimator on `hands` hands, each with its own stream from `seed`."""
+    methods = list(methods or METHODS)
+    seeds = np.random.SeedSequence(seed).spawn(len(methods))
+    return [estimate_mean(hands, s, m, rules) for m, s in zip(methods, seeds)]
+
+
+def format_estimates(estimates: Sequence[MeanEstimate]) -> str:
+    """Render estimates as a fixed-width text table."""
+    lines = [f"{'method':<10}  {'hands':>10}  {'mean':>8}  {'std err':>8}  {'factor':>7}"]
+    for e in estimates:
+        lines.append(
+            f"{e.method:<10}  {e.hands:>10}  {e.mean:>8.3f}  {e.std_error:>8.4f}"
+            f"  {e.reduction_factor:>7.2f}"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "METHODS",
+    "MeanEstimate",
+    "compare_estimators",
+    "estimate_mean",
+    "format_estimates",
+    "play_fresh",
+]
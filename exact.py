@@ -0,0 +1,173 @@
+from __future__ import annotations
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+from typing import Dict, Tuple
+
+from cards import (
+    MODIFIER_VALUES,
+    NUMBER_CARDS,
+    SECOND_CHANCE_COUNT,
+    SEVEN_CARD_BONUS,
+    build_deck,
+)
+
+REASON_REACHED7 = "reached7"
+REASON_DUPLICATE = "duplicate"
+
+_COPIES = tuple(build_deck().count(v) for v in range(NUMBER_CARDS))
+_NUMBERS = sum(_COPIES)
+# Cards that never change how a hand unfolds: the additive modifiers and "*2".
+_INERT = len(MODIFIER_VALUES) + 1
+_ACTIVE = _NUMBERS + SECOND_CHANCE_COUNT
+
+# (hand bitmask, Second Chance cards drawn, Second Chance active,
+#  values discarded by Second Chance)
+State = Tuple[int, int, int, Tuple[int, ...]]
+
+
+@dataclass
+class ExactDistribution:
+    """Exact outcome probabilities of one hand played from a fresh deck."""
+
+    score_probs: Dict[int, float]
+    cards_probs: Dict[int, float]
+    reason_probs: Dict[str, float]
+    states: int
+
+    @property
+    def mean(self) -> float:
+        return sum(s * p for s, p in self.score_probs.items())
+
+    @property
+    def variance(self) -> float:
+        mean = self.mean
+        return sum((s - mean) ** 2 * p for s, p in self.score_probs.items())
+
+
+@lru_cache(maxsize=None)
+def _plus_sums(k: int) -> Tuple[Tuple[int, float], ...]:
+    """Distribution of the sum of `k` additive modifiers drawn without replacement."""
+    subsets = list(combinations(MODIFIER_VALUES, k))
+    sums: Dict[int, float] = defaultdict(float)
+    for subset in subsets:
+        sums[sum(subset)] += 1 / len(subsets)
+    return tuple(sorted(sums.items()))
+
+
+@lru_cache(maxsize=None)
+def _inert_drawn(steps: int) -> Tuple[Tuple[int, float], ...]:
+    """Distribution of how many inert cards precede the `steps`-th active card.
+
+    In a uniform shuffle the inert cards fall into the gaps between active
+    cards exchangeably, which gives a negative hypergeometric count.
+    """
+    total = comb(_ACTIVE + _INERT, _INERT)
+    return tuple(
+        (j, comb(steps - 1 + j, j) * comb(_ACTIVE - steps + _INERT - j, _INERT - j) / total)
+        for j in range(_INERT + 1)
+    )
+
+
+# One entry per hand bitmask, so at most 2**13.
+@lru_cache(maxsize=None)
+def _transitions(mask: int):
+    """Return `(copies left, value, already held, new mask, cards)` per number value."""
+    out = []
+    for v in range(NUMBER_CARDS):
+        held = mask >> v & 1
+        left = _COPIES[v] - held
+        if left > 0:
+            new_mask = mask if held else mask | 1 << v
+            out.append((left, v, held, new_mask, bin(new_mask).count("1")))
+    return tuple(out)
+
+
+def _hand_sum(mask: int) -> int:
+    return sum(v for v in range(NUMBER_CARDS) if mask >> v & 1)
+
+
+def solve_exact() -> ExactDistribution:
+    """Compute the exact score distribution of the always-hit policy.
+
+    Assumes every hand starts from a freshly shuffled standard deck (the
+    scalar engine instead carries its deck across hands, which shifts the
+    distribution slightly).
+
+    The additive modifiers and "*2" never change how a hand unfolds, so the
+    recursion only runs over number and Second Chance cards: probability mass
+    is pushed forward one draw at a time over the hand bitmask, the Second
+    Chance state and the values it discarded. How many modifiers were drawn
+    before the hand ended, and which ones, is folded in exactly at the end.
+    Per-mask transition lists are memoized; each layer holds the reachable
+    states after one more draw, and `states` counts them over all layers.
+    """
+    layer: Dict[State, float] = {(0, 0, 0, ()): 1.0}
+    # (hand bitmask, active cards drawn, reached 7) -> probability
+    ends: Dict[Tuple[int, int, bool], float] = defaultdict(float)
+    seen = 0
+    drawn = 0
+
+    while layer:
+        seen += len(layer)
+        p_step = 1 / (_ACTIVE - drawn)
+        steps = drawn + 1
+        nxt: Dict[State, float] = defaultdict(float)
+        for state, prob in layer.items():
+            mask, chances, active, saved = state
+            p = prob * p_step
+            for left, v, held, new_mask, count in _transitions(mask):
+                if saved:
+                    left -= saved.count(v)
+                    if left == 0:
+                        continue
+                q = p * left
+                if held:
+                    if active:
+                        nxt[(mask, chances, 0, tuple(sorted(saved + (v,))))] += q
+                    else:
+                        ends[(mask, steps, False)] += q
+                elif count == 7:
+                    ends[(new_mask, steps, True)] += q
+                else:
+                    nxt[(new_mask, chances, active, saved)] += q
+            if chances < SECOND_CHANCE_COUNT:
+                nxt[(mask, chances + 1, 1, saved)] += p * (SECOND_CHANCE_COUNT - chances)
+        layer = nxt
+        drawn += 1
+
+    score_probs: Dict[int, float] = defaultdict(float)
+    cards_probs: Dict[int, float] = defaultdict(float)
+    reason_probs: Dict[str, float] = defaultdict(float)
+    for (mask, steps, reached), prob in ends.items():
+        total = _hand_sum(mask)
+        bonus = SEVEN_CARD_BONUS if reached else 0
+        cards_probs[bin(mask).count("1")] += prob
+        reason_probs[REASON_REACHED7 if reached else REASON_DUPLICATE] += prob
+        for j, p_j in _inert_drawn(steps):
+            if p_j == 0:
+                continue
+            # The j inert cards are a uniform subset; "*2" is among them w.p. j/6.
+            for doubled, p_d in ((1, j / _INERT), (0, 1 - j / _INERT)):
+                k = j - doubled
+                if p_d == 0 or k < 0:
+                    continue
+                base = total * (1 + doubled) + bonus
+                for plus_sum, p_s in _plus_sums(k):
+                    score_probs[base + plus_sum] += prob * p_j * p_d * p_s
+    return ExactDistribution(
+        score_probs=dict(sorted(score_probs.items())),
+        cards_probs=dict(sorted(cards_probs.items())),
+        reason_probs=dict(reason_probs),
+        states=seen,
+    )
+
+
+__all__ = [
+    "ExactDistribution",
+    "REASON_DUPLICATE",
+    "REASON_REACHED7",
+    "solve_exact",
+]
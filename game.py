@@ -1,69 +1,439 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import random
-from player import Player
+import time
+from hooks import RunHooks, RunStats
+from player import BUST, CONTINUE, REACHED_SEVEN, FastPlayer
+from rules import PLUS, STANDARD, TIMES, Ruleset
+from summary import ExperimentSummary
 
+if TYPE_CHECKING:
+    from bootstrap import BootstrapCI
+    from precision import PrecisionRun
+    from tracing import TraceWriter
 
-@dataclass
+
+@dataclass(init=False)
 class ExperimentResults:
-    running_avg: List[float]
-    scores: List[int]
+    """Per-hand results of a run, held compactly.
+
+    `scores` holds int16 and `cards_at_scoring` uint8 values, as read-only
+    memoryviews of an `array("h")` and an `array("B")`: 3 bytes per hand
+    instead of two list slots and a boxed float. Both behave like read-only
+    lists (`len`, indexing, slicing, iteration; `tolist()` for a real list)
+    and are wrapped without a copy by `np.asarray`. Lists passed in are
+    converted, and values outside those types raise `OverflowError`; arrays
+    passed in are wrapped, not copied. Results read back from a checkpoint
+    or the cache hold non-writeable NumPy arrays instead.
+
+    The constructor keeps its original signature: a `running_avg` argument
+    is accepted and ignored, since `running_avg` is derived from `scores`.
+    """
+
+    scores: Sequence[int]
     count_reached7: int
     count_already_true: int
-    cards_at_scoring: List[int]
+    cards_at_scoring: Sequence[int]
+    # Counters and phase timings, set when the run was given `hooks`.
+    instrumentation: Optional[RunStats] = None
 
+    def __init__(
+        self,
+        running_avg: Optional[Sequence[float]] = None,
+        scores: Sequence[int] = (),
+        count_reached7: int = 0,
+        count_already_true: int = 0,
+        cards_at_scoring: Sequence[int] = (),
+        instrumentation: Optional[RunStats] = None,
+    ) -> None:
+        self.scores = _readonly("h", scores)
+        self.count_reached7 = count_reached7
+        self.count_already_true = count_already_true
+        self.cards_at_scoring = _readonly("B", cards_at_scoring)
+        self.instrumentation = instrumentation
+        # Not a dataclass field: derived from `scores`, which cannot change.
+        self._running_avg: Optional[Sequence[float]] = None
 
-def run_experiment(
-    hands: int = 100_000, seed: Optional[int] = None
-) -> ExperimentResults:
-    if seed is not None:
-        random.seed(seed)
-
-    deck: List[int | str] = [0]
-    for i in range(1, 13):
-        deck += [i] * i
-    deck += ["+2", "+4", "+6", "+8", "+10"] + ["*2"] + ["Second Chance"] * 3
-    random.shuffle(deck)
-
-    player = Player()
-    len_deck = len(deck)
-    index = 0
-    scores: List[int] = []
-    cards_at_scoring: List[int] = []
-    running_avg: List[float] = []
-    cumulative_sum = 0
-    count_reached7 = 0
-    count_already_true = 0
-
-    remaining = hands
-    while remaining > 0:
-        if index == len_deck:
-            index = 0
-            random.shuffle(deck)
-        try:
-            player.add_card(deck[index])
-        except IndexError as e:
-            msg = str(e)
-            if msg == "Reached 7 True positions":
+    @property
+    def running_avg(self) -> Sequence[float]:
+        """Mean of the first `i + 1` scores at index `i`, read-only like `scores`.
+
+        Computed on first access with one NumPy cumulative sum, then kept.
+        """
+        if self._running_avg is None:
+            import numpy as np
+
+            scores = np.asarray(self.scores)
+            avg = np.cumsum(scores, dtype=np.int64) / np.arange(1, scores.size + 1)
+            self._running_avg = memoryview(array("d", avg.tobytes())).toreadonly()
+        return self._running_avg
+
+    def bootstrap(
+        self, resamples: int = 1000, confidence: float = 0.95, seed=None
+    ) -> BootstrapCI:
+        """Bootstrap CIs of the mean, median, quartiles and reached-7 ratio.
+
+        See `bootstrap.bootstrap_ci`; the resampling runs on the score
+        histogram, so it costs about the same for any number of hands.
+        """
+        from bootstrap import bootstrap_ci
+
+        return bootstrap_ci(self, resamples, confidence, seed)
+
+
+ENGINES = ("scalar", "numpy")
+# Bump when a change alters the hands a seeded run plays (cached results key on it).
+ENGINE_VERSION = 2
+DEFAULT_CHUNK_SIZE = 100_000
+STREAM_BLOCK = 65_536
+# The NumPy engine streams in blocks that fill all its lanes
+# (`batch_engine.MAX_LANES * HANDS_PER_LANE`).
+NUMPY_STREAM_BLOCK = 1 << 21
+
+# Range of the compact array types `ExperimentResults` stores per-hand values in.
+_LIMITS = {"h": (-(1 << 15), (1 << 15) - 1), "B": (0, (1 << 8) - 1)}
+
+# Per-hand values are lists (scalar engine) or NumPy arrays (NumPy engine).
+HandBatch = Tuple[Sequence[int], Sequence[int], int, int]
+
+
+class _ScalarStream:
+    """One shuffled deck carried across hands, played in batches by `play`."""
+
+    def __init__(self, rng: random.Random, rules: Ruleset = STANDARD) -> None:
+        self.rng = rng
+        self.rules = rules.compile()
+        self.deck = list(self.rules.deck)
+        rng.shuffle(self.deck)
+        self.index = 0
+        self.player = FastPlayer(rules)
+
+    def play(self, hands: int) -> HandBatch:
+        """Play the next `hands` hands.
+
+        Returns `(scores, cards_at_scoring, count_reached7, count_already_true)`.
+        """
+        rng = self.rng
+        deck = self.deck
+        player = self.player
+        draw = player.draw
+        len_deck = len(deck)
+        index = self.index
+        scores: List[int] = []
+        cards_at_scoring: List[int] = []
+        count_reached7 = 0
+        count_already_true = 0
+
+        remaining = hands
+        while remaining > 0:
+            if index == len_deck:
+                index = 0
+                rng.shuffle(deck)
+            result = draw(deck[index])
+            index += 1
+            if result == CONTINUE:
+                continue
+            if result == REACHED_SEVEN:
+                count_reached7 += 1
+            elif result == BUST:
+                count_already_true += 1
+
+            scores.append(player.score())
+            cards_at_scoring.append(player.count)
+            player.reset()
+            remaining -= 1
+
+        self.index = index
+        return scores, cards_at_scoring, count_reached7, count_already_true
+
+    def play_traced(self, hands: int, trace: "TraceWriter") -> HandBatch:
+        """`play` that also logs each shuffled deck and where each hand ends
+        to `trace` (a `tracing.TraceWriter` already holding the current deck).
+
+        Plays exactly the same hands as `play`.
+        """
+        rng = self.rng
+        deck = self.deck
+        player = self.player
+        draw = player.draw
+        len_deck = len(deck)
+        index = self.index
+        base = trace.dealt - len_deck
+        ends: List[int] = []
+        scores: List[int] = []
+        cards_at_scoring: List[int] = []
+        count_reached7 = 0
+        count_already_true = 0
+
+        remaining = hands
+        while remaining > 0:
+            if index == len_deck:
+                index = 0
+                rng.shuffle(deck)
+                trace.write_deck(deck)
+                base += len_deck
+            result = draw(deck[index])
+            index += 1
+            if result == CONTINUE:
+                continue
+            if result == REACHED_SEVEN:
                 count_reached7 += 1
-            elif msg.startswith("position ") and msg.endswith(" is already True"):
+            elif result == BUST:
                 count_already_true += 1
 
-            cards_in_hand_now = sum(1 for v in player.hand if v)
-            score = player.Score()
-            scores.append(score)
-            cards_at_scoring.append(cards_in_hand_now)
-            cumulative_sum += score
-            running_avg.append(cumulative_sum / len(scores))
-            player.reset_hand()
+            scores.append(player.score())
+            cards_at_scoring.append(player.count)
+            ends.append(base + index)
+            player.reset()
             remaining -= 1
-        except Exception as e:
-            print(e)
-        index += 1
 
+        self.index = index
+        trace.write_ends(ends)
+        return scores, cards_at_scoring, count_reached7, count_already_true
+
+    def play_instrumented(self, hands: int, hooks: RunHooks, total: int) -> HandBatch:
+        """`play` that also times each phase, counts events into `hooks.stats`
+        and reports progress towards `total` hands.
+
+        Plays exactly the same hands as `play`.
+        """
+        clock = time.perf_counter
+        started = clock()
+        stats = hooks.stats
+        every = hooks.every
+        rng = self.rng
+        deck = self.deck
+        player = self.player
+        draw = player.draw
+        numbers = self.rules.numbers
+        kinds = self.rules.kinds
+        len_deck = len(deck)
+        index = self.index
+        scores: List[int] = []
+        cards_at_scoring: List[int] = []
+        count_reached7 = 0
+        count_already_true = 0
+        t_draw = t_scoring = t_shuffle = 0.0
+        cards = reshuffles = chances_used = modifiers = 0
+
+        remaining = hands
+        while remaining > 0:
+            if index == len_deck:
+                t0 = clock()
+                index = 0
+                rng.shuffle(deck)
+                t_shuffle += clock() - t0
+                reshuffles += 1
+            code = deck[index]
+            index += 1
+            had_chance = player.second_chance
+            t0 = clock()
+            try:
+                result = draw(code)
+            except Exception as exc:
+                t_draw += clock() - t0
+                stats.errors += 1
+                stats.last_error = repr(exc)
+                hooks.on_error(exc, stats.hands)
+                continue
+            t_draw += clock() - t0
+            cards += 1
+            if code >= numbers:
+                if kinds[code] == PLUS or kinds[code] == TIMES:
+                    modifiers += 1
+            elif had_chance and not player.second_chance:
+                chances_used += 1
+            if result == CONTINUE:
+                continue
+            if result == REACHED_SEVEN:
+                count_reached7 += 1
+            elif result == BUST:
+                count_already_true += 1
+
+            t0 = clock()
+            scores.append(player.score())
+            cards_at_scoring.append(player.count)
+            player.reset()
+            t_scoring += clock() - t0
+            remaining -= 1
+            stats.hands += 1
+            if stats.hands % every == 0:
+                hooks.on_progress(stats.hands, total)
+
+        self.index = index
+        stats.cards += cards
+        stats.reshuffles += reshuffles
+        stats.second_chances_used += chances_used
+        stats.modifiers_drawn += modifiers
+        timings = stats.timings
+        timings["draw"] += t_draw
+        timings["scoring"] += t_scoring
+        timings["shuffle"] += t_shuffle
+        timings["bookkeeping"] += clock() - started - t_draw - t_scoring - t_shuffle
+        return scores, cards_at_scoring, count_reached7, count_already_true
+
+
+def _play_hands(
+    hands: int, rng: random.Random, rules: Ruleset = STANDARD
+) -> HandBatch:
+    """Play `hands` hands on one deck shuffled by `rng`."""
+    return _ScalarStream(rng, rules).play(hands)
+
+
+def _blocks(hands: int, size: int) -> List[int]:
+    sizes = [size] * (hands // size)
+    if hands % size:
+        sizes.append(hands % size)
+    return sizes
+
+
+def _iter_blocks(
+    hands: int,
+    engine: str,
+    seed=None,
+    rng: Optional[random.Random] = None,
+    block: Union[int, Iterable[int], None] = None,
+    hooks: Optional[RunHooks] = None,
+    rules: Ruleset = STANDARD,
+    trace: Optional[TraceWriter] = None,
+) -> Iterator[HandBatch]:
+    """Play `hands` hands in blocks of `block`, yielding each block's `HandBatch`.
+
+    `block` defaults to `STREAM_BLOCK`, or `NUMPY_STREAM_BLOCK` for the
+    NumPy engine, and may also be an iterable of block sizes (summing to at
+    most `hands`), consumed as the blocks are played.
+
+    The scalar engine carries its deck across blocks, so it plays exactly the
+    same hands as the list-building path; it uses `rng` when given, otherwise
+    a `random.Random(seed)`. The NumPy engine runs each block on fresh decks
+    seeded from `SeedSequence(seed)`. `hooks` (scalar engine only) makes the
+    blocks play instrumented, and `trace` (scalar engine only) logs them.
+    """
+    if block is None:
+        block = NUMPY_STREAM_BLOCK if engine == "numpy" else STREAM_BLOCK
+    sizes = _blocks(hands, block) if isinstance(block, int) else block
+    if engine == "numpy":
+        import numpy as np
+        from batch_engine import simulate
+
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        for size in sizes:
+            # One child at a time gives the same streams as `spawn(len(sizes))`.
+            (stream,) = seed.spawn(1)
+            scores, cards_at_scoring, reached7, already_true = simulate(
+                size, stream, rules=rules
+            )
+            yield scores, cards_at_scoring, reached7, already_true
+        return
+    deck_stream = _ScalarStream(rng or random.Random(seed), rules)
+    if trace is not None:
+        trace.write_deck(deck_stream.deck)
+    for size in sizes:
+        if hooks is not None:
+            yield deck_stream.play_instrumented(size, hooks, hands)
+        elif trace is not None:
+            yield deck_stream.play_traced(size, trace)
+        else:
+            yield deck_stream.play(size)
+
+
+def _stream_summary(
+    hands: int,
+    engine: str,
+    seed=None,
+    rng: Optional[random.Random] = None,
+    hooks: Optional[RunHooks] = None,
+    rules: Ruleset = STANDARD,
+) -> ExperimentSummary:
+    """Play `hands` hands in blocks of the engine's default size, keeping only a summary."""
+    summary = ExperimentSummary()
+    for batch in _iter_blocks(hands, engine, seed, rng, hooks=hooks, rules=rules):
+        summary.update(*batch)
+    return summary
+
+
+def stream_experiment(
+    hands: int = 100_000,
+    seed: Optional[int] = None,
+    engine: str = "scalar",
+    block: Union[int, Iterable[int], None] = None,
+    rules: Ruleset = STANDARD,
+) -> Iterator[ExperimentSummary]:
+    """Yield the running `ExperimentSummary` after every block of `block` hands.
+
+    `block` defaults to `STREAM_BLOCK` (`NUMPY_STREAM_BLOCK` for the NumPy
+    engine) and may also be an iterable of block sizes, as `precision` uses
+    to grow its batches.
+
+    The same summary object is updated in place and yielded again, so callers
+    that keep snapshots (for another thread, say) must copy it. Stopping the
+    iteration early stops the simulation. The last summary equals
+    `run_experiment(hands, seed, engine, stream=True)` for the default block.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    summary = ExperimentSummary()
+    for batch in _iter_blocks(hands, engine, seed, block=block, rules=rules):
+        summary.update(*batch)
+        yield summary
+
+
+def _extend(out: array, values: Sequence[int]) -> None:
+    """Append a list or NumPy array of per-hand values to `out`.
+
+    Both kinds raise `OverflowError` for a value `out`'s type cannot hold,
+    rather than NumPy's silent wrap-around.
+    """
+    low, high = _LIMITS[out.typecode]
+    message = f"per-hand value outside [{low}, {high}] for array({out.typecode!r})"
+    if hasattr(values, "dtype"):
+        if values.size and (values.min() < low or values.max() > high):
+            raise OverflowError(message)
+        out.frombytes(values.astype(out.typecode).tobytes())
+        return
+    try:
+        out.extend(values)
+    except OverflowError as exc:
+        raise OverflowError(message) from exc
+
+
+def _readonly(code: str, values: Sequence[int]) -> Sequence[int]:
+    """`values` as a read-only sequence without copying arrays.
+
+    NumPy arrays become non-writeable views; an `array(code)` is wrapped in
+    a read-only memoryview, and anything else is first converted to one.
+    """
+    if hasattr(values, "dtype"):
+        values = values.view()
+        values.flags.writeable = False
+        return values
+    if isinstance(values, memoryview) and values.readonly and values.format == code:
+        return values
+    if not isinstance(values, array) or values.typecode != code:
+        out = array(code)
+        _extend(out, values)
+        values = out
+    return memoryview(values).toreadonly()
+
+
+def _collect(batches: Iterable[HandBatch]) -> ExperimentResults:
+    """Append each batch's hands to compact arrays as it arrives.
+
+    Batches are `HandBatch` lists or NumPy arrays; only one batch is ever
+    held as Python objects, so peak memory stays near the arrays' size.
+    """
+    scores = array("h")
+    cards_at_scoring = array("B")
+    count_reached7 = count_already_true = 0
+    for batch_scores, batch_cards, reached7, already_true in batches:
+        _extend(scores, batch_scores)
+        _extend(cards_at_scoring, batch_cards)
+        count_reached7 += int(reached7)
+        count_already_true += int(already_true)
     return ExperimentResults(
-        running_avg=running_avg,
         scores=scores,
         count_reached7=count_reached7,
         count_already_true=count_already_true,
@@ -71,4 +441,225 @@ def run_experiment(
     )
 
 
-__all__ = ["ExperimentResults", "run_experiment"]
+def _run_chunk(job):
+    """Play one chunk of a multi-worker run.
+
+    `job` is `(engine, hands, seed_seq, stream, rules)`; returns a
+    `HandBatch`, or an `ExperimentSummary` when `stream` is set.
+    """
+    engine, hands, seed_seq, stream, rules = job
+    if engine == "numpy":
+        if stream:
+            return _stream_summary(hands, engine, seed_seq, rules=rules)
+        from batch_engine import simulate
+
+        return simulate(hands, seed_seq, rules=rules)
+    state = seed_seq.generate_state(4)
+    rng = random.Random(int.from_bytes(state.tobytes(), "little"))
+    if stream:
+        return _stream_summary(hands, engine, rng=rng, rules=rules)
+    return _play_hands(hands, rng, rules)
+
+
+def _run_chunked(
+    hands: int,
+    seed: Optional[int],
+    engine: str,
+    workers: int,
+    chunk_size: int,
+    stream: bool = False,
+    rules: Ruleset = STANDARD,
+) -> Union[ExperimentResults, ExperimentSummary]:
+    """Split the run into chunks with independent RNG streams and merge them.
+
+    Chunk `i` is seeded with the `i`-th child of `SeedSequence(seed)`, so the
+    merged output depends only on `(seed, chunk_size)`: neither the number of
+    workers nor the order in which they finish changes it.
+    """
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    sizes = _blocks(hands, chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(engine, size, ss, stream, rules) for size, ss in zip(sizes, streams)]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            return _merge_chunks(pool.map(_run_chunk, jobs), stream)
+    return _merge_chunks(map(_run_chunk, jobs), stream)
+
+
+def _merge_chunks(
+    chunks: Iterable, stream: bool
+) -> Union[ExperimentResults, ExperimentSummary]:
+    """Merge chunk outputs in chunk order as they come in."""
+    if stream:
+        summary = ExperimentSummary()
+        for chunk in chunks:
+            summary.merge(chunk)
+        return summary
+    return _collect(chunks)
+
+
+def _run_instrumented(
+    hands: int, seed: Optional[int], stream: bool, hooks: RunHooks, rules: Ruleset
+) -> Union[ExperimentResults, ExperimentSummary]:
+    if stream:
+        result = _stream_summary(hands, "scalar", seed, hooks=hooks, rules=rules)
+    else:
+        result = _collect(_iter_blocks(hands, "scalar", seed, hooks=hooks, rules=rules))
+        result.instrumentation = hooks.stats
+    if hooks.stats.hands % hooks.every:
+        hooks.on_progress(hooks.stats.hands, hands)
+    return result
+
+
+def _run_traced(
+    hands: int, seed: Optional[int], stream: bool, path: str, rules: Ruleset
+) -> Union[ExperimentResults, ExperimentSummary]:
+    from tracing import TraceWriter
+
+    with TraceWriter(path, rules) as writer:
+        if stream:
+            summary = ExperimentSummary()
+            for batch in _iter_blocks(hands, "scalar", seed, rules=rules, trace=writer):
+                summary.update(*batch)
+            return summary
+        return _collect(_iter_blocks(hands, "scalar", seed, rules=rules, trace=writer))
+
+
+def run_experiment(
+    hands: int = 100_000,
+    seed: Optional[int] = None,
+    engine: str = "scalar",
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+    stream: bool = False,
+    checkpoint: Optional[str] = None,
+    hooks: Optional[RunHooks] = None,
+    rules: Ruleset = STANDARD,
+    tolerance: Optional[float] = None,
+    trace: Optional[str] = None,
+    batch: Optional[int] = None,
+) -> Union[ExperimentResults, ExperimentSummary, PrecisionRun]:
+    """Simulate `hands` hands and collect their scores.
+
+    `engine` selects the implementation: "scalar" plays one card at a time
+    through `FastPlayer`, "numpy" simulates many decks at once with
+    `batch_engine.run_batch` (same distribution, different random stream).
+
+    With `workers > 1` or an explicit `chunk_size`, the hands are split into
+    chunks of `chunk_size` (default `DEFAULT_CHUNK_SIZE`), each played on a
+    fresh deck with its own stream derived from `seed`, and spread over a
+    process pool. The global `random` state is never touched.
+
+    With `stream=True` no per-hand lists are built: the hands are folded into
+    an `ExperimentSummary` (moments, exact histograms, reason counters and
+    log-spaced running-average checkpoints) in blocks, so memory does not
+    grow with `hands`.
+
+    With `checkpoint` set to a directory, the per-hand results are written to
+    memory-mapped files there as the run goes and the run resumes from its
+    last checkpoint if restarted (see `checkpoint.run_checkpointed`); the
+    returned lists are read-only arrays mapped from those files.
+
+    `hooks` (a `hooks.RunHooks`, scalar engine in a single process only)
+    receives progress callbacks and collects phase timings and counters,
+    which list results also carry as `instrumentation`. The hands played are
+    the same as without hooks.
+
+    `rules` (a `rules.Ruleset`) sets the deck and scoring; every engine and
+    mode accepts it. A hand that draws a Freeze ends and is banked, and is
+    counted as neither reaching 7 nor a duplicate.
+
+    With `tolerance` set, the run is sequential: `hands` becomes an upper
+    bound and play stops as soon as the confidence interval for the mean
+    (by batch means) is at most `tolerance` either side. A
+    `precision.PrecisionRun` is returned, holding the summary, the hands
+    actually used and the precision reached. `batch` sets the size of the
+    first batches (by default sized from `hands`; they double as the run
+    grows); see `precision.run_to_precision` for the confidence level and
+    quantile options.
+
+    With `trace` set to a directory (scalar engine in a single process
+    only), every card dealt is logged there as a one-byte code together with
+    a per-hand index; `tracing.TraceReader` replays the hands through
+    `Player`. The hands played are the same as without a trace.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if trace is not None:
+        if (
+            engine != "scalar"
+            or workers > 1
+            or chunk_size is not None
+            or checkpoint
+            or hooks is not None
+            or tolerance is not None
+        ):
+            raise ValueError(
+                "trace needs the scalar engine without workers, chunk_size, "
+                "checkpoint, hooks or tolerance"
+            )
+        return _run_traced(hands, seed, stream, trace, rules)
+    if batch is not None and tolerance is None:
+        raise ValueError("batch only applies to runs with a tolerance")
+    if tolerance is not None:
+        if workers > 1 or chunk_size is not None or checkpoint or hooks is not None:
+            raise ValueError(
+                "tolerance cannot be combined with workers, chunk_size, checkpoint or hooks"
+            )
+        from precision import run_to_precision
+
+        return run_to_precision(
+            tolerance, seed=seed, engine=engine, batch=batch, max_hands=hands, rules=rules
+        )
+    if hooks is not None:
+        if engine != "scalar" or workers > 1 or chunk_size is not None or checkpoint:
+            raise ValueError(
+                "hooks need the scalar engine without workers, chunk_size or checkpoint"
+            )
+        return _run_instrumented(hands, seed, stream, hooks, rules)
+    if checkpoint is not None:
+        if workers > 1 or chunk_size is not None or stream:
+            raise ValueError(
+                "checkpoint cannot be combined with workers, chunk_size or stream"
+            )
+        from checkpoint import run_checkpointed
+
+        return run_checkpointed(checkpoint, hands, seed, engine, rules=rules)
+
+    if workers > 1 or chunk_size is not None:
+        return _run_chunked(
+            hands,
+            seed,
+            engine,
+            workers,
+            chunk_size or DEFAULT_CHUNK_SIZE,
+            stream,
+            rules,
+        )
+    if stream:
+        return _stream_summary(hands, engine, seed, rules=rules)
+    if engine == "numpy":
+        from batch_engine import run_batch
+
+        return run_batch(hands, seed, rules=rules)
+    return _collect(_iter_blocks(hands, "scalar", seed, rules=rules))
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "ENGINES",
+    "ENGINE_VERSION",
+    "ExperimentResults",
+    "ExperimentSummary",
+    "NUMPY_STREAM_BLOCK",
+    "STREAM_BLOCK",
+    "run_experiment",
+    "stream_experiment",
+]
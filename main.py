@@ -1,10 +1,28 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Union
+import argparse
 import tkinter as tk
 from tkinter import ttk, simpledialog
+import copy
 import math
+import queue
+import threading
+import time
 import numpy as np
 
-from game import run_experiment, ExperimentResults
+from bootstrap import BootstrapCI, bootstrap_ci
+from exact import ExactDistribution, solve_exact
+from game import ExperimentResults, ExperimentSummary, stream_experiment
+from server import SimulationClient
+
+WIDTH, HEIGHT = 900, 550
+# left, right, top, bottom
+PADDING = (70, 20, 20, 70)
+# Live runs post a summary every LIVE_BLOCK hands; the window polls every POLL_MS.
+LIVE_BLOCK = 16_384
+POLL_MS = 250
+# Resamples behind the 95% bootstrap bands; fixed seed so redraws do not jitter.
+BOOTSTRAP_RESAMPLES = 1000
+BOOTSTRAP_SEED = 0
 
 
 def _draw_axes(
@@ -35,543 +53,988 @@ def _draw_axes(
     return x0, y0, x1, y1
 
 
-def _plot_stats_window_tk(results: ExperimentResults) -> None:
-    running_avg = results.running_avg
-    scores = results.scores
-    count_reached7 = results.count_reached7
-    count_already_true = results.count_already_true
-    cards_at_scoring = results.cards_at_scoring
+def _decimate_log_x(x, y, columns: int):
+    """Downsample a curve to at most four points per pixel column of a log-x axis.
 
-    if not running_avg or not scores:
-        return
+    Points are grouped by the column their `log10(x)` falls in, and each
+    column keeps its first point, its lowest and highest values and its last
+    point, which preserves the envelope the full line would draw. `x` must be
+    increasing. Returns NumPy arrays.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size <= 4 * columns:
+        return x, y
+    log_x = np.log10(x)
+    col = ((log_x - log_x[0]) / (log_x[-1] - log_x[0]) * (columns - 1)).astype(
+        np.int64
+    )
+    starts = np.flatnonzero(np.r_[True, col[1:] != col[:-1]])
+    ends = np.r_[starts[1:], x.size] - 1
+    lows = np.minimum.reduceat(y, starts)
+    highs = np.maximum.reduceat(y, starts)
+    out_x = np.column_stack([x[starts], x[starts], x[ends], x[ends]]).ravel()
+    out_y = np.column_stack([y[starts], lows, highs, y[ends]]).ravel()
+    return out_x, out_y
 
-    width, height = 900, 550
-    pad_left, pad_right, pad_top, pad_bottom = 70, 20, 20, 70
 
-    root = tk.Tk()
-    root.title("Flip-7 statistics")
-    root.lift()
-    root.attributes("-topmost", True)
-    root.after_idle(root.attributes, "-topmost", False)
-    nb = ttk.Notebook(root)
-    nb.pack(fill="both", expand=True)
-
-    # --- Running average tab ---
-    avg_frame = ttk.Frame(nb)
-    nb.add(avg_frame, text="Running average")
-    avg_canvas = tk.Canvas(avg_frame, width=width, height=height, bg="white")
-    avg_canvas.pack()
-
-    y_min = min(running_avg)
-    y_max = max(running_avg)
-    if y_min == y_max:
-        y_min -= 1
-        y_max += 1
-    x_min, x_max = 1, len(running_avg)
-
-    def x_to_px_avg(x_val: float) -> float:
-        # Use logarithmic scale for x-axis to create uneven spacing
-        log_min = math.log10(x_min)
-        log_max = math.log10(x_max)
-        log_val = math.log10(max(1, x_val))
-        return pad_left + (log_val - log_min) / (log_max - log_min) * (
-            width - pad_left - pad_right
-        )
+class _ExactSolver:
+    """Solves the exact distribution once per session, off the Tk thread.
 
-    def y_to_px_avg(y_val: float) -> float:
-        return pad_top + (y_max - y_val) / (y_max - y_min) * (
-            height - pad_top - pad_bottom
-        )
+    `solve_exact` takes a few seconds; `get` starts it on a daemon thread the
+    first time and returns None until the result is ready.
+    """
+
+    def __init__(self) -> None:
+        self.result: Optional[ExactDistribution] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[ExactDistribution]:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._solve, daemon=True)
+                self._thread.start()
+        return self.result
+
+    def _solve(self) -> None:
+        self.result = solve_exact()
+
+
+_EXACT = _ExactSolver()
+
+
+class _SimulationWorker(threading.Thread):
+    """Runs `stream_experiment` off the Tk thread and posts summary snapshots.
+
+    Each block's summary is deep-copied onto `updates`; `None` marks the end
+    of the run, whether it finished or was cancelled.
+    """
+
+    def __init__(
+        self, hands: int, seed: Optional[int], engine: str, updates: queue.Queue
+    ) -> None:
+        super().__init__(daemon=True)
+        self.hands = hands
+        self.seed = seed
+        self.engine = engine
+        self.updates = updates
+        self.cancelled = threading.Event()
+
+    def run(self) -> None:
+        try:
+            for summary in stream_experiment(
+                self.hands, self.seed, self.engine, block=LIVE_BLOCK
+            ):
+                self.updates.put(copy.deepcopy(summary))
+                if self.cancelled.is_set():
+                    break
+        finally:
+            self.updates.put(None)
 
-    ax0, ay0, ax1, ay1 = _draw_axes(
-        avg_canvas,
-        width,
-        height,
-        pad_left,
-        pad_right,
-        pad_top,
-        pad_bottom,
-        "Games (log scale)",
-        "Average",
-        "Average score vs number of games",
+
+class _RemoteWorker(threading.Thread):
+    """Submits the run to a `server.JobServer` and posts its partial summaries.
+
+    Same interface as `_SimulationWorker`. On cancel, unseeded jobs are
+    cancelled on the server; seeded ones may be shared with other clients,
+    so they are left to finish (and fill the cache) while this window stops
+    listening.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        hands: int,
+        seed: Optional[int],
+        engine: str,
+        updates: queue.Queue,
+    ) -> None:
+        super().__init__(daemon=True)
+        self.client = SimulationClient(url)
+        self.hands = hands
+        self.seed = seed
+        self.engine = engine
+        self.updates = updates
+        self.cancelled = threading.Event()
+
+    def run(self) -> None:
+        try:
+            job = self.client.submit(self.hands, self.seed, self.engine)
+            for summary in self.client.summaries(job):
+                self.updates.put(summary)
+                if self.cancelled.is_set():
+                    if self.seed is None:
+                        self.client.cancel(job)
+                    break
+        finally:
+            self.updates.put(None)
+
+
+class StatsWindow:
+    """The statistics notebook: one canvas per tab, redrawn from a summary.
+
+    `show` draws finished results; `run_live` simulates on a background
+    worker and refreshes the visible tab in place every `POLL_MS` as partial
+    summaries arrive, with progress, throughput and a cancel button. A tab's
+    canvas is only built the first time the tab is selected, and tabs that
+    are not visible are only marked stale and redrawn when selected. Every
+    tab draws from the summary and the score histogram arrays and quartiles
+    that `set_summary` derives from it once, so opening the window costs
+    about the same whatever the number of hands.
+    """
+
+    TABS = (
+        ("Running average", "_draw_running_avg"),
+        ("Histogram", "_draw_histogram"),
+        ("Box Plot", "_draw_box_plot"),
+        ("Reasons (pie)", "_draw_reasons_pie"),
+        ("Cards at scoring", "_draw_cards_histogram"),
+        ("Cards at scoring (pie)", "_draw_cards_pie"),
     )
-    tick_count = 5
-    for i in range(tick_count + 1):
-        y_val = y_min + i * (y_max - y_min) / tick_count
-        y_px = y_to_px_avg(y_val)
-        avg_canvas.create_line(ax0, y_px, ax1, y_px, fill="#eee")
-        avg_canvas.create_text(
-            ax0 - 8, y_px, text=f"{y_val:.1f}", anchor="e", font=("Segoe UI", 9)
-        )
-    # X ticks with logarithmic spacing
-    log_min = math.log10(x_min)
-    log_max = math.log10(x_max)
-    for i in range(tick_count + 1):
-        log_val = log_min + i * (log_max - log_min) / tick_count
-        x_val = 10**log_val
-        x_px = x_to_px_avg(x_val)
-        avg_canvas.create_line(x_px, ay0, x_px, ay1, fill="#f7f7f7")
-        avg_canvas.create_text(
-            x_px,
-            ay0 + 14,
-            text=f"{int(round(x_val))}",
-            anchor="n",
-            font=("Segoe UI", 9),
-        )
-    pts: List[float] = []
-    for i, y in enumerate(running_avg, start=1):
-        pts.extend([x_to_px_avg(i), y_to_px_avg(y)])
-    if len(pts) >= 4:
-        avg_canvas.create_line(*pts, fill="#1f77b4", width=2)
-    step = max(1, len(running_avg) // 50)
-    for i in range(1, len(running_avg) + 1, step):
-        avg_canvas.create_oval(
-            x_to_px_avg(i) - 2,
-            y_to_px_avg(running_avg[i - 1]) - 2,
-            x_to_px_avg(i) + 2,
-            y_to_px_avg(running_avg[i - 1]) + 2,
-            fill="#1f77b4",
-            outline="",
+
+    def __init__(self) -> None:
+        self.summary: Optional[ExperimentSummary] = None
+        self.avg_x: Sequence[int] = []
+        self.avg_y = np.empty(0)
+        self.score_values = np.empty(0, dtype=np.int64)
+        self.score_weights = np.empty(0, dtype=np.int64)
+        self.quartiles: Sequence[float] = ()
+        self._ci: Optional[BootstrapCI] = None
+        self._exact_pending = False
+        self._stale = set()
+        self._worker: Optional[Union[_SimulationWorker, _RemoteWorker]] = None
+
+        self.root = root = tk.Tk()
+        root.title("Flip-7 statistics")
+        root.lift()
+        root.attributes("-topmost", True)
+        root.after_idle(root.attributes, "-topmost", False)
+
+        self.status = ttk.Frame(root)
+        self.progress = ttk.Progressbar(self.status, length=300, mode="determinate")
+        self.progress.pack(side="left", padx=8, pady=4)
+        self.status_text = tk.StringVar(master=root, value="")
+        ttk.Label(self.status, textvariable=self.status_text).pack(side="left")
+        self.cancel_button = ttk.Button(self.status, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(side="right", padx=8)
+
+        self.nb = nb = ttk.Notebook(root)
+        nb.pack(fill="both", expand=True)
+        self.frames: List[ttk.Frame] = []
+        self.canvases: List[Optional[tk.Canvas]] = [None] * len(self.TABS)
+        self.exact_var = tk.BooleanVar(master=root, value=False)
+        for title, _ in self.TABS:
+            frame = ttk.Frame(nb, width=WIDTH, height=HEIGHT)
+            nb.add(frame, text=title)
+            self.frames.append(frame)
+        nb.bind("<<NotebookTabChanged>>", lambda _event: self._redraw_visible(True))
+
+    def set_summary(self, summary: ExperimentSummary) -> None:
+        """Replace the data and refresh the visible tab.
+
+        The running average comes from the summary's log-spaced checkpoints
+        (about 100 per decade); `_draw_running_avg` still decimates them to
+        the canvas width.
+        """
+        self._set_data(summary)
+        self._stale = set(range(len(self.TABS)))
+        self._redraw_visible()
+
+    def _set_data(self, summary: ExperimentSummary) -> None:
+        """Store the summary and derive the arrays every tab draws from."""
+        avg_x, avg_y = summary.running_avg_points()
+        self.summary = summary
+        self.avg_x = avg_x
+        self.avg_y = np.asarray(avg_y, dtype=float)
+        values = sorted(summary.score_counts)
+        self.score_values = np.array(values, dtype=np.int64)
+        self.score_weights = np.array(
+            [summary.score_counts[v] for v in values], dtype=np.int64
         )
+        self.quartiles = summary.quantiles((0.25, 0.5, 0.75)) if summary.hands else ()
+        self._ci = None
+
+    def bootstrap(self) -> Optional[BootstrapCI]:
+        """95% bootstrap intervals for the current summary, computed on first use."""
+        if self._ci is None and self.summary is not None and self.summary.hands > 1:
+            self._ci = bootstrap_ci(
+                self.summary, BOOTSTRAP_RESAMPLES, seed=BOOTSTRAP_SEED
+            )
+        return self._ci
+
+    def show(self, results: Union[ExperimentResults, ExperimentSummary]) -> None:
+        """Draw finished results or a summary.
 
-    # --- Histogram tab (scores) ---
-    hist_frame = ttk.Frame(nb)
-    nb.add(hist_frame, text="Histogram")
-    hist_canvas = tk.Canvas(hist_frame, width=width, height=height, bg="white")
-    hist_canvas.pack()
-    n = len(scores)
-    k = max(10, int(math.ceil(math.log2(n) + 1)))
-    s_min, s_max = min(scores), max(scores)
-    if s_min == s_max:
-        s_min -= 1
-        s_max += 1
-    span = s_max - s_min
-    bin_width = span / k if k > 0 else 1
-    if bin_width <= 0:
-        bin_width = 1
-    edges = [s_min + i * bin_width for i in range(k + 1)]
-    counts = [0] * k
-    for v in scores:
-        if v == edges[-1]:
-            counts[-1] += 1
+        Full results are summarized first; their running average is drawn
+        from the summary's log-spaced checkpoints like a streamed run's.
+        """
+        if isinstance(results, ExperimentSummary):
+            self.set_summary(results)
         else:
-            idx = int((v - s_min) / bin_width)
-            idx = max(0, min(k - 1, idx))
-            counts[idx] += 1
-    c_min, c_max = 0, max(counts) if counts else 1
-
-    def x_to_px_hist(x_val: float) -> float:
-        return pad_left + (x_val - s_min) / (s_max - s_min) * (
-            width - pad_left - pad_right
-        )
+            self.set_summary(ExperimentSummary.from_results(results))
 
-    def y_to_px_hist(y_val: float) -> float:
-        denom = (c_max - c_min) if c_max > c_min else 1
-        return pad_top + (c_max - y_val) / denom * (height - pad_top - pad_bottom)
-
-    hx0, hy0, hx1, hy1 = _draw_axes(
-        hist_canvas,
-        width,
-        height,
-        pad_left,
-        pad_right,
-        pad_top,
-        pad_bottom,
-        "Score",
-        "Count",
-        "Histogram of scores",
-    )
-    for i in range(6):
-        y_val = c_min + i * (c_max - c_min) / 5
-        y_px = y_to_px_hist(y_val)
-        hist_canvas.create_line(hx0, y_px, hx1, y_px, fill="#eee")
-        hist_canvas.create_text(
-            hx0 - 8, y_px, text=f"{int(round(y_val))}", anchor="e", font=("Segoe UI", 9)
-        )
-    step_edges = max(1, k // 10)
-    for i in range(0, len(edges), step_edges):
-        x_val = edges[i]
-        x_px = x_to_px_hist(x_val)
-        hist_canvas.create_line(x_px, hy0, x_px, hy1, fill="#f7f7f7")
-        hist_canvas.create_text(
-            x_px,
-            hy0 + 14,
-            text=f"{int(round(x_val))}",
-            anchor="n",
-            font=("Segoe UI", 9),
-        )
-    for i, count in enumerate(counts):
-        left = x_to_px_hist(edges[i])
-        right = x_to_px_hist(edges[i + 1])
-        top = y_to_px_hist(count)
-        bottom = hy0
-        hist_canvas.create_rectangle(
-            left + 1, top, right - 1, bottom, fill="#ff7f0e", outline="#cc6a0c"
-        )
-        center_x = (left + right) / 2
-        label_y = max(pad_top + 10, top - 6)
-        hist_canvas.create_text(
-            center_x,
-            label_y,
-            text=str(int(count)),
-            anchor="s",
-            font=("Segoe UI", 9),
-            fill="#222",
-        )
+    def run_live(
+        self,
+        hands: int,
+        seed: Optional[int] = None,
+        engine: str = "scalar",
+        server: Optional[str] = None,
+    ) -> Optional[ExperimentSummary]:
+        """Simulate in the background while the window updates; blocks until closed.
 
-    # --- Box plot tab (scores) ---
-    box_frame = ttk.Frame(nb)
-    nb.add(box_frame, text="Box Plot")
-    box_canvas = tk.Canvas(box_frame, width=width, height=height, bg="white")
-    box_canvas.pack()
-    if scores:
-        data = np.array(scores)
-        q1 = np.percentile(data, 25)
-        median = np.percentile(data, 50)
-        q3 = np.percentile(data, 75)
-        min_val = np.min(data)
-        max_val = np.max(data)
-        iqr = q3 - q1
-        lower_whisker = np.min(data[data >= q1 - 1.5 * iqr])
-        upper_whisker = np.max(data[data <= q3 + 1.5 * iqr])
-        outliers = data[(data < lower_whisker) | (data > upper_whisker)]
-
-        # Box plot coordinates
-        plot_left = pad_left + 100
-        plot_right = width - pad_right - 100
-        plot_center = (plot_left + plot_right) / 2
-        plot_top = pad_top + 60
-        plot_bottom = height - pad_bottom - 60
-
-        def y_to_px_box(val):
-            return plot_bottom - (val - min_val) / (max_val - min_val) * (
-                plot_bottom - plot_top
-            )
-
-        # Draw vertical axis
-        box_canvas.create_line(plot_center, plot_top, plot_center, plot_bottom, width=2)
-        # Draw box
-        box_canvas.create_rectangle(
-            plot_center - 40,
-            y_to_px_box(q3),
-            plot_center + 40,
-            y_to_px_box(q1),
-            fill="#c6dbef",
-            outline="#2171b5",
-            width=2,
-        )
-        # Draw median
-        box_canvas.create_line(
-            plot_center - 40,
-            y_to_px_box(median),
-            plot_center + 40,
-            y_to_px_box(median),
-            fill="#d62728",
-            width=2,
-        )
-        # Draw whiskers
-        box_canvas.create_line(
-            plot_center,
-            y_to_px_box(lower_whisker),
-            plot_center,
-            y_to_px_box(q1),
-            width=2,
-        )
-        box_canvas.create_line(
-            plot_center,
-            y_to_px_box(q3),
-            plot_center,
-            y_to_px_box(upper_whisker),
-            width=2,
-        )
-        # Whisker caps
-        box_canvas.create_line(
-            plot_center - 20,
-            y_to_px_box(lower_whisker),
-            plot_center + 20,
-            y_to_px_box(lower_whisker),
-            width=2,
-        )
-        box_canvas.create_line(
-            plot_center - 20,
-            y_to_px_box(upper_whisker),
-            plot_center + 20,
-            y_to_px_box(upper_whisker),
-            width=2,
+        With `server` (e.g. "http://127.0.0.1:8765"), the run is submitted to
+        a running `server.JobServer` instead of simulated in this process.
+        Returns the last summary received (partial if the run was cancelled).
+        """
+        updates: queue.Queue = queue.Queue()
+        if server is None:
+            self._worker = _SimulationWorker(hands, seed, engine, updates)
+        else:
+            self._worker = _RemoteWorker(server, hands, seed, engine, updates)
+        self._hands = hands
+        self._started = time.perf_counter()
+        self.progress.configure(maximum=hands, value=0)
+        self.status.pack(side="top", fill="x", before=self.nb)
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
+        self._worker.start()
+        self.root.after(POLL_MS, self._poll, updates)
+        self.root.mainloop()
+        return self.summary
+
+    def cancel(self) -> None:
+        if self._worker is not None:
+            self._worker.cancelled.set()
+            self.cancel_button.configure(state="disabled")
+
+    def _close(self) -> None:
+        self.cancel()
+        self.root.destroy()
+
+    def _poll(self, updates: queue.Queue) -> None:
+        latest = None
+        finished = False
+        while True:
+            try:
+                item = updates.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                finished = True
+            else:
+                latest = item
+        if latest is not None:
+            self.set_summary(latest)
+        done = self.summary.hands if self.summary else 0
+        elapsed = time.perf_counter() - self._started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        self.progress.configure(value=done)
+        if finished:
+            state = "Cancelled" if self._worker.cancelled.is_set() else "Done"
+            self.cancel_button.configure(state="disabled")
+            self.status_text.set(
+                f"{state}: {done:,} hands in {elapsed:.1f} s ({rate:,.0f} hands/s)"
+            )
+            return
+        self.status_text.set(f"{done:,} / {self._hands:,} hands  {rate:,.0f} hands/s")
+        self.root.after(POLL_MS, self._poll, updates)
+
+    def _redraw_visible(self, only_stale: bool = False) -> None:
+        index = self.nb.index(self.nb.select())
+        if not only_stale or index in self._stale:
+            self._redraw(index)
+
+    def _build_tab(self, index: int) -> tk.Canvas:
+        frame = self.frames[index]
+        canvas = tk.Canvas(frame, width=WIDTH, height=HEIGHT, bg="white")
+        canvas.pack()
+        if self.TABS[index][0] == "Histogram":
+            ttk.Checkbutton(
+                frame,
+                text="Show exact distribution",
+                variable=self.exact_var,
+                command=lambda: self._redraw(index),
+            ).pack(anchor="w", padx=PADDING[0])
+        self.canvases[index] = canvas
+        return canvas
+
+    def _redraw(self, index: int) -> None:
+        self._stale.discard(index)
+        if self.summary is None or not self.summary.hands:
+            return
+        canvas = self.canvases[index] or self._build_tab(index)
+        canvas.delete("all")
+        getattr(self, self.TABS[index][1])(canvas)
+
+    def _draw_running_avg(self, canvas: tk.Canvas) -> None:
+        """Running average against the number of games (log x)."""
+        width, height = WIDTH, HEIGHT
+        pad_left, pad_right, pad_top, pad_bottom = PADDING
+        avg_x, avg_y = self.avg_x, self.avg_y
+        y_min = float(avg_y.min())
+        y_max = float(avg_y.max())
+        if y_min == y_max:
+            y_min -= 1
+            y_max += 1
+        x_min, x_max = 1, avg_x[-1]
+
+        def x_to_px_avg(x_val: float) -> float:
+            # Use logarithmic scale for x-axis to create uneven spacing
+            log_min = math.log10(x_min)
+            log_max = math.log10(x_max)
+            log_val = math.log10(max(1, x_val))
+            return pad_left + (log_val - log_min) / (log_max - log_min) * (
+                width - pad_left - pad_right
+            )
+
+        def y_to_px_avg(y_val: float) -> float:
+            return pad_top + (y_max - y_val) / (y_max - y_min) * (
+                height - pad_top - pad_bottom
+            )
+
+        ax0, ay0, ax1, ay1 = _draw_axes(
+            canvas,
+            width,
+            height,
+            pad_left,
+            pad_right,
+            pad_top,
+            pad_bottom,
+            "Games (log scale)",
+            "Average",
+            "Average score vs number of games",
         )
-        # Outliers
-        for out in outliers:
-            box_canvas.create_oval(
-                plot_center - 5,
-                y_to_px_box(out) - 5,
-                plot_center + 5,
-                y_to_px_box(out) + 5,
-                fill="#ff7f0e",
+        tick_count = 5
+        for i in range(tick_count + 1):
+            y_val = y_min + i * (y_max - y_min) / tick_count
+            y_px = y_to_px_avg(y_val)
+            canvas.create_line(ax0, y_px, ax1, y_px, fill="#eee")
+            canvas.create_text(
+                ax0 - 8, y_px, text=f"{y_val:.1f}", anchor="e", font=("Segoe UI", 9)
+            )
+        # X ticks with logarithmic spacing
+        log_min = math.log10(x_min)
+        log_max = math.log10(x_max)
+        for i in range(tick_count + 1):
+            log_val = log_min + i * (log_max - log_min) / tick_count
+            x_val = 10**log_val
+            x_px = x_to_px_avg(x_val)
+            canvas.create_line(x_px, ay0, x_px, ay1, fill="#f7f7f7")
+            canvas.create_text(
+                x_px,
+                ay0 + 14,
+                text=f"{int(round(x_val))}",
+                anchor="n",
+                font=("Segoe UI", 9),
+            )
+        # Decimate before handing points to Tk: one line item, ~4 points per column.
+        line_x, line_y = _decimate_log_x(avg_x, avg_y, int(ax1 - ax0))
+        log_min, log_max = math.log10(x_min), math.log10(x_max)
+        px = pad_left + (np.log10(np.maximum(1, line_x)) - log_min) / (
+            log_max - log_min
+        ) * (width - pad_left - pad_right)
+        py = pad_top + (y_max - line_y) / (y_max - y_min) * (height - pad_top - pad_bottom)
+        pts: List[float] = np.column_stack([px, py]).ravel().tolist()
+        if len(pts) >= 4:
+            canvas.create_line(*pts, fill="#1f77b4", width=2)
+        step = max(1, len(avg_y) // 50)
+        for i in range(0, len(avg_y), step):
+            canvas.create_oval(
+                x_to_px_avg(avg_x[i]) - 2,
+                y_to_px_avg(avg_y[i]) - 2,
+                x_to_px_avg(avg_x[i]) + 2,
+                y_to_px_avg(avg_y[i]) + 2,
+                fill="#1f77b4",
                 outline="",
             )
-        # Labels
-        box_canvas.create_text(
-            plot_center,
-            pad_top + 20,
-            text="Box Plot of Scores",
-            font=("Segoe UI", 12, "bold"),
+
+    def _draw_histogram(self, canvas: tk.Canvas) -> None:
+        """Histogram of scores, optionally with the exact distribution."""
+        width, height = WIDTH, HEIGHT
+        pad_left, pad_right, pad_top, pad_bottom = PADDING
+        n = self.summary.hands
+        k = max(10, int(math.ceil(math.log2(n) + 1)))
+        s_min, s_max = int(self.score_values[0]), int(self.score_values[-1])
+        if s_min == s_max:
+            s_min -= 1
+            s_max += 1
+        span = s_max - s_min
+        bin_width = span / k if k > 0 else 1
+        if bin_width <= 0:
+            bin_width = 1
+        edges = [s_min + i * bin_width for i in range(k + 1)]
+        counts = np.histogram(self.score_values, edges, weights=self.score_weights)[0]
+        counts = counts.astype(np.int64).tolist()
+
+        def bin_index(v: float) -> int:
+            last = len(counts) - 1
+            if v == edges[-1]:
+                return last
+            return max(0, min(last, int((v - s_min) / bin_width)))
+
+        c_min, c_max = 0, max(counts) if counts else 1
+
+        def x_to_px_hist(x_val: float) -> float:
+            return pad_left + (x_val - s_min) / (s_max - s_min) * (
+                width - pad_left - pad_right
+            )
+
+        def y_to_px_hist(y_val: float) -> float:
+            denom = (c_max - c_min) if c_max > c_min else 1
+            return pad_top + (c_max - y_val) / denom * (height - pad_top - pad_bottom)
+
+        hx0, hy0, hx1, hy1 = _draw_axes(
+            canvas,
+            width,
+            height,
+            pad_left,
+            pad_right,
+            pad_top,
+            pad_bottom,
+            "Score",
+            "Count",
+            "Histogram of scores",
         )
-        for val, label in [
-            (min_val, "Min"),
-            (q1, "Q1"),
-            (median, "Median"),
-            (q3, "Q3"),
-            (max_val, "Max"),
-        ]:
-            box_canvas.create_text(
-                plot_center + 60,
-                y_to_px_box(val),
-                text=f"{label}: {val:.1f}",
+        for i in range(6):
+            y_val = c_min + i * (c_max - c_min) / 5
+            y_px = y_to_px_hist(y_val)
+            canvas.create_line(hx0, y_px, hx1, y_px, fill="#eee")
+            canvas.create_text(
+                hx0 - 8, y_px, text=f"{int(round(y_val))}", anchor="e", font=("Segoe UI", 9)
+            )
+        step_edges = max(1, k // 10)
+        for i in range(0, len(edges), step_edges):
+            x_val = edges[i]
+            x_px = x_to_px_hist(x_val)
+            canvas.create_line(x_px, hy0, x_px, hy1, fill="#f7f7f7")
+            canvas.create_text(
+                x_px,
+                hy0 + 14,
+                text=f"{int(round(x_val))}",
+                anchor="n",
+                font=("Segoe UI", 9),
+            )
+        for i, count in enumerate(counts):
+            left = x_to_px_hist(edges[i])
+            right = x_to_px_hist(edges[i + 1])
+            top = y_to_px_hist(count)
+            bottom = hy0
+            canvas.create_rectangle(
+                left + 1, top, right - 1, bottom, fill="#ff7f0e", outline="#cc6a0c"
+            )
+            center_x = (left + right) / 2
+            label_y = max(pad_top + 10, top - 6)
+            canvas.create_text(
+                center_x,
+                label_y,
+                text=str(int(count)),
+                anchor="s",
+                font=("Segoe UI", 9),
+                fill="#222",
+            )
+        ci = self.bootstrap()
+        if ci is not None:
+            # Mean with its bootstrap band (usually thinner than a bar at large n).
+            mean = self.summary.mean
+            lo, hi = ci.mean
+            band_left = x_to_px_hist(lo)
+            canvas.create_rectangle(
+                band_left,
+                hy1,
+                max(x_to_px_hist(hi), band_left + 1),
+                hy0,
+                fill="#1f77b4",
+                stipple="gray25",
+                outline="",
+            )
+            mean_px = x_to_px_hist(mean)
+            canvas.create_line(
+                mean_px, hy0, mean_px, hy1, fill="#1f77b4", width=2, dash=(4, 2)
+            )
+            canvas.create_text(
+                mean_px + 6,
+                pad_top + 28,
+                text=f"Mean {mean:.2f}  (95% CI {lo:.2f} to {hi:.2f})",
                 anchor="w",
+                fill="#1f77b4",
                 font=("Segoe UI", 10),
             )
-
-    # --- Pie chart tab (IndexError reasons) ---
-    pie_frame = ttk.Frame(nb)
-    nb.add(pie_frame, text="Reasons (pie)")
-    pie_canvas = tk.Canvas(pie_frame, width=width, height=height, bg="white")
-    pie_canvas.pack()
-    total = count_reached7 + count_already_true
-    pie_canvas.create_text(
-        width / 2,
-        pad_top / 2,
-        text="Reasons for scoring",
-        font=("Segoe UI", 12, "bold"),
-    )
-    if total <= 0:
-        pie_canvas.create_text(
-            width / 2,
-            height / 2,
-            text="No IndexError events recorded",
-            font=("Segoe UI", 11),
-        )
-    else:
-        radius = (
-            min((width - pad_left - pad_right), (height - pad_top - pad_bottom)) * 0.35
-        )
-        cx = pad_left + radius + 40
-        cy = pad_top + (height - pad_top - pad_bottom) / 2
-        bbox = (cx - radius, cy - radius, cx + radius, cy + radius)
-
-        def pct(x: int) -> float:
-            return x / total * 100.0 if total > 0 else 0.0
-
-        angle_reached7 = 360.0 * (count_reached7 / total)
-        angle_already = 360.0 - angle_reached7
-        color_reached7 = "#2ca02c"
-        color_already = "#d62728"
-        start = 0
-        pie_canvas.create_arc(
-            *bbox,
-            start=start,
-            extent=angle_reached7,
-            fill=color_reached7,
-            outline="white",
-        )
-        start += angle_reached7
-        pie_canvas.create_arc(
-            *bbox,
-            start=start,
-            extent=angle_already,
-            fill=color_already,
-            outline="white",
-        )
-        legend_x = cx + radius + 60
-        legend_y = cy - 30
-        box_size = 14
-        spacing = 22
-        pie_canvas.create_rectangle(
-            legend_x,
-            legend_y,
-            legend_x + box_size,
-            legend_y + box_size,
-            fill=color_reached7,
-            outline="black",
-        )
-        pie_canvas.create_text(
-            legend_x + box_size + 8,
-            legend_y + box_size / 2,
-            text=f"Reached 7 cards: {count_reached7} ({pct(count_reached7):.1f}%)",
-            anchor="w",
-            font=("Segoe UI", 10),
-        )
-        legend_y += spacing
-        pie_canvas.create_rectangle(
-            legend_x,
-            legend_y,
-            legend_x + box_size,
-            legend_y + box_size,
-            fill=color_already,
-            outline="black",
+        if not self.exact_var.get():
+            return
+        exact = _EXACT.get()
+        if exact is None:
+            canvas.create_text(
+                hx1 - 8,
+                pad_top + 10,
+                text="Solving exact distribution...",
+                anchor="e",
+                fill="#2ca02c",
+                font=("Segoe UI", 10),
+            )
+            if not self._exact_pending:
+                self._exact_pending = True
+                self.root.after(POLL_MS, self._exact_poll)
+            return
+        self._draw_exact_overlay(
+            canvas, exact, counts, edges, bin_index, x_to_px_hist, y_to_px_hist, hx1
         )
-        pie_canvas.create_text(
-            legend_x + box_size + 8,
-            legend_y + box_size / 2,
-            text=f"2 Duplicate cards: {count_already_true} ({pct(count_already_true):.1f}%)",
-            anchor="w",
+
+    def _exact_poll(self) -> None:
+        """Redraw the histogram once the background solve has finished."""
+        if _EXACT.result is None:
+            self.root.after(POLL_MS, self._exact_poll)
+            return
+        self._exact_pending = False
+        index = [title for title, _ in self.TABS].index("Histogram")
+        self._stale.add(index)
+        self._redraw_visible(True)
+
+    def _draw_exact_overlay(
+        self, canvas, exact, counts, edges, bin_index, x_to_px_hist, y_to_px_hist, hx1
+    ) -> None:
+        """Overlay the expected per-bin counts under the exact distribution."""
+        pad_top = PADDING[2]
+        s_min, s_max = edges[0], edges[-1]
+        n = self.summary.hands
+        expected = [0.0] * len(counts)
+        for v, p in exact.score_probs.items():
+            if s_min <= v <= s_max:
+                expected[bin_index(v)] += p * n
+        pts: List[float] = []
+        for i, count in enumerate(expected):
+            center_x = (x_to_px_hist(edges[i]) + x_to_px_hist(edges[i + 1])) / 2
+            y_px = y_to_px_hist(count)
+            pts.extend([center_x, y_px])
+            canvas.create_oval(
+                center_x - 3,
+                y_px - 3,
+                center_x + 3,
+                y_px + 3,
+                fill="#2ca02c",
+                outline="",
+            )
+        if len(pts) >= 4:
+            canvas.create_line(*pts, fill="#2ca02c", width=2)
+        canvas.create_text(
+            hx1 - 8,
+            pad_top + 10,
+            text="Exact (fresh deck)",
+            anchor="e",
+            fill="#2ca02c",
             font=("Segoe UI", 10),
         )
 
-    # --- Cards at scoring histogram tab ---
-    cas_frame = ttk.Frame(nb)
-    nb.add(cas_frame, text="Cards at scoring")
-    cas_canvas = tk.Canvas(cas_frame, width=width, height=height, bg="white")
-    cas_canvas.pack()
-    if cards_at_scoring:
-        cmin, cmax = min(cards_at_scoring), max(cards_at_scoring)
-    else:
-        cmin, cmax = 0, 1
-    int_edges = [cmin - 0.5 + i for i in range((cmax - cmin + 1) + 1)]
-    int_counts = [0] * (len(int_edges) - 1)
-    for v in cards_at_scoring:
-        idx = int(v - cmin)
-        if 0 <= idx < len(int_counts):
-            int_counts[idx] += 1
-    ic_min, ic_max = 0, max(int_counts) if int_counts else 1
-
-    def x_to_px_cas(x_val: float) -> float:
-        xmin_edge = int_edges[0]
-        xmax_edge = int_edges[-1]
-        return pad_left + (x_val - xmin_edge) / (xmax_edge - xmin_edge) * (
-            width - pad_left - pad_right
+    def _draw_box_plot(self, canvas: tk.Canvas) -> None:
+        """Box plot of scores with whiskers at 1.5 IQR."""
+        width, height = WIDTH, HEIGHT
+        pad_left, pad_right, pad_top, pad_bottom = PADDING
+        values = self.score_values
+        if values.size:
+            q1, median, q3 = self.quartiles
+            min_val = int(values[0])
+            max_val = int(values[-1])
+            iqr = q3 - q1
+            lower_whisker = int(values[values >= q1 - 1.5 * iqr][0])
+            upper_whisker = int(values[values <= q3 + 1.5 * iqr][-1])
+            # One marker per distinct outlying score.
+            outliers = values[
+                (values < lower_whisker) | (values > upper_whisker)
+            ].tolist()
+
+            # Box plot coordinates
+            plot_left = pad_left + 100
+            plot_right = width - pad_right - 100
+            plot_center = (plot_left + plot_right) / 2
+            plot_top = pad_top + 60
+            plot_bottom = height - pad_bottom - 60
+
+            def y_to_px_box(val):
+                return plot_bottom - (val - min_val) / (max_val - min_val) * (
+                    plot_bottom - plot_top
+                )
+
+            # Draw vertical axis
+            canvas.create_line(plot_center, plot_top, plot_center, plot_bottom, width=2)
+            # Draw box
+            canvas.create_rectangle(
+                plot_center - 40,
+                y_to_px_box(q3),
+                plot_center + 40,
+                y_to_px_box(q1),
+                fill="#c6dbef",
+                outline="#2171b5",
+                width=2,
+            )
+            ci = self.bootstrap()
+            if ci is not None:
+                # Bootstrap bands behind the quartile and median lines.
+                bands = ((ci.q1, "#2171b5"), (ci.q3, "#2171b5"), (ci.median, "#d62728"))
+                for (lo, hi), color in bands:
+                    top, bottom = y_to_px_box(hi), y_to_px_box(lo)
+                    canvas.create_rectangle(
+                        plot_center - 48,
+                        top - 1,
+                        plot_center + 48,
+                        bottom + 1,
+                        fill=color,
+                        stipple="gray50",
+                        outline="",
+                    )
+                # Mean with an error bar, left of the box.
+                mean_x = plot_center - 70
+                lo, hi = ci.mean
+                canvas.create_line(
+                    mean_x, y_to_px_box(lo), mean_x, y_to_px_box(hi), width=2
+                )
+                for cap in (lo, hi):
+                    cap_y = y_to_px_box(cap)
+                    canvas.create_line(mean_x - 6, cap_y, mean_x + 6, cap_y, width=2)
+                mean_y = y_to_px_box(self.summary.mean)
+                canvas.create_oval(
+                    mean_x - 4,
+                    mean_y - 4,
+                    mean_x + 4,
+                    mean_y + 4,
+                    fill="#2ca02c",
+                    outline="",
+                )
+                canvas.create_text(
+                    mean_x - 12,
+                    mean_y,
+                    text=f"Mean: {self.summary.mean:.2f} [{lo:.2f}, {hi:.2f}]",
+                    anchor="e",
+                    font=("Segoe UI", 10),
+                )
+            # Draw median
+            canvas.create_line(
+                plot_center - 40,
+                y_to_px_box(median),
+                plot_center + 40,
+                y_to_px_box(median),
+                fill="#d62728",
+                width=2,
+            )
+            # Draw whiskers
+            canvas.create_line(
+                plot_center,
+                y_to_px_box(lower_whisker),
+                plot_center,
+                y_to_px_box(q1),
+                width=2,
+            )
+            canvas.create_line(
+                plot_center,
+                y_to_px_box(q3),
+                plot_center,
+                y_to_px_box(upper_whisker),
+                width=2,
+            )
+            # Whisker caps
+            canvas.create_line(
+                plot_center - 20,
+                y_to_px_box(lower_whisker),
+                plot_center + 20,
+                y_to_px_box(lower_whisker),
+                width=2,
+            )
+            canvas.create_line(
+                plot_center - 20,
+                y_to_px_box(upper_whisker),
+                plot_center + 20,
+                y_to_px_box(upper_whisker),
+                width=2,
+            )
+            # Outliers
+            for out in outliers:
+                canvas.create_oval(
+                    plot_center - 5,
+                    y_to_px_box(out) - 5,
+                    plot_center + 5,
+                    y_to_px_box(out) + 5,
+                    fill="#ff7f0e",
+                    outline="",
+                )
+            # Labels
+            canvas.create_text(
+                plot_center,
+                pad_top + 20,
+                text="Box Plot of Scores",
+                font=("Segoe UI", 12, "bold"),
+            )
+            intervals = {}
+            if ci is not None:
+                intervals = {"Q1": ci.q1, "Median": ci.median, "Q3": ci.q3}
+            for val, label in [
+                (min_val, "Min"),
+                (q1, "Q1"),
+                (median, "Median"),
+                (q3, "Q3"),
+                (max_val, "Max"),
+            ]:
+                text = f"{label}: {val:.1f}"
+                if label in intervals:
+                    text += " [{:.1f}, {:.1f}]".format(*intervals[label])
+                canvas.create_text(
+                    plot_center + 60,
+                    y_to_px_box(val),
+                    text=text,
+                    anchor="w",
+                    font=("Segoe UI", 10),
+                )
+
+    def _draw_reasons_pie(self, canvas: tk.Canvas) -> None:
+        """Pie of why hands ended: 7 cards, a duplicate or a Freeze."""
+        width, height = WIDTH, HEIGHT
+        pad_left, pad_right, pad_top, pad_bottom = PADDING
+        count_reached7 = self.summary.count_reached7
+        count_already_true = self.summary.count_already_true
+        # Hands that ended neither way were frozen (rulesets with Freeze cards).
+        count_frozen = self.summary.hands - count_reached7 - count_already_true
+        total = count_reached7 + count_already_true + count_frozen
+        canvas.create_text(
+            width / 2,
+            pad_top / 2,
+            text="Reasons for scoring",
+            font=("Segoe UI", 12, "bold"),
         )
+        if total <= 0:
+            canvas.create_text(
+                width / 2,
+                height / 2,
+                text="No IndexError events recorded",
+                font=("Segoe UI", 11),
+            )
+        else:
+            radius = (
+                min((width - pad_left - pad_right), (height - pad_top - pad_bottom)) * 0.35
+            )
+            cx = pad_left + radius + 40
+            cy = pad_top + (height - pad_top - pad_bottom) / 2
+            bbox = (cx - radius, cy - radius, cx + radius, cy + radius)
 
-    def y_to_px_cas(y_val: float) -> float:
-        denom = (ic_max - ic_min) if ic_max > ic_min else 1
-        return pad_top + (ic_max - y_val) / denom * (height - pad_top - pad_bottom)
-
-    cx0, cy0, cx1, cy1 = _draw_axes(
-        cas_canvas,
-        width,
-        height,
-        pad_left,
-        pad_right,
-        pad_top,
-        pad_bottom,
-        "Cards in hand",
-        "Count",
-        "Histogram: cards in hand at scoring",
-    )
-    for i in range(6):
-        y_val = ic_min + i * (ic_max - ic_min) / 5
-        y_px = y_to_px_cas(y_val)
-        cas_canvas.create_line(cx0, y_px, cx1, y_px, fill="#eee")
-        cas_canvas.create_text(
-            cx0 - 8, y_px, text=f"{int(round(y_val))}", anchor="e", font=("Segoe UI", 9)
+            def pct(x: int) -> float:
+                return x / total * 100.0 if total > 0 else 0.0
+
+            slices = [
+                ("Reached 7 cards", count_reached7, "#2ca02c"),
+                ("2 Duplicate cards", count_already_true, "#d62728"),
+            ]
+            if count_frozen:
+                slices.append(("Frozen", count_frozen, "#1f77b4"))
+            start = 0
+            for _, count, color in slices:
+                extent = 360.0 * (count / total)
+                canvas.create_arc(
+                    *bbox,
+                    start=start,
+                    extent=extent,
+                    fill=color,
+                    outline="white",
+                )
+                start += extent
+            legend_x = cx + radius + 60
+            legend_y = cy - 30
+            box_size = 14
+            spacing = 22
+            for label, count, color in slices:
+                canvas.create_rectangle(
+                    legend_x,
+                    legend_y,
+                    legend_x + box_size,
+                    legend_y + box_size,
+                    fill=color,
+                    outline="black",
+                )
+                canvas.create_text(
+                    legend_x + box_size + 8,
+                    legend_y + box_size / 2,
+                    text=f"{label}: {count} ({pct(count):.1f}%)",
+                    anchor="w",
+                    font=("Segoe UI", 10),
+                )
+                legend_y += spacing
+            ci = self.bootstrap()
+            if ci is not None and count_already_true:
+                ratio = count_reached7 / count_already_true
+                lo, hi = ci.reached7_ratio
+                canvas.create_text(
+                    legend_x,
+                    legend_y + spacing / 2,
+                    text=f"Reached 7 per duplicate: {ratio:.4f} (95% CI {lo:.4f} to {hi:.4f})",
+                    anchor="w",
+                    font=("Segoe UI", 10),
+                )
+
+    def _draw_cards_histogram(self, canvas: tk.Canvas) -> None:
+        """Histogram of the number of cards in hand at scoring."""
+        width, height = WIDTH, HEIGHT
+        pad_left, pad_right, pad_top, pad_bottom = PADDING
+        cas_counts = self.summary.cards_counts
+        if cas_counts:
+            cmin, cmax = min(cas_counts), max(cas_counts)
+        else:
+            cmin, cmax = 0, 1
+        int_edges = [cmin - 0.5 + i for i in range((cmax - cmin + 1) + 1)]
+        int_counts = [0] * (len(int_edges) - 1)
+        for v, c in cas_counts.items():
+            idx = int(v - cmin)
+            if 0 <= idx < len(int_counts):
+                int_counts[idx] += c
+        ic_min, ic_max = 0, max(int_counts) if int_counts else 1
+
+        def x_to_px_cas(x_val: float) -> float:
+            xmin_edge = int_edges[0]
+            xmax_edge = int_edges[-1]
+            return pad_left + (x_val - xmin_edge) / (xmax_edge - xmin_edge) * (
+                width - pad_left - pad_right
+            )
+
+        def y_to_px_cas(y_val: float) -> float:
+            denom = (ic_max - ic_min) if ic_max > ic_min else 1
+            return pad_top + (ic_max - y_val) / denom * (height - pad_top - pad_bottom)
+
+        cx0, cy0, cx1, cy1 = _draw_axes(
+            canvas,
+            width,
+            height,
+            pad_left,
+            pad_right,
+            pad_top,
+            pad_bottom,
+            "Cards in hand",
+            "Count",
+            "Histogram: cards in hand at scoring",
         )
-    for i in range(len(int_edges)):
-        if i < len(int_edges) - 1:
-            center = (int_edges[i] + int_edges[i + 1]) / 2
-            x_px = x_to_px_cas(int_edges[i])
-            cas_canvas.create_line(x_px, cy0, x_px, cy1, fill="#f7f7f7")
-            cas_canvas.create_text(
-                x_to_px_cas(center),
-                cy0 + 14,
-                text=f"{int(round(center))}",
-                anchor="n",
+        for i in range(6):
+            y_val = ic_min + i * (ic_max - ic_min) / 5
+            y_px = y_to_px_cas(y_val)
+            canvas.create_line(cx0, y_px, cx1, y_px, fill="#eee")
+            canvas.create_text(
+                cx0 - 8, y_px, text=f"{int(round(y_val))}", anchor="e", font=("Segoe UI", 9)
+            )
+        for i in range(len(int_edges)):
+            if i < len(int_edges) - 1:
+                center = (int_edges[i] + int_edges[i + 1]) / 2
+                x_px = x_to_px_cas(int_edges[i])
+                canvas.create_line(x_px, cy0, x_px, cy1, fill="#f7f7f7")
+                canvas.create_text(
+                    x_to_px_cas(center),
+                    cy0 + 14,
+                    text=f"{int(round(center))}",
+                    anchor="n",
+                    font=("Segoe UI", 9),
+                )
+        for i, count in enumerate(int_counts):
+            left = x_to_px_cas(int_edges[i])
+            right = x_to_px_cas(int_edges[i + 1])
+            top = y_to_px_cas(count)
+            bottom = cy0
+            canvas.create_rectangle(
+                left + 1, top, right - 1, bottom, fill="#9467bd", outline="#7b56a0"
+            )
+            center_x = (left + right) / 2
+            label_y = max(pad_top + 10, top - 6)
+            canvas.create_text(
+                center_x,
+                label_y,
+                text=str(int(count)),
+                anchor="s",
                 font=("Segoe UI", 9),
+                fill="#222",
             )
-    for i, count in enumerate(int_counts):
-        left = x_to_px_cas(int_edges[i])
-        right = x_to_px_cas(int_edges[i + 1])
-        top = y_to_px_cas(count)
-        bottom = cy0
-        cas_canvas.create_rectangle(
-            left + 1, top, right - 1, bottom, fill="#9467bd", outline="#7b56a0"
-        )
-        center_x = (left + right) / 2
-        label_y = max(pad_top + 10, top - 6)
-        cas_canvas.create_text(
-            center_x,
-            label_y,
-            text=str(int(count)),
-            anchor="s",
-            font=("Segoe UI", 9),
-            fill="#222",
-        )
 
-    # --- Cards at scoring pie chart tab ---
-    pie2_frame = ttk.Frame(nb)
-    nb.add(pie2_frame, text="Cards at scoring (pie)")
-    pie2_canvas = tk.Canvas(pie2_frame, width=width, height=height, bg="white")
-    pie2_canvas.pack()
-    total_cas = len(cards_at_scoring)
-    pie2_canvas.create_text(
-        width / 2,
-        pad_top / 2,
-        text="Cards in hand at scoring (pie)",
-        font=("Segoe UI", 12, "bold"),
-    )
-    if total_cas == 0:
-        pie2_canvas.create_text(
+    def _draw_cards_pie(self, canvas: tk.Canvas) -> None:
+        """Pie of the number of cards in hand at scoring."""
+        width, height = WIDTH, HEIGHT
+        pad_left, pad_right, pad_top, pad_bottom = PADDING
+        summary = self.summary
+        cas_counts = summary.cards_counts
+        total_cas = summary.hands
+        canvas.create_text(
             width / 2,
-            height / 2,
-            text="No scoring events recorded",
-            font=("Segoe UI", 11),
-        )
-    else:
-        from collections import Counter
-
-        cas_counts = Counter(cards_at_scoring)
-        sorted_keys = sorted(cas_counts.keys())
-        colors = [
-            "#1f77b4",
-            "#ff7f0e",
-            "#2ca02c",
-            "#d62728",
-            "#9467bd",
-            "#8c564b",
-            "#e377c2",
-            "#7f7f7f",
-            "#bcbd22",
-            "#17becf",
-        ]
-        radius = (
-            min((width - pad_left - pad_right), (height - pad_top - pad_bottom)) * 0.35
+            pad_top / 2,
+            text="Cards in hand at scoring (pie)",
+            font=("Segoe UI", 12, "bold"),
         )
-        cx = pad_left + radius + 40
-        cy = pad_top + (height - pad_top - pad_bottom) / 2
-        bbox = (cx - radius, cy - radius, cx + radius, cy + radius)
-        start = 0
-        for idx, k in enumerate(sorted_keys):
-            count = cas_counts[k]
-            extent = 360.0 * (count / total_cas)
-            color = colors[idx % len(colors)]
-            pie2_canvas.create_arc(
-                *bbox, start=start, extent=extent, fill=color, outline="white"
-            )
-            start += extent
-        legend_x = cx + radius + 60
-        legend_y = cy - 30
-        box_size = 14
-        spacing = 22
-        for idx, k in enumerate(sorted_keys):
-            count = cas_counts[k]
-            color = colors[idx % len(colors)]
-            pie2_canvas.create_rectangle(
-                legend_x,
-                legend_y,
-                legend_x + box_size,
-                legend_y + box_size,
-                fill=color,
-                outline="black",
-            )
-            pct = 100.0 * count / total_cas
-            pie2_canvas.create_text(
-                legend_x + box_size + 8,
-                legend_y + box_size / 2,
-                text=f"{k} cards: {count} ({pct:.1f}%)",
-                anchor="w",
-                font=("Segoe UI", 10),
+        if total_cas == 0:
+            canvas.create_text(
+                width / 2,
+                height / 2,
+                text="No scoring events recorded",
+                font=("Segoe UI", 11),
             )
-            legend_y += spacing
+        else:
+            sorted_keys = sorted(cas_counts.keys())
+            colors = [
+                "#1f77b4",
+                "#ff7f0e",
+                "#2ca02c",
+                "#d62728",
+                "#9467bd",
+                "#8c564b",
+                "#e377c2",
+                "#7f7f7f",
+                "#bcbd22",
+                "#17becf",
+            ]
+            radius = (
+                min((width - pad_left - pad_right), (height - pad_top - pad_bottom)) * 0.35
+            )
+            cx = pad_left + radius + 40
+            cy = pad_top + (height - pad_top - pad_bottom) / 2
+            bbox = (cx - radius, cy - radius, cx + radius, cy + radius)
+            start = 0
+            for idx, k in enumerate(sorted_keys):
+                count = cas_counts[k]
+                extent = 360.0 * (count / total_cas)
+                color = colors[idx % len(colors)]
+                canvas.create_arc(
+                    *bbox, start=start, extent=extent, fill=color, outline="white"
+                )
+                start += extent
+            legend_x = cx + radius + 60
+            legend_y = cy - 30
+            box_size = 14
+            spacing = 22
+            for idx, k in enumerate(sorted_keys):
+                count = cas_counts[k]
+                color = colors[idx % len(colors)]
+                canvas.create_rectangle(
+                    legend_x,
+                    legend_y,
+                    legend_x + box_size,
+                    legend_y + box_size,
+                    fill=color,
+                    outline="black",
+                )
+                pct = 100.0 * count / total_cas
+                canvas.create_text(
+                    legend_x + box_size + 8,
+                    legend_y + box_size / 2,
+                    text=f"{k} cards: {count} ({pct:.1f}%)",
+                    anchor="w",
+                    font=("Segoe UI", 10),
+                )
+                legend_y += spacing
 
-    root.mainloop()
+
+def _plot_stats_window_tk(
+    results: Union[ExperimentResults, ExperimentSummary],
+) -> None:
+    """Show the statistics window for full results or a streaming summary.
+
+    Every tab except the running average is drawn from the summary's
+    histograms; full results are summarized first. A summary draws the running
+    average from its log-spaced checkpoints.
+    """
+    if isinstance(results, ExperimentSummary):
+        if not results.hands:
+            return
+    elif not len(results.scores):
+        return
+    window = StatsWindow()
+    window.show(results)
+    window.root.mainloop()
 
 
 def get_number_of_runs() -> Optional[int]:
@@ -592,6 +1055,14 @@ def get_number_of_runs() -> Optional[int]:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Simulate hands and show statistics.")
+    parser.add_argument(
+        "--server",
+        metavar="URL",
+        help="submit the run to a simulation server (python -m server) instead",
+    )
+    args = parser.parse_args()
+
     # Get number of runs from user
     num_runs = get_number_of_runs()
 
@@ -600,9 +1071,8 @@ def main():
         return
 
     print(f"Running {num_runs:,} simulations...")
-    results = run_experiment(hands=num_runs)
-    _plot_stats_window_tk(results)
-    final_avg = results.running_avg[-1] if results.running_avg else 0.0
+    summary = StatsWindow().run_live(num_runs, server=args.server)
+    final_avg = summary.mean if summary else 0.0
     print(f"Final average: {final_avg:.2f}")
 
 
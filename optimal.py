@@ -0,0 +1,193 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+import os
+
+from cards import (
+    MODIFIER_VALUES,
+    NUMBER_CARDS,
+    SECOND_CHANCE_COUNT,
+    SEVEN_CARD_BONUS,
+    build_deck,
+)
+from player import FastPlayer
+from policy import StopPolicy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_TABLE_PATH = "optimal_policy.bin"
+_MAGIC = b"F7POL1\n"
+
+_PLUS_STATES = 1 << len(MODIFIER_VALUES)
+# Second Chance state: 0 = none drawn, then (drawn k, active) -> 2k - active.
+_CHANCE_STATES = 2 * SECOND_CHANCE_COUNT + 1
+N_STATES = (1 << NUMBER_CARDS) * _PLUS_STATES * 2 * _CHANCE_STATES
+
+
+def state_index(
+    mask: int, plus: int, doubled: bool, chances: int, second_chance: bool
+) -> int:
+    """Flat index of a hand state in the policy table."""
+    chance = 2 * chances - second_chance if chances else 0
+    return ((mask * _PLUS_STATES + plus) * 2 + doubled) * _CHANCE_STATES + chance
+
+
+def solve_optimal():
+    """Solve the optimal hit/stay decision for every hand state.
+
+    The state is the hand bitmask, which `+N` cards are held, the "*2" flag
+    and the Second Chance state (cards drawn and whether one is active). The
+    deck is taken to be a fresh deck minus the cards the state records, so
+    number cards discarded by a Second Chance are treated as still in the
+    deck. Busted hands score 0.
+
+    Backward induction runs over the modifier states in reverse topological
+    order and, inside each, over hand bitmasks from 6 cards down to 0, with
+    every layer vectorized over bitmasks. Returns `(stay, value)`: a boolean
+    array indexed by `state_index` that is True where staying is at least as
+    good as hitting, and the matching expected scores.
+    """
+    import numpy as np
+
+    deck = build_deck()
+    copies = np.array([deck.count(v) for v in range(NUMBER_CARDS)])
+    deck_size = len(deck)
+    n_plus = len(MODIFIER_VALUES)
+
+    masks = np.arange(1 << NUMBER_CARDS)
+    bits = (masks[:, None] >> np.arange(NUMBER_CARDS)) & 1
+    popcount = bits.sum(axis=1)
+    hand_sum = bits @ np.arange(NUMBER_CARDS)
+    plus_sum = np.array(
+        [sum(v for i, v in enumerate(MODIFIER_VALUES) if p >> i & 1) for p in range(_PLUS_STATES)]
+    )
+    layers = [masks[popcount == c] for c in range(7)]
+
+    value = np.zeros((1 << NUMBER_CARDS, _PLUS_STATES, 2, _CHANCE_STATES))
+    stay = np.zeros(value.shape, dtype=bool)
+
+    for plus in reversed(range(_PLUS_STATES)):
+        n_held = bin(plus).count("1")
+        for doubled in (1, 0):
+            for chance in reversed(range(_CHANCE_STATES)):
+                drawn_chances = (chance + 1) // 2
+                active = chance % 2 == 1
+                base = plus_sum[plus]
+                for c in range(6, -1, -1):
+                    m = layers[c]
+                    remaining = deck_size - c - n_held - doubled - drawn_chances
+                    cont = np.zeros(m.size)
+                    for v in range(NUMBER_CARDS):
+                        held = (m >> v) & 1 == 1
+                        left = copies[v] - held
+                        if active:
+                            # A duplicate uses up the Second Chance.
+                            dup = value[m, plus, doubled, chance + 1]
+                        else:
+                            dup = 0.0
+                        new_mask = m | 1 << v
+                        if c == 6:
+                            new = (
+                                hand_sum[new_mask] * (1 + doubled)
+                                + base
+                                + SEVEN_CARD_BONUS
+                            )
+                        else:
+                            new = value[new_mask, plus, doubled, chance]
+                        cont += left * np.where(held, dup, new)
+                    for i in range(n_plus):
+                        if not plus >> i & 1:
+                            cont += value[m, plus | 1 << i, doubled, chance]
+                    if not doubled:
+                        cont += value[m, plus, 1, chance]
+                    if drawn_chances < SECOND_CHANCE_COUNT:
+                        cont += (SECOND_CHANCE_COUNT - drawn_chances) * value[
+                            m, plus, doubled, 2 * drawn_chances + 1
+                        ]
+                    cont /= remaining
+                    banked = hand_sum[m] * (1 + doubled) + base
+                    value[m, plus, doubled, chance] = np.maximum(banked, cont)
+                    stay[m, plus, doubled, chance] = banked >= cont
+    return stay.reshape(-1), value.reshape(-1)
+
+
+class OptimalPolicy(StopPolicy):
+    """Plays a precomputed hit/stay table with one bit lookup per decision.
+
+    The table is stored as a short header followed by one bit per state in
+    `state_index` order (about 450 KB), so loading it needs no NumPy.
+    """
+
+    name = "optimal"
+
+    def __init__(self, table: bytes, expected: Optional[float] = None) -> None:
+        if len(table) * 8 < N_STATES:
+            raise ValueError("policy table is too short for the state space")
+        self.table = table
+        self.expected = expected
+
+    @classmethod
+    def solve(cls) -> "OptimalPolicy":
+        import numpy as np
+
+        stay, value = solve_optimal()
+        return cls(np.packbits(stay).tobytes(), float(value[0]))
+
+    def save(self, path: str = DEFAULT_TABLE_PATH) -> None:
+        """Write the table to `path` atomically.
+
+        The header line after the magic holds `expected`, empty when unknown.
+        """
+        expected = "" if self.expected is None else repr(float(self.expected))
+        header = _MAGIC + f"{expected}\n".encode()
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(header + self.table)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLE_PATH) -> "OptimalPolicy":
+        with open(path, "rb") as f:
+            if f.readline() != _MAGIC:
+                raise ValueError(f"{path} is not a policy table")
+            line = f.readline().strip()
+            return cls(f.read(), float(line) if line else None)
+
+    @classmethod
+    def load_or_solve(cls, path: str = DEFAULT_TABLE_PATH) -> "OptimalPolicy":
+        """Load the table from `path`, solving and saving it on first use."""
+        if os.path.exists(path):
+            return cls.load(path)
+        policy = cls.solve()
+        policy.save(path)
+        return policy
+
+    def stays(self, player: FastPlayer) -> bool:
+        idx = state_index(
+            player.mask,
+            player.plus,
+            player.doubled,
+            min(player.chances, SECOND_CHANCE_COUNT),
+            player.second_chance,
+        )
+        return bool(self.table[idx >> 3] >> (7 - (idx & 7)) & 1)
+
+    def stays_batch(self, hands) -> "np.ndarray":
+        import numpy as np
+
+        chances = np.minimum(hands.chances, SECOND_CHANCE_COUNT)
+        chance = np.where(chances > 0, 2 * chances - hands.second_chance, 0)
+        idx = (
+            (hands.mask * _PLUS_STATES + hands.plus) * 2 + hands.doubled
+        ) * _CHANCE_STATES + chance
+        table = np.frombuffer(self.table, dtype=np.uint8)
+        return (table[idx >> 3] >> (7 - (idx & 7)) & 1).astype(bool)
+
+
+__all__ = [
+    "DEFAULT_TABLE_PATH",
+    "N_STATES",
+    "OptimalPolicy",
+    "solve_optimal",
+    "state_index",
+]
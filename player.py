@@ -1,27 +1,161 @@
-class Player:
-    def get_hand(self) -> list[int]:
-        """Return a list of indexes where the hand is True."""
-        result = [i for i, v in enumerate(self.hand) if v] + [
-            f"+{i}" for i in self.additive_modifier
-        ]
-        if self.additive_modifier:
-            result += ["*2"]
-        return result
+from typing import Optional
+
+from rules import CHANCE, FLIP_THREE, FREEZE, PLUS, STANDARD, TIMES, Ruleset
+
+# Return codes of `FastPlayer.draw`.
+CONTINUE = 0
+BUST = 1
+REACHED_SEVEN = 2
+FROZEN = 3
+
+
+class FastPlayer:
+    """Compact player state used by the simulation hot loop.
+
+    - `mask` has bit `i` set when number card `i` is in the hand.
+    - `count` and `total` track the number of number cards and their sum.
+    - `bonus` is the sum of additive modifiers (including the 7-card bonus).
+    - `plus` has bit `i` set when the `+MODIFIER_VALUES[i]` card is held, and
+      `chances` counts the Second Chance cards drawn this hand.
+    - `forced` counts the cards a Flip Three still obliges the player to take;
+      callers that let a policy stay decrement it on each draw.
+    - `draw(code)` takes an integer card code (see `cards.py`, or
+      `rules.CompiledRules` for other rulesets) and returns `CONTINUE`, `BUST`,
+      `REACHED_SEVEN` or `FROZEN` instead of raising.
+
+    The rules are read from the compiled per-code tables once, in `__init__`,
+    so any ruleset plays through the same loop.
+    """
+
+    __slots__ = (
+        "mask",
+        "count",
+        "total",
+        "bonus",
+        "plus",
+        "doubled",
+        "second_chance",
+        "chances",
+        "forced",
+        "_numbers",
+        "_bonus_cards",
+        "_bonus",
+        "_kinds",
+        "_adds",
+        "_plus_bits",
+    )
+
+    def __init__(self, rules: Optional[Ruleset] = None) -> None:
+        compiled = (rules or STANDARD).compile()
+        self._numbers = compiled.numbers
+        self._bonus_cards = compiled.rules.bonus_cards
+        self._bonus = compiled.rules.bonus
+        self._kinds = compiled.kinds
+        self._adds = compiled.adds
+        self._plus_bits = compiled.plus_bits
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the hand and all modifiers."""
+        self.mask = 0
+        self.count = 0
+        self.total = 0
+        self.bonus = 0
+        self.plus = 0
+        self.doubled = False
+        self.second_chance = False
+        self.chances = 0
+        self.forced = 0
+
+    def draw(self, code: int) -> int:
+        """Add the card with the given code and report whether the hand ended."""
+        if code < self._numbers:
+            bit = 1 << code
+            if self.mask & bit:
+                if self.second_chance:
+                    self.second_chance = False
+                    return CONTINUE
+                return BUST
+            self.mask |= bit
+            self.total += code
+            self.count += 1
+            if self.count == self._bonus_cards:
+                self.bonus += self._bonus
+                return REACHED_SEVEN
+            return CONTINUE
+        kind = self._kinds[code]
+        if kind == PLUS:
+            self.plus |= self._plus_bits[code]
+            self.bonus += self._adds[code]
+        elif kind == CHANCE:
+            self.second_chance = True
+            self.chances += 1
+        elif kind == TIMES:
+            self.doubled = True
+        elif kind == FREEZE:
+            return FROZEN
+        elif kind == FLIP_THREE:
+            self.forced += 3
+        return CONTINUE
 
+    def score(self) -> int:
+        """Return the hand sum (doubled if "*2" is held) plus additive modifiers."""
+        if self.doubled:
+            return 2 * self.total + self.bonus
+        return self.total + self.bonus
+
+
+class Player:
     """Represents a player with a 13-position boolean hand.
 
+    This is the label-based API kept for compatibility; the state lives in a
+    `FastPlayer` and `hand` is rebuilt from its bitmask on access.
+
     - `hand` is a list of 13 booleans, all initialized to False.
     - `add_card(index)` marks the given position as True.
     - `reset_hand()` sets all positions back to False.
+
+    `rules` selects the deck and scoring rules (standard by default); the
+    hand then has one position per number value.
     """
 
-    HAND_SIZE = 13
+    HAND_SIZE = STANDARD.compile().numbers
 
-    def __init__(self) -> None:
-        self.hand: list[bool] = [False] * self.HAND_SIZE
+    def __init__(self, rules: Optional[Ruleset] = None) -> None:
+        self._rules = (rules or STANDARD).compile()
+        self._core = FastPlayer(rules)
+        self.HAND_SIZE = self._rules.numbers
         self.additive_modifier: list[int] = []  # starts empty, can contain numbers
-        self.multiplicative_modifier: bool = False  # flag, default False
-        self.second_Chance: bool = False  # flag, default False
+
+    @property
+    def hand(self) -> list[bool]:
+        mask = self._core.mask
+        return [bool(mask >> i & 1) for i in range(self.HAND_SIZE)]
+
+    @property
+    def multiplicative_modifier(self) -> bool:
+        return self._core.doubled
+
+    @multiplicative_modifier.setter
+    def multiplicative_modifier(self, value: bool) -> None:
+        self._core.doubled = value
+
+    @property
+    def second_Chance(self) -> bool:
+        return self._core.second_chance
+
+    @second_Chance.setter
+    def second_Chance(self, value: bool) -> None:
+        self._core.second_chance = value
+
+    def get_hand(self) -> list[int]:
+        """Return a list of indexes where the hand is True."""
+        result = [i for i, v in enumerate(self.hand) if v] + [
+            f"+{i}" for i in self.additive_modifier
+        ]
+        if self.additive_modifier:
+            result += ["*2"]
+        return result
 
     def add_card(self, index) -> None:
         """Mark the given position as True or add to additive_modifier.
@@ -32,40 +166,28 @@ class Player:
         Raises:
             ValueError: If index is out of range or already set, or invalid modifier.
         """
-        if isinstance(index, str):
-            if index == "Second Chance":
-                self.second_Chance = True
-                return
-            if index.startswith("+"):
-                try:
-                    num = int(index[1:])
-                    self.additive_modifier.append(num)
-                except ValueError:
-                    raise ValueError(f"Invalid additive modifier: {index}")
-                return
-            if index.startswith("*"):
-                self.multiplicative_modifier = True
-                return
-        if not 0 <= index < self.HAND_SIZE:
-            raise ValueError(f"index must be between 0 and {self.HAND_SIZE - 1}")
-        if self.hand[index]:
-            if self.second_Chance:
-                self.second_Chance = False
-                return
+        if isinstance(index, str) and index.startswith("+"):
+            try:
+                num = int(index[1:])
+            except ValueError:
+                raise ValueError(f"Invalid additive modifier: {index}")
+            self.additive_modifier.append(num)
+            self._core.bonus += num
+            return
+        result = self._core.draw(self._rules.code(index))
+        if result == BUST:
             raise IndexError(f"position {index} is already True")
-        self.hand[index] = True
-        # If adding this card results in exactly 7 True positions, add +15 and end the round
-        if sum(self.hand) == 7:
-            self.additive_modifier.append(15)
+        if result == REACHED_SEVEN:
+            # Adding this card resulted in exactly 7 True positions: +15 and end the round
+            self.additive_modifier.append(self._rules.rules.bonus)
             raise IndexError("Reached 7 True positions")
+        if result == FROZEN:
+            raise IndexError("Frozen")
 
     def reset_hand(self) -> None:
         """Reset all positions and modifiers to initial state."""
-        for i in range(self.HAND_SIZE):
-            self.hand[i] = False
+        self._core.reset()
         self.additive_modifier = []
-        self.multiplicative_modifier = False
-        self.second_Chance = False
 
     def Score(self) -> int:
         """Return the sum of zero-based positions that are True, plus additive modifiers.
@@ -75,10 +197,7 @@ class Player:
         Example: if positions 0, 5, and 12 are True, additive_modifier=[2,4], and multiplicative_modifier=True,
         the score is (0+5+12)*2+2+4=46.
         """
-        hand_sum = sum(i for i, v in enumerate(self.hand) if v)
-        if self.multiplicative_modifier:
-            hand_sum *= 2
-        return hand_sum + sum(self.additive_modifier)
+        return self._core.score()
 
 
-__all__ = ["Player"]
+__all__ = ["BUST", "CONTINUE", "FROZEN", "FastPlayer", "Player", "REACHED_SEVEN"]
@@ -0,0 +1,273 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence
+import math
+import random
+
+from cards import NUMBER_CARDS, build_deck
+from player import BUST, CONTINUE, FastPlayer
+from rules import STANDARD, Ruleset
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_COPIES = tuple(build_deck().count(v) for v in range(NUMBER_CARDS))
+_DECK_SIZE = len(build_deck())
+
+
+def bust_risk(player: FastPlayer) -> float:
+    """Probability that the next card busts the hand.
+
+    Estimated against a fresh deck minus the number cards in hand; a held
+    Second Chance makes the next card safe.
+    """
+    if player.second_chance:
+        return 0.0
+    mask = player.mask
+    dup = sum(_COPIES[v] - 1 for v in range(NUMBER_CARDS) if mask >> v & 1)
+    return dup / (_DECK_SIZE - player.count)
+
+
+def bust_risk_batch(hands) -> "np.ndarray":
+    """`bust_risk` for every hand of a `table.HandArrays`."""
+    import numpy as np
+
+    dup = np.zeros(len(hands))
+    for v in range(NUMBER_CARDS):
+        dup += (hands.mask >> v & 1) * (_COPIES[v] - 1)
+    risk = dup / (_DECK_SIZE - hands.count)
+    risk[hands.second_chance] = 0.0
+    return risk
+
+
+class StopPolicy:
+    """Decides after each card whether the player stays (banks the hand).
+
+    `stays_batch` answers for many hands at once (a `table.HandArrays`) and
+    returns a boolean array; the default asks `stays` hand by hand, so
+    subclasses override it when the rule vectorizes.
+    """
+
+    name = "policy"
+
+    def stays(self, player: FastPlayer) -> bool:
+        raise NotImplementedError
+
+    def stays_batch(self, hands) -> "np.ndarray":
+        import numpy as np
+
+        return np.fromiter(
+            (self.stays(p) for p in hands.players()), dtype=bool, count=len(hands)
+        )
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class AlwaysHit(StopPolicy):
+    """The policy `run_experiment` plays: never stay."""
+
+    name = "always hit"
+
+    def stays(self, player: FastPlayer) -> bool:
+        return False
+
+    def stays_batch(self, hands) -> "np.ndarray":
+        import numpy as np
+
+        return np.zeros(len(hands), dtype=bool)
+
+
+class StopAtScore(StopPolicy):
+    """Stay once the hand scores at least `threshold`."""
+
+    def __init__(self, threshold: int) -> None:
+        self.threshold = threshold
+        self.name = f"score >= {threshold}"
+
+    def stays(self, player: FastPlayer) -> bool:
+        return player.score() >= self.threshold
+
+    def stays_batch(self, hands) -> "np.ndarray":
+        return hands.score() >= self.threshold
+
+
+class StopAtCards(StopPolicy):
+    """Stay once the hand holds at least `cards` number cards."""
+
+    def __init__(self, cards: int) -> None:
+        self.cards = cards
+        self.name = f"cards >= {cards}"
+
+    def stays(self, player: FastPlayer) -> bool:
+        return player.count >= self.cards
+
+    def stays_batch(self, hands) -> "np.ndarray":
+        return hands.count >= self.cards
+
+
+class StopAtBustRisk(StopPolicy):
+    """Stay once the chance that the next card busts is above `risk`."""
+
+    def __init__(self, risk: float) -> None:
+        self.risk = risk
+        self.name = f"bust risk > {risk:.0%}"
+
+    def stays(self, player: FastPlayer) -> bool:
+        return bust_risk(player) > self.risk
+
+    def stays_batch(self, hands) -> "np.ndarray":
+        return bust_risk_batch(hands) > self.risk
+
+
+def default_policies() -> List[StopPolicy]:
+    """A grid of score, card-count and bust-risk thresholds plus always-hit."""
+    policies: List[StopPolicy] = [AlwaysHit()]
+    policies += [StopAtScore(t) for t in range(10, 62, 2)]
+    policies += [StopAtCards(k) for k in range(1, 7)]
+    policies += [StopAtBustRisk(p / 100) for p in range(5, 55, 5)]
+    return policies
+
+
+@dataclass
+class PolicyStats:
+    name: str
+    hands: int
+    mean: float
+    variance: float
+    stay_rate: float
+    bust_rate: float
+
+    @property
+    def std_err(self) -> float:
+        return math.sqrt(self.variance / self.hands) if self.hands else 0.0
+
+
+def sweep(
+    policies: Sequence[StopPolicy],
+    hands: int = 100_000,
+    seed: Optional[int] = None,
+    bust_keeps_score: bool = False,
+    rules: Ruleset = STANDARD,
+) -> List[PolicyStats]:
+    """Evaluate every policy on the same hands in a single pass.
+
+    Each hand is dealt from one deck carried across hands like the scalar
+    engine, and every policy plays it from the same starting card (common
+    random numbers). Until a policy stays it draws exactly the cards an
+    always-hit player draws, so one always-hit walk per hand settles them
+    all: a policy scores the hand at the point where it first stays, or the
+    always-hit outcome if it never does. The walk always runs to the end of
+    the always-hit hand, so the deck advances exactly as in `run_experiment`
+    whatever policies are swept.
+
+    Busted hands score 0 as in the real game, otherwise hitting would always
+    be best; `bust_keeps_score=True` keeps the hand total like
+    `run_experiment` does.
+
+    `rules` sets the deck. While a Flip Three's cards are being taken no
+    policy is asked, and a Freeze banks the hand for every policy still in.
+    `bust_risk` and `StopAtBustRisk` still assume the standard deck.
+    """
+    rng = random.Random(seed)
+    deck = list(rules.compile().deck)
+    rng.shuffle(deck)
+    len_deck = len(deck)
+    index = 0
+    player = FastPlayer(rules)
+    draw = player.draw
+
+    n_pol = len(policies)
+    sums = [0] * n_pol
+    sumsq = [0] * n_pol
+    stayed = [0] * n_pol
+    busted = [0] * n_pol
+
+    for _ in range(hands):
+        active = list(range(n_pol))
+        while True:
+            if index == len_deck:
+                index = 0
+                rng.shuffle(deck)
+            forced = player.forced
+            result = draw(deck[index])
+            index += 1
+            if forced:
+                player.forced -= 1
+            if result != CONTINUE:
+                break
+            if not active or player.forced:
+                continue
+            still = []
+            score = None
+            for i in active:
+                if policies[i].stays(player):
+                    if score is None:
+                        score = player.score()
+                    sums[i] += score
+                    sumsq[i] += score * score
+                    stayed[i] += 1
+                else:
+                    still.append(i)
+            active = still
+
+        if active:
+            if result != BUST or bust_keeps_score:
+                score = player.score()
+            else:
+                score = 0
+            for i in active:
+                sums[i] += score
+                sumsq[i] += score * score
+                if result == BUST:
+                    busted[i] += 1
+        player.reset()
+
+    stats = []
+    for i, policy in enumerate(policies):
+        mean = sums[i] / hands if hands else 0.0
+        variance = (
+            (sumsq[i] - hands * mean * mean) / (hands - 1) if hands > 1 else 0.0
+        )
+        stats.append(
+            PolicyStats(
+                name=policy.name,
+                hands=hands,
+                mean=mean,
+                variance=variance,
+                stay_rate=stayed[i] / hands if hands else 0.0,
+                bust_rate=busted[i] / hands if hands else 0.0,
+            )
+        )
+    return stats
+
+
+def format_table(stats: Sequence[PolicyStats]) -> str:
+    """Render sweep results as a fixed-width text table, best mean first."""
+    rows = sorted(stats, key=lambda s: s.mean, reverse=True)
+    width = max([len("policy")] + [len(s.name) for s in rows])
+    lines = [
+        f"{'policy':<{width}}  {'mean':>8}  {'std err':>8}  {'variance':>10}"
+        f"  {'stay':>6}  {'bust':>6}"
+    ]
+    for s in rows:
+        lines.append(
+            f"{s.name:<{width}}  {s.mean:>8.3f}  {s.std_err:>8.3f}  {s.variance:>10.2f}"
+            f"  {s.stay_rate:>6.1%}  {s.bust_rate:>6.1%}"
+        )
+    return "\n".join(lines)
+
+
+__all__ = [
+    "AlwaysHit",
+    "PolicyStats",
+    "StopAtBustRisk",
+    "StopAtCards",
+    "StopAtScore",
+    "StopPolicy",
+    "bust_risk",
+    "bust_risk_batch",
+    "default_policies",
+    "format_table",
+    "sweep",
+]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from statistics import NormalDist, stdev
+from typing import Dict, Iterator, List, Optional, Sequence
+import math
+
+from game import ENGINES, ExperimentSummary, stream_experiment
+from rules import STANDARD, Ruleset
+
+DEFAULT_BATCH = 1_000
+# The NumPy engine pays a fixed cost per block, so its first batches are larger.
+DEFAULT_NUMPY_BATCH = 16_384
+# Smallest first batch when sizing it from a small `max_hands`.
+MIN_BATCH = 100
+# Batches needed before the batch-means interval is trusted.
+MIN_BATCHES = 10
+# Once this many batches are in, adjacent pairs merge and the batch size doubles.
+MAX_BATCHES = 4 * MIN_BATCHES
+DEFAULT_MAX_HANDS = 100_000_000
+
+
+@dataclass
+class PrecisionRun:
+    """Outcome of `run_to_precision`.
+
+    `half_width` is the half-width of the confidence interval for the mean
+    when the run stopped, and `quantile_half_widths` the same for each
+    requested quantile. `converged` is False when `max_hands` ran out first.
+    """
+
+    summary: ExperimentSummary
+    confidence: float
+    half_width: float
+    converged: bool
+    batches: int
+    quantile_half_widths: Dict[float, float] = field(default_factory=dict)
+
+    @property
+    def hands(self) -> int:
+        return self.summary.hands
+
+
+def _t_quantile(p: float, dof: int) -> float:
+    """Student-t quantile from the normal one (Cornish-Fisher; good for dof >= 5)."""
+    z = NormalDist().inv_cdf(p)
+    return (
+        z
+        + (z**3 + z) / (4 * dof)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * dof**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * dof**3)
+    )
+
+
+def _quantile_half_width(summary: ExperimentSummary, q: float, z: float) -> float:
+    """Half the spread between the order statistics that bracket quantile `q`.
+
+    Uses the normal approximation to the binomial rank of the sample
+    quantile, read straight off the score histogram.
+    """
+    n = summary.hands
+    spread = z * math.sqrt(q * (1 - q) / n)
+    lo = summary.quantile(max(0.0, q - spread))
+    hi = summary.quantile(min(1.0, q + spread))
+    return (hi - lo) / 2
+
+
+def _schedule(batch: int, max_hands: int) -> Iterator[int]:
+    """Block sizes: `MAX_BATCHES` blocks of `batch`, then half as many of each doubled size."""
+    size, count, played = batch, MAX_BATCHES, 0
+    while played < max_hands:
+        for _ in range(count):
+            take = min(size, max_hands - played)
+            if take <= 0:
+                return
+            yield take
+            played += take
+        size, count = 2 * size, MAX_BATCHES // 2
+
+
+def run_to_precision(
+    tolerance: float,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    engine: str = "scalar",
+    batch: Optional[int] = None,
+    max_hands: int = DEFAULT_MAX_HANDS,
+    quantiles: Sequence[float] = (),
+    quantile_tolerance: Optional[float] = None,
+    rules: Ruleset = STANDARD,
+) -> PrecisionRun:
+    """Simulate in batches until the mean is known to within `tolerance`.
+
+    The confidence interval for the mean is estimated by batch means: the
+    batches' means are treated as independent, which also absorbs the weak
+    correlation between hands dealt from the same carried deck. Batches start
+    at `batch` hands (default `DEFAULT_BATCH`, or `DEFAULT_NUMPY_BATCH` for
+    the NumPy engine, shrunk so that `max_hands` holds `MAX_BATCHES` of
+    them); whenever `MAX_BATCHES` are in, adjacent pairs are merged and the
+    batch size doubles, so a loose tolerance stops after a few thousand hands
+    while a tight one still gets long, nearly independent batches. Hands come
+    from `stream_experiment`, so the scalar engine plays exactly the hands
+    `run_experiment` would.
+
+    The run stops as soon as the half-width is at most `tolerance` and, if
+    `quantiles` are given, the interval for each of them is at most
+    `quantile_tolerance` (default `tolerance`) score points wide on either
+    side. At least `MIN_BATCHES` batches are always played, and never more
+    than `max_hands` hands.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    if tolerance <= 0:
+        raise ValueError(f"tolerance must be positive, got {tolerance}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    if batch is None:
+        batch = DEFAULT_NUMPY_BATCH if engine == "numpy" else DEFAULT_BATCH
+        batch = max(MIN_BATCH, min(batch, max_hands // MAX_BATCHES))
+    if batch < 1:
+        raise ValueError(f"batch must be at least 1, got {batch}")
+    if quantile_tolerance is None:
+        quantile_tolerance = tolerance
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    means: List[float] = []
+    size = batch
+    last_hands = last_total = 0
+    half_width = math.inf
+    widths: Dict[float, float] = {}
+    summary = ExperimentSummary()
+    blocks = _schedule(batch, max_hands)
+    for summary in stream_experiment(max_hands, seed, engine, block=blocks, rules=rules):
+        if summary.hands - last_hands < size:
+            break  # a short final block is summarized but not used as a batch
+        means.append((summary.total - last_total) / size)
+        last_hands, last_total = summary.hands, summary.total
+        if len(means) >= MIN_BATCHES:
+            t = _t_quantile(0.5 + confidence / 2, len(means) - 1)
+            half_width = t * stdev(means) / math.sqrt(len(means))
+            if half_width <= tolerance:
+                widths = {q: _quantile_half_width(summary, q, z) for q in quantiles}
+                if all(w <= quantile_tolerance for w in widths.values()):
+                    return PrecisionRun(
+                        summary, confidence, half_width, True, len(means), widths
+                    )
+        if len(means) == MAX_BATCHES:
+            means = [(a + b) / 2 for a, b in zip(means[::2], means[1::2])]
+            size *= 2
+    if summary.hands and quantiles:
+        widths = {q: _quantile_half_width(summary, q, z) for q in quantiles}
+    return PrecisionRun(summary, confidence, half_width, False, len(means), widths)
+
+
+__all__ = [
+    "DEFAULT_BATCH",
+    "DEFAULT_MAX_HANDS",
+    "DEFAULT_NUMPY_BATCH",
+    "MAX_BATCHES",
+    "MIN_BATCHES",
+    "PrecisionRun",
+    "run_to_precision",
+]
@@ -0,0 +1,181 @@
+from __future__ import annotations
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from cards import (
+    MODIFIER_VALUES,
+    NUMBER_CARDS,
+    SECOND_CHANCE_COUNT,
+    SEVEN_CARD_BONUS,
+    Card,
+)
+
+# Card kinds in `CompiledRules.kinds`.
+NUMBER = 0
+PLUS = 1
+TIMES = 2
+CHANCE = 3
+FREEZE = 4
+FLIP_THREE = 5
+
+# Codes of cards a ruleset leaves out of the deck.
+ABSENT = -1
+
+
+@dataclass(frozen=True)
+class Ruleset:
+    """Deck composition and scoring rules.
+
+    - `number_counts[v]` is how many number cards of value `v` the deck holds.
+    - `modifier_values` lists the additive modifier cards, one entry per card.
+    - `times_two`, `second_chance`, `freeze` and `flip_three` count the other
+      cards. Freeze ends the hand and banks it; Flip Three makes the player
+      take the next three cards whatever their policy says.
+    - A hand of `bonus_cards` distinct numbers ends the hand and earns `bonus`.
+
+    The defaults are the deck `run_experiment` has always used; `FULL_DECK`
+    adds the Freeze and Flip Three action cards of the published game.
+    """
+
+    number_counts: Tuple[int, ...] = (1,) + tuple(range(1, NUMBER_CARDS))
+    modifier_values: Tuple[int, ...] = MODIFIER_VALUES
+    times_two: int = 1
+    second_chance: int = SECOND_CHANCE_COUNT
+    freeze: int = 0
+    flip_three: int = 0
+    bonus_cards: int = 7
+    bonus: int = SEVEN_CARD_BONUS
+
+    def compile(self) -> "CompiledRules":
+        """Return the integer-coded tables for these rules (cached)."""
+        return _compile(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The fields as JSON-ready values, tuples as lists."""
+        out = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            out[f.name] = list(value) if isinstance(value, tuple) else value
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Ruleset":
+        """Rebuild a ruleset from `to_dict` output (or its JSON round trip)."""
+        return cls(**{k: tuple(v) if isinstance(v, list) else v for k, v in data.items()})
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """Integer card codes and per-code lookup tables for a `Ruleset`.
+
+    Codes `0..numbers-1` are the number cards, with the code equal to the
+    value. Then come one code per modifier card, then "*2", Second Chance,
+    Freeze and Flip Three; the codes of cards the deck leaves out are
+    `ABSENT`. `kinds`, `adds` and `plus_bits` are indexed by code.
+    """
+
+    rules: Ruleset
+    deck: Tuple[int, ...]
+    numbers: int
+    kinds: Tuple[int, ...]
+    adds: Tuple[int, ...]
+    plus_bits: Tuple[int, ...]
+    times_two: int
+    second_chance: int
+    freeze: int
+    flip_three: int
+    labels: Tuple[Card, ...]
+
+    def code(self, label: Card) -> int:
+        """Return the code for a label such as 7, "+4", "*2" or "Freeze"."""
+        if isinstance(label, str):
+            if label.startswith("+"):
+                try:
+                    return self.labels.index(f"+{int(label[1:])}")
+                except ValueError:
+                    raise ValueError(f"Invalid additive modifier: {label}")
+            if label.startswith("*"):
+                label = "*2"
+            if label in self.labels[self.numbers :]:
+                return self.labels.index(label)
+            raise ValueError(f"unknown card: {label}")
+        if not 0 <= label < self.numbers:
+            raise ValueError(f"index must be between 0 and {self.numbers - 1}")
+        return label
+
+    def label(self, code: int) -> Card:
+        return self.labels[code]
+
+
+@lru_cache(maxsize=None)
+def _compile(rules: Ruleset) -> CompiledRules:
+    numbers = len(rules.number_counts)
+    if numbers > 30:
+        raise ValueError(f"at most 30 number values are supported, got {numbers}")
+    if not 1 <= rules.bonus_cards <= numbers:
+        raise ValueError(f"bonus_cards must be between 1 and {numbers}")
+    kinds: List[int] = [NUMBER] * numbers
+    adds: List[int] = [0] * numbers
+    plus_bits: List[int] = [0] * numbers
+    labels: List[Card] = list(range(numbers))
+    for i, value in enumerate(rules.modifier_values):
+        kinds.append(PLUS)
+        adds.append(value)
+        plus_bits.append(1 << i)
+        labels.append(f"+{value}")
+
+    deck: List[int] = []
+    for value, copies in enumerate(rules.number_counts):
+        deck += [value] * copies
+    deck += list(range(numbers, numbers + len(rules.modifier_values)))
+    codes = {}
+    for kind, name, copies in (
+        (TIMES, "*2", rules.times_two),
+        (CHANCE, "Second Chance", rules.second_chance),
+        (FREEZE, "Freeze", rules.freeze),
+        (FLIP_THREE, "Flip Three", rules.flip_three),
+    ):
+        if copies < 0:
+            raise ValueError(f"card counts cannot be negative: {name}")
+        if copies == 0:
+            codes[kind] = ABSENT
+            continue
+        codes[kind] = len(kinds)
+        kinds.append(kind)
+        adds.append(0)
+        plus_bits.append(0)
+        labels.append(name)
+        deck += [codes[kind]] * copies
+    return CompiledRules(
+        rules=rules,
+        deck=tuple(deck),
+        numbers=numbers,
+        kinds=tuple(kinds),
+        adds=tuple(adds),
+        plus_bits=tuple(plus_bits),
+        times_two=codes[TIMES],
+        second_chance=codes[CHANCE],
+        freeze=codes[FREEZE],
+        flip_three=codes[FLIP_THREE],
+        labels=tuple(labels),
+    )
+
+
+STANDARD = Ruleset()
+FULL_DECK = Ruleset(freeze=3, flip_three=3)
+
+
+__all__ = [
+    "ABSENT",
+    "CHANCE",
+    "CompiledRules",
+    "FLIP_THREE",
+    "FREEZE",
+    "FULL_DECK",
+    "NUMBER",
+    "PLUS",
+    "Ruleset",
+    "STANDARD",
+    "TIMES",
+]
@@ -0,0 +1,394 @@
+from __future__ import annotations
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, Optional, Sequence
+import argparse
+import json
+import os
+import sys
+import threading
+import urllib.request
+import uuid
+
+import numpy as np
+
+from cache import ResultCache
+from game import ENGINES, _blocks, _run_chunk
+from rules import STANDARD, Ruleset
+from summary import ExperimentSummary
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Jobs run as chunks of this many hands; one partial summary is published per chunk.
+JOB_CHUNK = 65_536
+# Finished jobs kept for status queries; the oldest are forgotten first.
+MAX_FINISHED = 256
+# Largest job accepted, as in the GUI's prompt.
+MAX_HANDS = 10_000_000
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+_FINAL = (DONE, FAILED, CANCELLED)
+
+
+class Job:
+    """One simulation request, merged chunk by chunk in chunk order.
+
+    Chunk `i` is seeded with the `i`-th child of `SeedSequence(seed)`, so a
+    finished job equals `run_experiment(hands, seed, engine,
+    chunk_size=JOB_CHUNK, stream=True, rules=rules)`.
+    """
+
+    def __init__(self, key: str, hands: int, seed, engine: str, rules: Ruleset) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.hands = hands
+        self.seed = seed
+        self.engine = engine
+        self.rules = rules
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.summary = ExperimentSummary()
+        # Bumped on every change; streams wait for it to move.
+        self.version = 0
+        self.changed = threading.Condition()
+        self._pending: Dict[int, ExperimentSummary] = {}
+        self._merged = 0
+        self._futures: list = []
+        self._on_done: Optional[Callable[["Job"], None]] = None
+
+    def to_dict(self, summary: bool = True) -> dict:
+        with self.changed:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "hands": self.hands,
+                "done": self.summary.hands,
+                "seed": self.seed,
+                "engine": self.engine,
+                "rules": self.rules.to_dict(),
+                "error": self.error,
+                "summary": self.summary.to_dict() if summary else None,
+            }
+
+    def _set(self, status: str, error: Optional[str] = None) -> bool:
+        """Move to `status` unless already final; returns whether it moved."""
+        with self.changed:
+            if self.status in _FINAL:
+                return False
+            self.status = status
+            self.error = error
+            self.version += 1
+            self.changed.notify_all()
+            return True
+
+    def start(self, pool: ProcessPoolExecutor, on_done: Callable[["Job"], None]) -> None:
+        """Queue the job's chunks on `pool`; `on_done(job)` runs once it is final."""
+        self._on_done = on_done
+        sizes = _blocks(self.hands, JOB_CHUNK)
+        if not sizes:
+            self._set(DONE)
+            on_done(self)
+            return
+        streams = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        self._set(RUNNING)
+        for i, (size, stream) in enumerate(zip(sizes, streams)):
+            future = pool.submit(_run_chunk, (self.engine, size, stream, True, self.rules))
+            future.add_done_callback(
+                lambda f, i=i, n=len(sizes): self._chunk_done(i, n, f, on_done)
+            )
+            self._futures.append(future)
+
+    def _chunk_done(self, i: int, chunks: int, future: Future, on_done) -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        with self.changed:
+            if self.status in _FINAL:
+                return
+            merged = self._merged
+            if error is not None:
+                self.status, self.error = FAILED, repr(error)
+            else:
+                self._pending[i] = future.result()
+                while self._merged in self._pending:
+                    self.summary.merge(self._pending.pop(self._merged))
+                    self._merged += 1
+                if self._merged == chunks:
+                    self.status = DONE
+            if error is not None or self._merged > merged:
+                self.version += 1
+                self.changed.notify_all()
+            final = self.status in _FINAL
+        if error is not None:
+            self.cancel()
+        if final:
+            on_done(self)
+
+    def cancel(self) -> None:
+        for future in self._futures:
+            future.cancel()
+        if self._set(CANCELLED) and self._on_done is not None:
+            self._on_done(self)
+
+    def updates(self, timeout: float = 30.0) -> Iterator[dict]:
+        """Yield the job's state now and after every change, until it is final.
+
+        A snapshot is also yielded every `timeout` seconds without changes, so
+        idle streams still carry a keep-alive line.
+        """
+        seen = -1
+        while True:
+            with self.changed:
+                if self.version == seen and self.status not in _FINAL:
+                    self.changed.wait(timeout)
+                seen = self.version
+            state = self.to_dict()
+            yield state
+            if state["status"] in _FINAL:
+                return
+
+
+class JobServer(ThreadingHTTPServer):
+    """Local HTTP/JSON simulation service on a warm process pool.
+
+    - `POST /jobs` with `{"hands", "seed", "engine", "rules"}` queues a job and
+      returns its state; a seeded request identical to a job still running
+      returns that job instead of starting another.
+    - `GET /jobs/<id>` returns the job's state and partial summary.
+    - `GET /jobs/<id>/stream` streams its state as newline-delimited JSON, one
+      line per merged chunk, until it is done.
+    - `DELETE /jobs/<id>` cancels it.
+
+    Workers are started once and reused by every job, so requests do not pay
+    for interpreter start-up and imports. With `cache`, seeded jobs already
+    in the `ResultCache` finish at once and finished ones are stored.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=(DEFAULT_HOST, DEFAULT_PORT),
+        workers: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.cache = cache
+        self.jobs: Dict[str, Job] = {}
+        self.active: Dict[str, Job] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, spec: dict) -> Job:
+        if not isinstance(spec, dict):
+            raise ValueError(f"job spec must be a JSON object, got {type(spec).__name__}")
+        hands = spec.get("hands", 100_000)
+        if not isinstance(hands, int) or isinstance(hands, bool) or not (
+            0 <= hands <= MAX_HANDS
+        ):
+            raise ValueError(f"hands must be an integer in 0..{MAX_HANDS}, got {hands!r}")
+        seed = spec.get("seed")
+        if seed is not None and (
+            not isinstance(seed, int) or isinstance(seed, bool) or seed < 0
+        ):
+            raise ValueError(f"seed must be a non-negative integer or null, got {seed!r}")
+        engine = spec.get("engine", "scalar")
+        rules = spec.get("rules")
+        if rules is not None and not isinstance(rules, dict):
+            raise ValueError(f"rules must be a JSON object, got {type(rules).__name__}")
+        rules = Ruleset.from_dict(rules) if rules else STANDARD
+        if engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+        key = ResultCache.key(hands, seed, engine, JOB_CHUNK, False, rules)
+        with self.lock:
+            if seed is not None and key in self.active:
+                return self.active[key]
+            job = Job(key, hands, seed, engine, rules)
+            self.jobs[job.id] = job
+            finished = [j for j in self.jobs.values() if j.status in _FINAL]
+            for old in finished[: max(0, len(finished) - MAX_FINISHED)]:
+                del self.jobs[old.id]
+            hit = self.cache.get(key) if self.cache and seed is not None else None
+            if isinstance(hit, ExperimentSummary):
+                job.summary = hit
+                job._set(DONE)
+                return job
+            if seed is not None:
+                self.active[key] = job
+        try:
+            job.start(self.pool, self._finished)
+        except Exception:
+            with self.lock:
+                self.jobs.pop(job.id, None)
+                if self.active.get(key) is job:
+                    del self.active[key]
+            raise
+        return job
+
+    def _finished(self, job: Job) -> None:
+        with self.lock:
+            if self.active.get(job.key) is job:
+                del self.active[job.key]
+        if job.status == DONE and self.cache and job.seed is not None:
+            self.cache.put(job.key, job.summary)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: JobServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, body) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.server.jobs.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"no job {job_id}"})
+        return job
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "jobs": len(self.server.jobs)})
+        elif parts == ["jobs"]:
+            jobs = list(self.server.jobs.values())
+            self._send_json(200, [j.to_dict(summary=False) for j in jobs])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job(parts[1])
+            if job:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "stream":
+            job = self._job(parts[1])
+            if job:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                try:
+                    for state in job.updates():
+                        self.wfile.write(json.dumps(state).encode() + b"\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path.strip("/") != "jobs":
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            spec = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.submit(spec)
+        except (ValueError, TypeError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        self._send_json(202, job.to_dict(summary=False))
+
+    def do_DELETE(self) -> None:
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self._job(parts[1])
+            if job:
+                job.cancel()
+                self._send_json(200, job.to_dict(summary=False))
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+
+class SimulationClient:
+    """Minimal client for a `JobServer`, using only the standard library."""
+
+    def __init__(self, url: str = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}") -> None:
+        self.url = url.rstrip("/")
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        return urllib.request.urlopen(request)
+
+    def submit(
+        self,
+        hands: int,
+        seed: Optional[int] = None,
+        engine: str = "scalar",
+        rules: Ruleset = STANDARD,
+    ) -> str:
+        """Queue a job (or join an identical one in flight) and return its id."""
+        spec = {"hands": hands, "seed": seed, "engine": engine, "rules": rules.to_dict()}
+        with self._request("POST", "/jobs", spec) as response:
+            return json.load(response)["id"]
+
+    def status(self, job_id: str) -> dict:
+        with self._request("GET", f"/jobs/{job_id}") as response:
+            return json.load(response)
+
+    def cancel(self, job_id: str) -> None:
+        self._request("DELETE", f"/jobs/{job_id}").close()
+
+    def stream(self, job_id: str) -> Iterator[dict]:
+        """Yield the job's state after every merged chunk, ending when it is final."""
+        with self._request("GET", f"/jobs/{job_id}/stream") as response:
+            for line in response:
+                yield json.loads(line)
+
+    def summaries(self, job_id: str) -> Iterator[ExperimentSummary]:
+        """`stream` as partial `ExperimentSummary` objects; raises if the job fails."""
+        for state in self.stream(job_id):
+            if state["status"] == FAILED:
+                raise RuntimeError(f"job {job_id} failed: {state['error']}")
+            yield ExperimentSummary.from_dict(state["summary"])
+
+    def run(self, hands: int, seed: Optional[int] = None, engine: str = "scalar",
+            rules: Ruleset = STANDARD) -> ExperimentSummary:
+        """Submit a job and wait for its final summary."""
+        summary = ExperimentSummary()
+        for summary in self.summaries(self.submit(hands, seed, engine, rules)):
+            pass
+        return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Serve jobs on localhost: `python -m server --port 8765 --workers 4`."""
+    parser = argparse.ArgumentParser(prog="python -m server", description=main.__doc__)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument(
+        "--cache", action="store_true", help="serve and store results in the on-disk cache"
+    )
+    args = parser.parse_args(argv)
+    server = JobServer(
+        (args.host, args.port), args.workers, ResultCache() if args.cache else None
+    )
+    print(f"Serving simulation jobs on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+__all__ = ["JOB_CHUNK", "Job", "JobServer", "MAX_HANDS", "SimulationClient", "main"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+import math
+import sys
+
+if TYPE_CHECKING:
+    from bootstrap import BootstrapCI
+
+# Running-average checkpoints are kept at roughly this many points per decade.
+CHECKPOINTS_PER_DECADE = 100
+# Batches at least this long are folded in with NumPy when it is loaded.
+VECTOR_MIN = 1024
+
+
+def _bincount(np, values) -> dict:
+    """Histogram of an integer array as `{value: count}`, via one `np.bincount`."""
+    lo = int(values.min())
+    counts = np.bincount(values - lo)
+    seen = np.flatnonzero(counts)
+    return dict(zip((seen + lo).tolist(), counts[seen].tolist()))
+
+
+@dataclass
+class ExperimentSummary:
+    """Constant-memory summary of a run, updated one batch of hands at a time.
+
+    - `mean`/`m2` are Welford running moments of the scores.
+    - `score_counts`/`cards_counts` are exact histograms (value -> hands).
+    - `checkpoints` holds `(hands, cumulative score)` pairs at log-spaced hand
+      counts, enough to draw the running average without keeping every hand.
+    """
+
+    hands: int = 0
+    total: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    count_reached7: int = 0
+    count_already_true: int = 0
+    score_counts: Counter = field(default_factory=Counter)
+    cards_counts: Counter = field(default_factory=Counter)
+    checkpoints: List[Tuple[int, int]] = field(default_factory=list)
+
+    def _next_checkpoint(self, n: int) -> int:
+        return max(n + 1, math.ceil(n * 10 ** (1 / CHECKPOINTS_PER_DECADE)))
+
+    def update(
+        self,
+        scores: Sequence[int],
+        cards_at_scoring: Sequence[int],
+        count_reached7: int = 0,
+        count_already_true: int = 0,
+    ) -> None:
+        """Fold a batch of consecutive hands into the summary."""
+        n_b = len(scores)
+        if n_b == 0:
+            return
+        # NumPy is only used once something else has loaded it, so the
+        # command line's scalar runs still start without it.
+        np = sys.modules.get("numpy")
+        if np is not None and n_b >= VECTOR_MIN:
+            s = np.asarray(scores, dtype=np.int64)
+            prefix = np.cumsum(s)
+            b_total = int(prefix[-1])
+            b_mean = b_total / n_b
+            dev = s - b_mean
+            b_m2 = float(np.dot(dev, dev))
+            self.score_counts.update(_bincount(np, s))
+            self.cards_counts.update(
+                _bincount(np, np.asarray(cards_at_scoring, dtype=np.int64))
+            )
+        else:
+            if hasattr(scores, "tolist"):
+                # Plain ints keep the totals exact and the histogram keys JSON-ready.
+                scores, cards_at_scoring = scores.tolist(), cards_at_scoring.tolist()
+            prefix = list(accumulate(scores))
+            b_total = prefix[-1]
+            b_mean = b_total / n_b
+            b_m2 = sum((x - b_mean) ** 2 for x in scores)
+            self.score_counts.update(scores)
+            self.cards_counts.update(cards_at_scoring)
+
+        start = self.hands
+        nxt = self._next_checkpoint(self.checkpoints[-1][0]) if self.checkpoints else 1
+        while nxt <= start + n_b:
+            self.checkpoints.append((nxt, self.total + int(prefix[nxt - start - 1])))
+            nxt = self._next_checkpoint(nxt)
+        self._merge_moments(n_b, b_mean, b_m2)
+        self.total += b_total
+        self.count_reached7 += count_reached7
+        self.count_already_true += count_already_true
+
+    def _merge_moments(self, n_b: int, b_mean: float, b_m2: float) -> None:
+        # Chan et al. pairwise combination of Welford moments.
+        n = self.hands + n_b
+        delta = b_mean - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += b_m2 + delta * delta * self.hands * n_b / n
+        self.hands = n
+
+    def merge(self, other: "ExperimentSummary") -> None:
+        """Append the hands summarized by `other` after the hands in `self`."""
+        if other.hands == 0:
+            return
+        offset, base = self.hands, self.total
+        nxt = self._next_checkpoint(self.checkpoints[-1][0]) if self.checkpoints else 1
+        for n, cumulative in other.checkpoints + [(other.hands, other.total)]:
+            if offset + n >= nxt:
+                self.checkpoints.append((offset + n, base + cumulative))
+                nxt = self._next_checkpoint(offset + n)
+        self._merge_moments(other.hands, other.mean, other.m2)
+        self.total += other.total
+        self.score_counts.update(other.score_counts)
+        self.cards_counts.update(other.cards_counts)
+        self.count_reached7 += other.count_reached7
+        self.count_already_true += other.count_already_true
+
+    @classmethod
+    def from_results(cls, results) -> "ExperimentSummary":
+        """Summarize an `ExperimentResults`."""
+        summary = cls()
+        summary.update(
+            results.scores,
+            results.cards_at_scoring,
+            results.count_reached7,
+            results.count_already_true,
+        )
+        return summary
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable copy of the summary."""
+        return {
+            "hands": self.hands,
+            "total": self.total,
+            "mean": self.mean,
+            "m2": self.m2,
+            "count_reached7": self.count_reached7,
+            "count_already_true": self.count_already_true,
+            "score_counts": sorted(self.score_counts.items()),
+            "cards_counts": sorted(self.cards_counts.items()),
+            "checkpoints": self.checkpoints,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExperimentSummary":
+        """Rebuild a summary saved with `to_dict`."""
+        return cls(
+            hands=data["hands"],
+            total=data["total"],
+            mean=data["mean"],
+            m2=data["m2"],
+            count_reached7=data["count_reached7"],
+            count_already_true=data["count_already_true"],
+            score_counts=Counter(dict(data["score_counts"])),
+            cards_counts=Counter(dict(data["cards_counts"])),
+            checkpoints=[tuple(point) for point in data["checkpoints"]],
+        )
+
+    def bootstrap(
+        self, resamples: int = 1000, confidence: float = 0.95, seed=None
+    ) -> "BootstrapCI":
+        """Bootstrap CIs of the mean, median, quartiles and reached-7 ratio.
+
+        See `bootstrap.bootstrap_ci`.
+        """
+        from bootstrap import bootstrap_ci
+
+        return bootstrap_ci(self, resamples, confidence, seed)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the scores."""
+        return self.m2 / (self.hands - 1) if self.hands > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def min_score(self) -> int:
+        return min(self.score_counts)
+
+    @property
+    def max_score(self) -> int:
+        return max(self.score_counts)
+
+    def running_avg_points(self) -> Tuple[List[int], List[float]]:
+        """Return `(hands, running average)` at every checkpoint and the last hand."""
+        points = list(self.checkpoints)
+        if self.hands and (not points or points[-1][0] != self.hands):
+            points.append((self.hands, self.total))
+        return [n for n, _ in points], [s / n for n, s in points]
+
+    def quantile(self, q: float) -> float:
+        """Return the `q`-quantile of the scores (linear interpolation, like `np.percentile`)."""
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Return several quantiles in one pass over the sorted histogram."""
+        wanted = []
+        for i, q in enumerate(qs):
+            pos = q * (self.hands - 1)
+            wanted.append((math.floor(pos), i, pos))
+            wanted.append((math.ceil(pos), i, pos))
+        wanted.sort()
+        found = {}
+        seen = 0
+        k = 0
+        for v in sorted(self.score_counts):
+            seen += self.score_counts[v]
+            while k < len(wanted) and seen > wanted[k][0]:
+                found[wanted[k][:2]] = v
+                k += 1
+            if k == len(wanted):
+                break
+        out = []
+        for i, q in enumerate(qs):
+            pos = q * (self.hands - 1)
+            lo, hi = math.floor(pos), math.ceil(pos)
+            lo_val, hi_val = found[lo, i], found[hi, i]
+            out.append(lo_val + (hi_val - lo_val) * (pos - lo))
+        return out
+
+
+__all__ = ["CHECKPOINTS_PER_DECADE", "ExperimentSummary", "VECTOR_MIN"]
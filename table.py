@@ -0,0 +1,276 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence
+import numpy as np
+
+from batch_engine import _BIT, _VALUE
+from cards import (
+    MODIFIER_VALUES,
+    PLUS_BASE,
+    SECOND_CHANCE,
+    SEVEN_CARD_BONUS,
+    TIMES_TWO,
+    build_deck,
+)
+from player import FastPlayer
+from policy import PolicyStats, StopPolicy
+
+MAX_SEATS = 18
+DEFAULT_TABLES = 2048
+
+# Sum of the additive modifiers held, by `plus` bitmask.
+_PLUS_SUM = np.array(
+    [
+        sum(v for i, v in enumerate(MODIFIER_VALUES) if p >> i & 1)
+        for p in range(1 << len(MODIFIER_VALUES))
+    ],
+    dtype=np.int32,
+)
+_PLUS_BIT = np.zeros(SECOND_CHANCE + 1, dtype=np.int32)
+_PLUS_BIT[PLUS_BASE:TIMES_TWO] = 1 << np.arange(len(MODIFIER_VALUES))
+
+
+class HandArrays:
+    """One seat's hands across many tables, as arrays named like `FastPlayer`.
+
+    Policies vectorize `stays` against this (see `StopPolicy.stays_batch`):
+    `score()` and the attributes behave like a `FastPlayer`'s, element-wise.
+    """
+
+    __slots__ = ("mask", "count", "total", "plus", "doubled", "second_chance", "chances")
+
+    def __init__(self, mask, count, total, plus, doubled, second_chance, chances) -> None:
+        self.mask = mask
+        self.count = count
+        self.total = total
+        self.plus = plus
+        self.doubled = doubled
+        self.second_chance = second_chance
+        self.chances = chances
+
+    def __len__(self) -> int:
+        return self.mask.size
+
+    @property
+    def bonus(self) -> np.ndarray:
+        return _PLUS_SUM[self.plus] + SEVEN_CARD_BONUS * (self.count == 7)
+
+    def score(self) -> np.ndarray:
+        return np.where(self.doubled, 2 * self.total, self.total) + self.bonus
+
+    def players(self) -> Iterator[FastPlayer]:
+        """Yield each hand as a `FastPlayer`, for policies without a vectorized path."""
+        for i in range(len(self)):
+            p = FastPlayer()
+            p.mask = int(self.mask[i])
+            p.count = int(self.count[i])
+            p.total = int(self.total[i])
+            p.plus = int(self.plus[i])
+            p.bonus = int(self.bonus[i])
+            p.doubled = bool(self.doubled[i])
+            p.second_chance = bool(self.second_chance[i])
+            p.chances = int(self.chances[i])
+            yield p
+
+
+@dataclass
+class TableResults:
+    """Per-seat outcomes of `simulate_table`; arrays are `(hands, seats)`."""
+
+    policies: List[str]
+    scores: np.ndarray
+    cards_at_scoring: np.ndarray
+    stayed: np.ndarray
+    busted: np.ndarray
+    reached7: np.ndarray
+
+    def seat_stats(self) -> List[PolicyStats]:
+        """Mean, variance and stay/bust rates of each seat."""
+        hands = self.scores.shape[0]
+        stats = []
+        for seat, name in enumerate(self.policies):
+            scores = self.scores[:, seat]
+            stats.append(
+                PolicyStats(
+                    name=f"seat {seat}: {name}",
+                    hands=hands,
+                    mean=float(scores.mean()) if hands else 0.0,
+                    variance=float(scores.var(ddof=1)) if hands > 1 else 0.0,
+                    stay_rate=float(self.stayed[:, seat].mean()) if hands else 0.0,
+                    bust_rate=float(self.busted[:, seat].mean()) if hands else 0.0,
+                )
+            )
+        return stats
+
+
+def simulate_table(
+    policies: Sequence[StopPolicy],
+    rounds: int,
+    tables: int = DEFAULT_TABLES,
+    seed=None,
+    bust_keeps_score: bool = False,
+    seven_ends_round: bool = True,
+) -> TableResults:
+    """Play `rounds` rounds at `tables` tables of `len(policies)` seats each.
+
+    Each table shares one deck between its seats, carried across rounds. When
+    it runs out, only the discard pile (the cards of finished rounds) is
+    reshuffled: cards held in the current round stay out of play, as in the
+    real game. If the seats hold every card, a seat that must draw stays
+    instead. In a round
+    the seats take turns, starting one seat further round each round: on its
+    turn a seat that has a card and is still in asks its policy whether to
+    stay, and otherwise draws one card. The round is over when every seat has
+    stayed or busted, or, with `seven_ends_round` (the real rule), as soon as
+    one seat collects 7 number cards; the others then bank their hands.
+
+    Busted hands score 0 unless `bust_keeps_score`. All tables advance
+    together, one seat at a time, so each step is a few array operations over
+    the tables where that seat is still in. Each seat plays
+    `rounds * tables` hands.
+    """
+    n_seats = len(policies)
+    if not 1 <= n_seats <= MAX_SEATS:
+        raise ValueError(f"a table seats 1 to {MAX_SEATS} players, got {n_seats}")
+    rng = np.random.default_rng(seed)
+    base = np.array(build_deck(), dtype=np.int8)
+    len_deck = base.size
+    decks = rng.permuted(np.tile(base, (tables, 1)), axis=1)
+    # Each deck row is the discard pile `[:round_start]`, the cards dealt this
+    # round `[round_start:pos]` and the draw pile `[pos:]`.
+    pos = np.zeros(tables, dtype=np.intp)
+    round_start = np.zeros(tables, dtype=np.intp)
+    cols = np.arange(len_deck)
+
+    shape = (rounds * tables, n_seats)
+    scores = np.empty(shape, dtype=np.int16)
+    cards_at_scoring = np.empty(shape, dtype=np.uint8)
+    stayed_out = np.empty(shape, dtype=bool)
+    busted_out = np.empty(shape, dtype=bool)
+    reached7_out = np.empty(shape, dtype=bool)
+
+    state = (n_seats, tables)
+    for rnd in range(rounds):
+        mask = np.zeros(state, dtype=np.int32)
+        count = np.zeros(state, dtype=np.int32)
+        total = np.zeros(state, dtype=np.int32)
+        plus = np.zeros(state, dtype=np.int32)
+        doubled = np.zeros(state, dtype=bool)
+        chance = np.zeros(state, dtype=bool)
+        chances = np.zeros(state, dtype=np.int32)
+        active = np.ones(state, dtype=bool)
+        started = np.zeros(state, dtype=bool)
+        stayed = np.zeros(state, dtype=bool)
+        busted = np.zeros(state, dtype=bool)
+        reached7 = np.zeros(state, dtype=bool)
+
+        while active.any():
+            for turn in range(n_seats):
+                seat = (rnd + turn) % n_seats
+                idx = np.flatnonzero(active[seat])
+                if not idx.size:
+                    continue
+                asked = idx[started[seat, idx]]
+                if asked.size:
+                    hands = HandArrays(
+                        mask[seat, asked],
+                        count[seat, asked],
+                        total[seat, asked],
+                        plus[seat, asked],
+                        doubled[seat, asked],
+                        chance[seat, asked],
+                        chances[seat, asked],
+                    )
+                    stays = asked[policies[seat].stays_batch(hands)]
+                    if stays.size:
+                        active[seat, stays] = False
+                        stayed[seat, stays] = True
+                        idx = np.flatnonzero(active[seat])
+                        if not idx.size:
+                            continue
+
+                empty = idx[pos[idx] == len_deck]
+                if empty.size:
+                    # Keep this round's cards in order at the front and shuffle
+                    # the discards behind them.
+                    start = round_start[empty, None]
+                    keys = np.where(
+                        cols >= start,
+                        cols - start,
+                        len_deck + rng.random((empty.size, len_deck)),
+                    )
+                    order = np.argsort(keys, axis=1)
+                    decks[empty] = np.take_along_axis(decks[empty], order, axis=1)
+                    pos[empty] = len_deck - round_start[empty]
+                    round_start[empty] = 0
+                    dry = empty[pos[empty] == len_deck]
+                    if dry.size:
+                        active[seat, dry] = False
+                        stayed[seat, dry] = True
+                        idx = np.flatnonzero(active[seat])
+                        if not idx.size:
+                            continue
+                card = decks[idx, pos[idx]]
+                pos[idx] += 1
+                started[seat, idx] = True
+
+                bit = _BIT[card]
+                m = mask[seat, idx]
+                held = (m & bit) != 0
+                c = chance[seat, idx]
+                bust = held & ~c
+                c &= ~held
+                is_chance = card == SECOND_CHANCE
+                chance[seat, idx] = c | is_chance
+                chances[seat, idx] += is_chance
+                doubled[seat, idx] |= card == TIMES_TWO
+                plus[seat, idx] |= _PLUS_BIT[card]
+                new = (bit != 0) & ~held
+                mask[seat, idx] = m | bit * new
+                n = count[seat, idx] + new
+                count[seat, idx] = n
+                total[seat, idx] += _VALUE[card] * new
+
+                out = idx[bust]
+                busted[seat, out] = True
+                active[seat, out] = False
+                seven = idx[n == 7]
+                if seven.size:
+                    reached7[seat, seven] = True
+                    if seven_ends_round:
+                        active[:, seven] = False
+                    else:
+                        active[seat, seven] = False
+
+        round_start[:] = pos
+        score = (
+            np.where(doubled, 2 * total, total)
+            + _PLUS_SUM[plus]
+            + SEVEN_CARD_BONUS * reached7
+        )
+        if not bust_keeps_score:
+            score[busted] = 0
+        rows = slice(rnd * tables, (rnd + 1) * tables)
+        scores[rows] = score.T
+        cards_at_scoring[rows] = count.T
+        stayed_out[rows] = stayed.T
+        busted_out[rows] = busted.T
+        reached7_out[rows] = reached7.T
+
+    return TableResults(
+        policies=[p.name for p in policies],
+        scores=scores,
+        cards_at_scoring=cards_at_scoring,
+        stayed=stayed_out,
+        busted=busted_out,
+        reached7=reached7_out,
+    )
+
+
+__all__ = [
+    "DEFAULT_TABLES",
+    "HandArrays",
+    "MAX_SEATS",
+    "TableResults",
+    "simulate_table",
+]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+from array import array
+from typing import Iterator, List, Sequence, Tuple
+import json
+import os
+import sys
+
+import numpy as np
+
+from player import BUST, CONTINUE, FROZEN, REACHED_SEVEN, Player
+from rules import FREEZE, STANDARD, Ruleset
+
+TRACE_VERSION = 1
+DEFAULT_CHUNK_BYTES = 1 << 24
+_META = "meta.json"
+_LENGTHS = "lengths.bin"
+
+
+def _chunk_name(i: int) -> str:
+    return f"draws-{i:05d}.bin"
+
+
+class TraceWriter:
+    """Binary log of every card a scalar run deals, with a per-hand index.
+
+    Hands are dealt from consecutive cards of a carried deck, so the log is
+    simply each shuffled deck in turn as one byte per card code, split into
+    `draws-NNNNN.bin` chunks of `chunk_bytes` bytes. `lengths.bin` holds the
+    number of cards of each hand as a little-endian uint16, from which the
+    reader rebuilds the per-hand offset index. `meta.json` records the
+    ruleset and the totals on `close`.
+
+    Logging costs one append per deck and one per hand, never one per card.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rules: Ruleset = STANDARD,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> None:
+        if chunk_bytes < 1:
+            raise ValueError(f"chunk_bytes must be at least 1, got {chunk_bytes}")
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, _META)):
+            raise FileExistsError(f"{path} already holds a trace")
+        self.path = path
+        self.rules = rules
+        self.chunk_bytes = chunk_bytes
+        self.dealt = 0
+        self.hands = 0
+        self._last_end = 0
+        self._buffer = bytearray()
+        self._chunks = 0
+        self._lengths = open(os.path.join(path, _LENGTHS), "wb")
+
+    def write_deck(self, deck: Sequence[int]) -> None:
+        """Log a freshly shuffled deck; its cards follow all earlier ones."""
+        self._buffer += bytes(deck)
+        self.dealt += len(deck)
+        if len(self._buffer) >= self.chunk_bytes:
+            self._flush(final=False)
+
+    def write_ends(self, ends: Sequence[int]) -> None:
+        """Log a batch of hands by the stream position just past each one's last card."""
+        lengths = array("H")
+        prev = self._last_end
+        for end in ends:
+            lengths.append(end - prev)
+            prev = end
+        self._last_end = prev
+        if sys.byteorder == "big":
+            lengths.byteswap()
+        self._lengths.write(lengths.tobytes())
+        self.hands += len(ends)
+
+    def _flush(self, final: bool) -> None:
+        size = self.chunk_bytes
+        while len(self._buffer) >= size or (final and self._buffer):
+            with open(os.path.join(self.path, _chunk_name(self._chunks)), "wb") as f:
+                f.write(self._buffer[:size])
+            del self._buffer[:size]
+            self._chunks += 1
+
+    def close(self) -> None:
+        self._flush(final=True)
+        self._lengths.close()
+        meta = {
+            "version": TRACE_VERSION,
+            "rules": self.rules.to_dict(),
+            "chunk_bytes": self.chunk_bytes,
+            "chunks": self._chunks,
+            "dealt": self.dealt,
+            "hands": self.hands,
+        }
+        tmp = os.path.join(self.path, _META + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, _META))
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TraceReader:
+    """Read a trace written by `run_experiment(..., trace=path)`.
+
+    `codes(i)` returns the card codes of hand `i` and `replay(i)` rebuilds it
+    as a `Player`, together with how it ended (`player.BUST`,
+    `REACHED_SEVEN` or `FROZEN`); `replay_all` streams every hand in order.
+    No random numbers are drawn: the hands come straight from the log.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(os.path.join(path, _META)) as f:
+            meta = json.load(f)
+        if meta["version"] != TRACE_VERSION:
+            raise ValueError(f"unsupported trace version {meta['version']}")
+        self.rules = Ruleset.from_dict(meta["rules"])
+        self.path = path
+        self.chunk_bytes = meta["chunk_bytes"]
+        self.chunks = meta["chunks"]
+        lengths = np.fromfile(os.path.join(path, _LENGTHS), dtype="<u2")
+        # Stream position just past each hand's last card.
+        self.ends = np.cumsum(lengths, dtype=np.int64)
+        compiled = self.rules.compile()
+        self._labels = compiled.labels
+        self._kinds = compiled.kinds
+        self._cached = (-1, b"")
+
+    def __len__(self) -> int:
+        return self.ends.size
+
+    def _chunk(self, i: int) -> bytes:
+        if self._cached[0] != i:
+            with open(os.path.join(self.path, _chunk_name(i)), "rb") as f:
+                self._cached = (i, f.read())
+        return self._cached[1]
+
+    def _read(self, start: int, stop: int) -> bytes:
+        size = self.chunk_bytes
+        parts = []
+        while start < stop:
+            i, offset = divmod(start, size)
+            take = min(stop - start, size - offset)
+            parts.append(self._chunk(i)[offset : offset + take])
+            start += take
+        return b"".join(parts)
+
+    def codes(self, hand: int) -> bytes:
+        """Card codes of `hand`, in draw order."""
+        if not -len(self) <= hand < len(self):
+            raise IndexError(f"hand {hand} out of range for {len(self)} hands")
+        hand %= len(self)
+        start = int(self.ends[hand - 1]) if hand else 0
+        return self._read(start, int(self.ends[hand]))
+
+    def labels(self, hand: int) -> List:
+        """Card labels of `hand` (7, "+4", "*2", ...), in draw order."""
+        return [self._labels[c] for c in self.codes(hand)]
+
+    def _replay(self, codes: bytes) -> Tuple[Player, int]:
+        player = Player(self.rules)
+        labels = self._labels
+        for code in codes:
+            try:
+                player.add_card(labels[code])
+            except IndexError:
+                # The hand's last card ended it: a Freeze, the bonus card or a bust.
+                if self._kinds[code] == FREEZE:
+                    return player, FROZEN
+                if sum(player.hand) == self.rules.bonus_cards:
+                    return player, REACHED_SEVEN
+                return player, BUST
+        return player, CONTINUE
+
+    def replay(self, hand: int) -> Tuple[Player, int]:
+        """Rebuild `hand` by adding its cards to a fresh `Player`.
+
+        Returns the player and the `player` result code that ended the hand.
+        """
+        return self._replay(self.codes(hand))
+
+    def replay_all(self) -> Iterator[Tuple[Player, int]]:
+        """Yield `(player, result)` for every hand, reading the log sequentially."""
+        start = 0
+        for stop in self.ends.tolist():
+            yield self._replay(self._read(start, stop))
+            start = stop
+
+
+__all__ = ["DEFAULT_CHUNK_BYTES", "TraceReader", "TraceWriter"]
@@ -0,0 +1,254 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field, fields, replace
+from itertools import product
+from statistics import NormalDist, stdev
+from typing import Dict, Iterator, List, Optional, Sequence
+import math
+import os
+
+import numpy as np
+
+from cache import ResultCache
+from game import DEFAULT_CHUNK_SIZE, ENGINES, ExperimentSummary, _blocks, _run_chunk
+from precision import (
+    DEFAULT_BATCH,
+    DEFAULT_NUMPY_BATCH,
+    MAX_BATCHES,
+    MIN_BATCH,
+    MIN_BATCHES,
+    _schedule,
+    _t_quantile,
+)
+from rules import STANDARD, Ruleset
+
+
+def variant_grid(base: Ruleset = STANDARD, **axes: Sequence) -> List[Ruleset]:
+    """Every combination of the given `Ruleset` fields, varied from `base`.
+
+    `variant_grid(second_chance=range(6), times_two=(0, 1))` gives twelve
+    rulesets; `modifier_values` takes tuples of modifier values.
+    """
+    known = {f.name for f in fields(Ruleset)}
+    unknown = sorted(set(axes) - known)
+    if unknown:
+        raise ValueError(f"unknown Ruleset fields: {unknown}")
+    names = list(axes)
+    return [
+        replace(base, **dict(zip(names, values))) for values in product(*axes.values())
+    ]
+
+
+@dataclass
+class VariantResult:
+    """Summary of one deck variant from `sweep_variants`.
+
+    `half_width` is the confidence-interval half-width of the mean, from the
+    chunk means (batch means) or, for results read from the cache, from the
+    score variance. `converged` is True when the run met `tolerance` or
+    played all its hands; `cached` when it came from the cache.
+    """
+
+    rules: Ruleset
+    summary: ExperimentSummary
+    half_width: float
+    converged: bool
+    cached: bool = False
+
+
+@dataclass
+class _Variant:
+    """Merge state of one variant: chunk summaries are merged in chunk order.
+
+    Merged chunks are grouped into batches of `size` hands for the batch-means
+    interval. As in `precision.run_to_precision`, once `MAX_BATCHES` batches
+    are in, adjacent pairs merge and `size` doubles.
+    """
+
+    rules: Ruleset
+    sizes: List[int]
+    streams: list
+    size: int
+    summary: ExperimentSummary = field(default_factory=ExperimentSummary)
+    pending: Dict[int, ExperimentSummary] = field(default_factory=dict)
+    merged: int = 0
+    means: List[float] = field(default_factory=list)
+    batch_hands: int = 0
+    batch_total: int = 0
+    half_width: float = math.inf
+    finished: bool = False
+
+    def advance(self, tolerance: Optional[float], t_level: float) -> Optional[VariantResult]:
+        """Merge every chunk that is next in order; return the result once done.
+
+        Convergence is checked after each merged chunk, so a seeded sweep stops
+        a variant at the same chunk whatever order the workers finish in.
+        """
+        while self.merged in self.pending:
+            chunk = self.pending.pop(self.merged)
+            self.summary.merge(chunk)
+            self.merged += 1
+            self.batch_hands += chunk.hands
+            self.batch_total += chunk.total
+            if self.batch_hands < self.size:
+                continue  # a short final chunk is merged but not used as a batch
+            means = self.means
+            means.append(self.batch_total / self.batch_hands)
+            self.batch_hands = self.batch_total = 0
+            if len(means) > 1:
+                t = _t_quantile(t_level, len(means) - 1)
+                self.half_width = t * stdev(means) / math.sqrt(len(means))
+            if (
+                tolerance is not None
+                and len(means) >= MIN_BATCHES
+                and self.half_width <= tolerance
+            ):
+                return VariantResult(self.rules, self.summary, self.half_width, True)
+            if len(means) == MAX_BATCHES:
+                self.means = [(a + b) / 2 for a, b in zip(means[::2], means[1::2])]
+                self.size *= 2
+        if self.merged == len(self.sizes):
+            converged = tolerance is None or self.half_width <= tolerance
+            return VariantResult(self.rules, self.summary, self.half_width, converged)
+        return None
+
+
+def sweep_variants(
+    variants: Sequence[Ruleset],
+    hands: int = 1_000_000,
+    seed: Optional[int] = None,
+    engine: str = "scalar",
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    confidence: float = 0.95,
+    cache: Optional[ResultCache] = None,
+) -> Iterator[VariantResult]:
+    """Run every deck variant on a shared process pool, yielding each as it finishes.
+
+    Each variant is split into chunks of `chunk_size` hands seeded exactly
+    as `run_experiment(hands, seed, engine, chunk_size=chunk_size,
+    stream=True, rules=variant)` seeds them, so a finished variant equals
+    that run and shares its `cache` entry: seeded variants already in the
+    cache are yielded first without simulating, and newly finished ones are
+    stored. The (variant, chunk) jobs are queued variant by variant, with at
+    most two per worker in flight, so the pool never idles between variants
+    and each variant is yielded as soon as its last chunk is merged.
+
+    With `tolerance`, `hands` is an upper bound per variant: a variant stops,
+    and its queued chunks are dropped, once at least `precision.MIN_BATCHES`
+    batches are in and the batch-means confidence interval of its mean is at
+    most `tolerance` either side. Such partial runs are not cached. Without
+    an explicit `chunk_size`, a run with `tolerance` grows its chunks like
+    `precision.run_to_precision` grows its batches: `MAX_BATCHES` chunks of
+    `DEFAULT_BATCH` hands (`DEFAULT_NUMPY_BATCH` for the NumPy engine, fewer
+    when `hands` is small), then the size doubles every `MAX_BATCHES / 2`
+    chunks, so a loose tolerance stops after a few thousand hands. Those
+    chunks match no fixed-`chunk_size` run, so such sweeps bypass the cache.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+    growing = tolerance is not None and chunk_size is None
+    if chunk_size is None:
+        chunk_size = DEFAULT_CHUNK_SIZE
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if growing:
+        first = DEFAULT_NUMPY_BATCH if engine == "numpy" else DEFAULT_BATCH
+        first = max(MIN_BATCH, min(first, hands // MAX_BATCHES))
+        sizes = list(_schedule(first, hands))
+    else:
+        sizes = _blocks(hands, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    t_level = 0.5 + confidence / 2
+    z = NormalDist().inv_cdf(t_level)
+    use_cache = seed is not None and not growing
+    if use_cache:
+        cache = cache or ResultCache()
+
+    states: List[_Variant] = []
+    queue: deque = deque()
+    for rules in variants:
+        if use_cache:
+            hit = cache.get(cache.key(hands, seed, engine, chunk_size, False, rules))
+            if isinstance(hit, ExperimentSummary):
+                spread = z * hit.std / math.sqrt(hit.hands) if hit.hands else math.inf
+                yield VariantResult(rules, hit, spread, True, cached=True)
+                continue
+        streams = np.random.SeedSequence(seed).spawn(len(sizes))
+        v = len(states)
+        states.append(_Variant(rules, sizes, streams, sizes[0] if sizes else 0))
+        queue.extend((v, i) for i in range(len(sizes)))
+
+    def job(v: int, i: int):
+        state = states[v]
+        return (engine, state.sizes[i], state.streams[i], True, state.rules)
+
+    def finish(state: _Variant, result: VariantResult) -> VariantResult:
+        state.finished = True
+        if use_cache and state.merged == len(state.sizes):
+            key = cache.key(hands, seed, engine, chunk_size, False, state.rules)
+            cache.put(key, result.summary)
+        return result
+
+    if workers == 1:
+        while queue:
+            v, i = queue.popleft()
+            state = states[v]
+            if state.finished:
+                continue
+            state.pending[i] = _run_chunk(job(v, i))
+            result = state.advance(tolerance, t_level)
+            if result is not None:
+                yield finish(state, result)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = {}
+        while queue or in_flight:
+            while queue and len(in_flight) < 2 * workers:
+                v, i = queue.popleft()
+                if not states[v].finished:
+                    in_flight[pool.submit(_run_chunk, job(v, i))] = (v, i)
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                v, i = in_flight.pop(future)
+                state = states[v]
+                if state.finished:
+                    continue
+                state.pending[i] = future.result()
+                result = state.advance(tolerance, t_level)
+                if result is not None:
+                    for other, (w, _) in list(in_flight.items()):
+                        if w == v and other.cancel():
+                            del in_flight[other]
+                    yield finish(state, result)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def format_variants(results: Sequence[VariantResult], base: Ruleset = STANDARD) -> str:
+    """Render sweep results as a text table, naming each variant by how it differs from `base`."""
+    def label(rules: Ruleset) -> str:
+        diffs = [
+            f"{f.name}={getattr(rules, f.name)}"
+            for f in fields(Ruleset)
+            if getattr(rules, f.name) != getattr(base, f.name)
+        ]
+        return ", ".join(diffs) or "standard"
+
+    names = [label(r.rules) for r in results]
+    width = max([len("variant")] + [len(n) for n in names])
+    lines = [f"{'variant':<{width}}  {'hands':>10}  {'mean':>8}  {'+/-':>7}  note"]
+    for name, r in zip(names, results):
+        note = "cached" if r.cached else ("" if r.converged else "capped")
+        lines.append(
+            f"{name:<{width}}  {r.summary.hands:>10}  {r.summary.mean:>8.3f}"
+            f"  {r.half_width:>7.3f}  {note:<9}".rstrip()
+        )
+    return "\n".join(lines)
+
+
+__all__ = ["VariantResult", "format_variants", "sweep_variants", "variant_grid"]